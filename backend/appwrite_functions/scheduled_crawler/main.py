@@ -1,8 +1,9 @@
 """
 Scheduled Crawler Function for Appwrite
 
-This function runs on a CRON schedule (e.g., every 6 hours)
-to scrape articles from all configured sources.
+This function runs on a CRON schedule (e.g., every 15 minutes).
+Each run scrapes only the sources whose crawl_frequency is due,
+highest priority first, backing off sources that keep failing.
 """
 
 import json
@@ -12,8 +13,10 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+from services import clients
 from services.article_processor import ArticleProcessor
-from services.appwrite_manager import AppwriteManager
+from services.scheduler import CrawlScheduler
+from utils.profiling import profile_from_env
 
 
 def main(req, res):
@@ -25,29 +28,33 @@ def main(req, res):
         res: Response object
     """
     try:
-        # Initialize services
-        appwrite_manager = AppwriteManager()
-        processor = ArticleProcessor(appwrite_manager=appwrite_manager)
+        # Set CRAWLER_PROFILE=cprofile|sample to write per-stage profiles
+        with profile_from_env('scheduled_crawler'):
+            # Initialize services (the Appwrite client is reused across warm invocations)
+            appwrite_manager = clients.get_appwrite_manager()
+            processor = ArticleProcessor(appwrite_manager=appwrite_manager)
+            scheduler = CrawlScheduler(appwrite_manager=appwrite_manager)
         
-        # Get max articles from environment or use default
-        max_articles = int(os.getenv('MAX_ARTICLES_PER_SOURCE', '5'))
+            # Get max articles from environment or use default
+            max_articles = int(os.getenv('MAX_ARTICLES_PER_SOURCE', '5'))
         
-        # Run scraping pipeline
-        articles = processor.scrape_all_sources(max_articles_per_source=max_articles)
+            # Scrape the sources that are due
+            articles = scheduler.run_due(processor, max_articles_per_source=max_articles)
         
-        # Save to database
-        saved_count = processor.save_articles(articles)
+            # Save to database
+            saved_count = processor.save_articles(articles)
         
-        result = {
-            'success': True,
-            'articles_scraped': len(articles),
-            'articles_saved': saved_count,
-            'message': f'Successfully scraped and saved {saved_count} articles'
-        }
+            result = {
+                'success': True,
+                'articles_scraped': len(articles),
+                'articles_saved': saved_count,
+                'message': f'Successfully scraped and saved {saved_count} articles'
+            }
         
-        return res.json(result)
+            return res.json(result)
     
     except Exception as e:
+        clients.mark_unhealthy()
         error_result = {
             'success': False,
             'error': str(e)
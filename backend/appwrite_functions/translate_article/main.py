@@ -3,6 +3,12 @@ Translation Function for Appwrite
 
 This function translates articles from English to Amharic.
 Can be triggered manually or automatically for new articles.
+
+When an article changed at the source, send its new title and/or content
+with the article_id: only paragraphs that differ from the stored version
+are translated, and only the fields that changed are written back. The
+content is only translated when the manager has a mirror to keep it in,
+since the articles collection does not store it.
 """
 
 import json
@@ -12,8 +18,11 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from translators.translator import Translator
-from services.appwrite_manager import AppwriteManager
+from services import clients
+from utils.profiling import profile_from_env
+
+# Article.to_appwrite attributes a translation can change
+STORED_FIELDS = ('title', 'title_am', 'summary_am')
 
 
 def main(req, res):
@@ -21,7 +30,7 @@ def main(req, res):
     Appwrite Function entry point for translation.
     
     Args:
-        req: Request object with article_id
+        req: Request object with article_id (and optionally the updated title/content)
         res: Response object
     """
     try:
@@ -35,45 +44,66 @@ def main(req, res):
                 'error': 'article_id is required'
             }, 400)
         
-        # Initialize services
-        appwrite_manager = AppwriteManager()
-        translator = Translator(service='google')
-        
-        # Get article from database
-        article = appwrite_manager.get_article(article_id)
-        
-        if not article:
-            return res.json({
-                'success': False,
-                'error': f'Article {article_id} not found'
-            }, 404)
-        
-        # Translate article
-        translated_article = translator.translate_article(article)
-        
-        # Update database with translation
-        update_data = {
-            'title_am': translated_article.get('title_am'),
-            'content_am': translated_article.get('content_am'),
-            'status': 'translated'
-        }
-        
-        success = appwrite_manager.update_article(article_id, update_data)
-        
-        if success:
-            result = {
-                'success': True,
-                'article_id': article_id,
-                'message': 'Article translated successfully'
+        # Set CRAWLER_PROFILE=cprofile|sample to write per-stage profiles
+        with profile_from_env('translate_article'):
+            # Shared clients are reused across warm invocations
+            appwrite_manager = clients.get_appwrite_manager()
+            translator = clients.get_translator('google')
+            
+            # Get article from database
+            article = appwrite_manager.get_article(article_id)
+            
+            if not article:
+                return res.json({
+                    'success': False,
+                    'error': f'Article {article_id} not found'
+                }, 404)
+            
+            from translators.translator import TRANSLATED_FIELDS, field_text
+            
+            # The collection does not store the content; the mirror keeps its last translation
+            mirror = getattr(appwrite_manager, 'mirror', None)
+            stored = {**article, **(mirror.get_translation(article_id) or {})} if mirror is not None else article
+            fields = TRANSLATED_FIELDS if mirror is not None else ('title', 'summary')
+            
+            # Translate the new version against the stored one (unchanged paragraphs are reused)
+            updates = {field: payload[field] for field in ('title', 'content') if payload.get(field) is not None}
+            previous = stored if any(stored.get(f'{field}_am') for field in TRANSLATED_FIELDS) else None
+            translated_article = translator.translate_article({**stored, **updates}, previous=previous, fields=fields)
+            
+            # Write back only what changed, and only attributes the collection stores
+            update_data = {
+                field: translated_article.get(field)
+                for field in STORED_FIELDS
+                if translated_article.get(field) is not None and translated_article.get(field) != article.get(field)
             }
-            return res.json(result)
-        else:
-            return res.json({
-                'success': False,
-                'error': 'Failed to update article with translation'
-            }, 500)
+            update_data['status'] = 'translated'
+            
+            success = appwrite_manager.update_article(article_id, update_data)
+            if success and mirror is not None:
+                mirror.put_translation(article_id, {
+                    key: value
+                    for field in TRANSLATED_FIELDS if translated_article.get(f'{field}_am')
+                    for key, value in ((field, field_text(translated_article, field)),
+                                       (f'{field}_am', translated_article[f'{field}_am']))
+                })
+            
+            if success:
+                result = {
+                    'success': True,
+                    'article_id': article_id,
+                    'message': 'Article translated successfully'
+                }
+                return res.json(result)
+            else:
+                clients.mark_unhealthy()
+                return res.json({
+                    'success': False,
+                    'error': 'Failed to update article with translation'
+                }, 500)
     
     except Exception as e:
+        clients.mark_unhealthy()
         error_result = {
             'success': False,
             'error': str(e)
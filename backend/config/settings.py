@@ -18,6 +18,7 @@ APPWRITE_PROJECT_ID = os.getenv('APPWRITE_PROJECT_ID', '')
 APPWRITE_API_KEY = os.getenv('APPWRITE_API_KEY', '')
 APPWRITE_DATABASE_ID = os.getenv('APPWRITE_DATABASE_ID', 'tech-news-db')
 APPWRITE_ARTICLES_COLLECTION_ID = os.getenv('APPWRITE_ARTICLES_COLLECTION_ID', 'articles')
+APPWRITE_SOURCES_COLLECTION_ID = os.getenv('APPWRITE_SOURCES_COLLECTION_ID', 'sources')
 APPWRITE_STORAGE_BUCKET_ID = os.getenv('APPWRITE_STORAGE_BUCKET_ID', 'article-images')
 
 # Zyte Configuration
@@ -25,10 +26,24 @@ ZYTE_API_KEY = os.getenv('ZYTE_API_KEY', '')
 USE_ZYTE = os.getenv('USE_ZYTE', 'false').lower() == 'true'
 
 # Translation Configuration
-TRANSLATION_SERVICE = os.getenv('TRANSLATION_SERVICE', 'google')  # google, azure, openai
+TRANSLATION_SERVICE = os.getenv('TRANSLATION_SERVICE', 'google')  # google, libre, azure, openai
+TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+
+# Translation policy: full (title, summary, content), summary (title and summary only) or
+# summary_first (title and summary now, content from the deferred queue after the cycle)
+TRANSLATION_MODE = os.getenv('TRANSLATION_MODE', 'full')
+# Characters sent for translation per pipeline cycle and per source per cycle (0 = unlimited)
+TRANSLATION_RUN_CHAR_BUDGET = int(os.getenv('TRANSLATION_RUN_CHAR_BUDGET', '0'))
+TRANSLATION_SOURCE_CHAR_BUDGET = int(os.getenv('TRANSLATION_SOURCE_CHAR_BUDGET', '0'))
+# Translations deferred by the mode or the budgets (empty disables deferral: such text stays untranslated)
+TRANSLATION_QUEUE_DB = os.getenv('TRANSLATION_QUEUE_DB', 'output/translation_queue.db')
 
 # Google Translate (uses free library by default)
 
+# LibreTranslate (self-hosted or hosted instance)
+LIBRETRANSLATE_URL = os.getenv('LIBRETRANSLATE_URL', 'http://localhost:5000')
+LIBRETRANSLATE_API_KEY = os.getenv('LIBRETRANSLATE_API_KEY', '')
+
 # Azure Translator
 AZURE_TRANSLATOR_KEY = os.getenv('AZURE_TRANSLATOR_KEY', '')
 AZURE_TRANSLATOR_ENDPOINT = os.getenv('AZURE_TRANSLATOR_ENDPOINT', '')
@@ -41,5 +56,53 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 MAX_ARTICLES_PER_SOURCE = int(os.getenv('MAX_ARTICLES_PER_SOURCE', '10'))
 SCRAPE_INTERVAL_HOURS = int(os.getenv('SCRAPE_INTERVAL_HOURS', '6'))
 
+# Random polite delay after each direct page fetch (seconds)
+FETCH_DELAY_MIN_SECONDS = float(os.getenv('FETCH_DELAY_MIN_SECONDS', '1'))
+FETCH_DELAY_MAX_SECONDS = float(os.getenv('FETCH_DELAY_MAX_SECONDS', '3'))
+
+# Fetch backend: live (default), record (live + write WARC files) or replay (serve WARC files offline)
+FETCH_BACKEND = os.getenv('FETCH_BACKEND', 'live').lower()
+WARC_DIR = os.getenv('WARC_DIR', 'output/warc')
+REPLAY_LATENCY_MS = float(os.getenv('REPLAY_LATENCY_MS', '0'))
+REPLAY_JITTER_MS = float(os.getenv('REPLAY_JITTER_MS', '0'))
+REPLAY_CONCURRENCY = int(os.getenv('REPLAY_CONCURRENCY', '10'))
+
+# Crawl scheduling (state file is used when sources come from sources.json)
+DEFAULT_CRAWL_FREQUENCY = int(os.getenv('DEFAULT_CRAWL_FREQUENCY', '3600'))
+CRAWL_STATE_FILE = os.getenv('CRAWL_STATE_FILE', 'output/crawl_state.json')
+
+# Output (JSON Lines; compression: none/gzip/zstd, partition: none/day/hour)
+OUTPUT_DIR = os.getenv('OUTPUT_DIR', 'output')
+OUTPUT_COMPRESSION = os.getenv('OUTPUT_COMPRESSION', 'none').lower()
+OUTPUT_PARTITION = os.getenv('OUTPUT_PARTITION', 'none').lower()
+
+# Pipeline checkpoints (empty CHECKPOINT_DB disables resumable runs)
+CHECKPOINT_DB = os.getenv('CHECKPOINT_DB', 'output/checkpoints.db')
+CHECKPOINT_RETENTION_DAYS = int(os.getenv('CHECKPOINT_RETENTION_DAYS', '7'))
+
+# Local mirror of the Appwrite articles collection for duplicate checks (empty disables)
+ARTICLE_MIRROR_DB = os.getenv('ARTICLE_MIRROR_DB', 'output/articles_mirror.db')
+
+# Durable write-behind queue for Appwrite article writes (empty disables; writes then go straight to Appwrite)
+OUTBOX_DB = os.getenv('OUTBOX_DB', 'output/outbox.db')
+
+# Featured images: download, resize and upload to Appwrite Storage (empty IMAGE_INDEX_DB disables)
+IMAGE_INDEX_DB = os.getenv('IMAGE_INDEX_DB', 'output/image_index.db')
+
+# Daemon mode
+DAEMON_MIN_SLEEP_SECONDS = int(os.getenv('DAEMON_MIN_SLEEP_SECONDS', '30'))
+DAEMON_MAX_SLEEP_SECONDS = int(os.getenv('DAEMON_MAX_SLEEP_SECONDS', '900'))
+FRONTIER_MAX_URLS = int(os.getenv('FRONTIER_MAX_URLS', '5000'))
+
+# Metrics (Prometheus text on http://METRICS_HOST:METRICS_PORT/metrics in daemon mode; 0 disables)
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+
 # Logging
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # text or json (one JSON object per line)
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))  # 0 disables rotation
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+
+# News sources
+SOURCES_CONFIG_FILE = BASE_DIR / 'config' / 'sources.json'
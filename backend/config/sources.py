@@ -0,0 +1,30 @@
+"""
+News Source Configuration
+Loads source definitions from config/sources.json
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .settings import SOURCES_CONFIG_FILE
+
+
+def load_sources(path: Optional[Path] = None, enabled_only: bool = True) -> List[Dict]:
+    """
+    Load news source definitions.
+
+    Args:
+        path: Optional path to a sources JSON file (defaults to config/sources.json)
+        enabled_only: Skip sources with "enabled": false
+
+    Returns:
+        List of source configuration dictionaries
+    """
+    with open(path or SOURCES_CONFIG_FILE, encoding='utf-8') as f:
+        sources = json.load(f).get('sources', [])
+
+    if enabled_only:
+        sources = [source for source in sources if source.get('enabled', True)]
+
+    return sources
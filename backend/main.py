@@ -1,8 +1,17 @@
 """
 Main Entry Point for the Crawler Application
+
+Usage:
+    python main.py                            # Crawl all sources once and exit
+    python main.py --daemon                   # Stay resident and crawl sources as they become due
+    python main.py --profile                  # Write per-stage cProfile/flamegraph profiles to output/profiles/
+    python main.py --profile sample --profile-memory   # Low-overhead sampling plus tracemalloc snapshot
 """
 
+import argparse
+import signal
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 # Add backend directory to path
@@ -10,59 +19,213 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from services.article_processor import ArticleProcessor
 from services.appwrite_manager import AppwriteManager
-from config.settings import MAX_ARTICLES_PER_SOURCE
+from services.article_mirror import ArticleMirror
+from services.checkpoint import CheckpointStore
+from services.image_pipeline import ImageIndex, ImagePipeline
+from services.outbox import WriteOutbox
+from services.scheduler import CrawlScheduler
+from services.translation_policy import DeferredTranslations, TranslationPolicy
+from config.settings import (
+    MAX_ARTICLES_PER_SOURCE,
+    DAEMON_MIN_SLEEP_SECONDS,
+    DAEMON_MAX_SLEEP_SECONDS,
+    CHECKPOINT_DB,
+    CHECKPOINT_RETENTION_DAYS,
+    OUTPUT_DIR,
+    OUTPUT_COMPRESSION,
+    OUTPUT_PARTITION,
+    METRICS_HOST,
+    METRICS_PORT,
+    LOG_LEVEL,
+    ARTICLE_MIRROR_DB,
+    IMAGE_INDEX_DB,
+    OUTBOX_DB,
+    TRANSLATION_QUEUE_DB,
+)
+from scrapers.fetch_backends import close_fetch_backend
+from utils import metrics
+from utils.http import close_session
 from utils.logger import setup_logger
+from utils.output_writer import JsonlWriter
+from utils.profiling import Profiler
+from utils.tracing import shutdown_tracer
+
+CYCLE_SECONDS = metrics.histogram(
+    'crawler_cycle_seconds', 'Duration of one pipeline cycle', buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600))
+ARTICLES_WRITTEN = metrics.counter('crawler_articles_written_total', 'Articles written to the output sink')
+
+
+def init_appwrite(logger):
+    """Initialize the Appwrite manager, or return None if it is not configured."""
+    try:
+        appwrite_manager = AppwriteManager(
+            mirror=ArticleMirror(ARTICLE_MIRROR_DB) if ARTICLE_MIRROR_DB else None,
+            outbox=WriteOutbox(OUTBOX_DB) if OUTBOX_DB else None,
+        )
+        logger.info("Appwrite manager initialized")
+        return appwrite_manager
+    except Exception as e:
+        logger.warning(f"Appwrite not configured: {str(e)}")
+        logger.warning("Articles will be scraped but not saved to database")
+        return None
+
+
+def open_output() -> JsonlWriter:
+    """Create the JSON Lines sink configured by OUTPUT_* settings."""
+    return JsonlWriter(
+        directory=OUTPUT_DIR,
+        compression=None if OUTPUT_COMPRESSION == 'none' else OUTPUT_COMPRESSION,
+        partition=None if OUTPUT_PARTITION == 'none' else OUTPUT_PARTITION,
+    )
+
+
+def log_summary(sink: JsonlWriter, logger):
+    """Log a run summary."""
+    logger.info(f"\n{'='*60}")
+    logger.info(f"SUMMARY")
+    logger.info(f"{'='*60}")
+    logger.info(f"Total articles processed: {sink.count}")
+    if sink.count:
+        logger.info(f"Articles written under: {sink.directory}/")
+
+
+def log_metrics(logger):
+    """Log every recorded metric series."""
+    logger.info(f"\n{'='*60}")
+    logger.info(f"METRICS")
+    logger.info(f"{'='*60}")
+    for line in metrics.REGISTRY.summary():
+        logger.info(line)
+
+
+def run_cycle(processor, appwrite_manager, scheduler=None) -> JsonlWriter:
+    """Run one pipeline cycle into a fresh output sink and record its duration."""
+    if appwrite_manager is not None and appwrite_manager.mirror is not None:
+        synced = appwrite_manager.sync_mirror()
+        print(f"Article mirror: {synced} documents synced, {appwrite_manager.mirror.count()} mirrored")
+
+    with CYCLE_SECONDS.time(), open_output() as sink:
+        processor.process_pipeline(
+            max_articles_per_source=MAX_ARTICLES_PER_SOURCE,
+            translate=True,
+            save=appwrite_manager is not None,
+            scheduler=scheduler,
+            sink=sink
+        )
+    ARTICLES_WRITTEN.inc(sink.count)
+    return sink
+
+
+def run_once(processor, appwrite_manager, logger):
+    """Run the pipeline once over all sources, streaming articles to the output sink."""
+    sink = run_cycle(processor, appwrite_manager)
+    close_fetch_backend()
+    shutdown_tracer()
+    log_summary(sink, logger)
+    log_metrics(logger)
+
+
+def run_daemon(processor, appwrite_manager, logger):
+    """
+    Crawl sources as they become due until SIGTERM/SIGINT.
+
+    The processor (scrapers, HTTP session, translation cache and URL
+    frontier) is kept alive between cycles. A stop signal lets the current
+    cycle finish translating and saving what was already scraped.
+    """
+    scheduler = CrawlScheduler(appwrite_manager=appwrite_manager)
+
+    def handle_stop(signum, frame):
+        logger.info(f"Received signal {signum}, stopping after the current cycle")
+        processor.stop_event.set()
+
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+
+    logger.info("Daemon mode: crawling sources as they become due")
+
+    metrics_server = None
+    if METRICS_PORT:
+        metrics_server = metrics.start_metrics_server(METRICS_PORT, METRICS_HOST)
+        logger.info(f"Metrics available at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+    while not processor.stop_event.is_set():
+        sink = run_cycle(processor, appwrite_manager, scheduler)
+        if sink.count:
+            log_summary(sink, logger)
+
+        sleep_seconds = min(max(scheduler.seconds_until_next(), DAEMON_MIN_SLEEP_SECONDS), DAEMON_MAX_SLEEP_SECONDS)
+        logger.info(f"Next crawl check in {sleep_seconds:.0f}s")
+        processor.stop_event.wait(sleep_seconds)
+
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    close_session()
+    close_fetch_backend()
+    shutdown_tracer()
+    logger.info("Daemon stopped")
 
 
 def main():
     """Main function to run the crawler."""
+    parser = argparse.ArgumentParser(description='Tech News Crawler')
+    parser.add_argument('--daemon', action='store_true', help='Run continuously, crawling sources as they become due')
+    parser.add_argument('--profile', nargs='?', const='cprofile', choices=['cprofile', 'sample'],
+                        help='Profile the run per stage (default mode: cprofile)')
+    parser.add_argument('--profile-memory', action='store_true', help='With --profile, also record a tracemalloc snapshot')
+    args = parser.parse_args()
+
     # Setup logger
-    logger = setup_logger(name='crawler', log_file='logs/crawler.log')
-    
+    logger = setup_logger(name='crawler', log_file='logs/crawler.log', level=LOG_LEVEL)
+
     logger.info("Starting Tech News Crawler")
-    
+
     try:
         # Initialize Appwrite manager (optional - will skip if not configured)
-        appwrite_manager = None
-        try:
-            appwrite_manager = AppwriteManager()
-            logger.info("Appwrite manager initialized")
-        except Exception as e:
-            logger.warning(f"Appwrite not configured: {str(e)}")
-            logger.warning("Articles will be scraped but not saved to database")
-        
+        appwrite_manager = init_appwrite(logger)
+
+        # Checkpoints let an interrupted run resume where it stopped
+        checkpoint = CheckpointStore(CHECKPOINT_DB, CHECKPOINT_RETENTION_DAYS) if CHECKPOINT_DB else None
+
+        # Featured images are resized and uploaded to Appwrite Storage before saving
+        image_pipeline = None
+        if appwrite_manager is not None and IMAGE_INDEX_DB:
+            image_pipeline = ImagePipeline(appwrite_manager, ImageIndex(IMAGE_INDEX_DB))
+
+        # Translations deferred by TRANSLATION_MODE or the character budgets wait here between cycles
+        translation_queue = DeferredTranslations(TRANSLATION_QUEUE_DB) if TRANSLATION_QUEUE_DB else None
+
         # Initialize processor
-        processor = ArticleProcessor(appwrite_manager=appwrite_manager)
-        
-        # Run the pipeline
-        articles = processor.process_pipeline(
-            max_articles_per_source=MAX_ARTICLES_PER_SOURCE,
-            translate=True,
-            save=appwrite_manager is not None
-        )
-        
-        # Print summary
-        logger.info(f"\n{'='*60}")
-        logger.info(f"SUMMARY")
-        logger.info(f"{'='*60}")
-        logger.info(f"Total articles processed: {len(articles)}")
-        
-        if articles:
-            translated_count = sum(1 for a in articles if a.get('title_am'))
-            logger.info(f"Articles translated: {translated_count}")
-            
-            # Save articles to JSON for review
-            import json
-            output_file = 'output/articles.json'
-            Path('output').mkdir(exist_ok=True)
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=2)
-            
-            logger.info(f"Articles saved to: {output_file}")
-        
+        processor = ArticleProcessor(appwrite_manager=appwrite_manager, checkpoint=checkpoint,
+                                     image_pipeline=image_pipeline,
+                                     translation_policy=TranslationPolicy(queue=translation_queue))
+
+        profiler = None
+        if args.profile:
+            profiler = Profiler(mode=args.profile, memory=args.profile_memory,
+                                label='daemon' if args.daemon else 'run')
+
+        with profiler or nullcontext():
+            if args.daemon:
+                run_daemon(processor, appwrite_manager, logger)
+            else:
+                run_once(processor, appwrite_manager, logger)
+
+        if image_pipeline is not None:
+            image_pipeline.close()
+        if translation_queue is not None:
+            if translation_queue.count():
+                logger.info(f"{translation_queue.count()} deferred translations left for the next run")
+            translation_queue.close()
+        if appwrite_manager is not None and appwrite_manager.outbox is not None:
+            # Queued writes not delivered within OUTBOX_DRAIN_SECONDS stay on disk for the next run
+            appwrite_manager.outbox.close()
+
+        if profiler:
+            logger.info(f"Profiles written to {profiler.path}/")
+
         logger.info("Crawler completed successfully")
-        
+
     except KeyboardInterrupt:
         logger.info("Crawler interrupted by user")
     except Exception as e:
@@ -0,0 +1,7 @@
+"""
+Data Models
+"""
+
+from .article import Article
+
+__all__ = ['Article']
@@ -0,0 +1,164 @@
+"""
+Article Record
+Fixed-field, slotted representation of an article as it moves through
+the scrape -> translate -> store pipeline
+"""
+
+import sys
+from typing import Dict, Iterable, Optional
+
+
+class Article:
+    """
+    A scraped article.
+
+    Uses __slots__ so each instance carries no per-object __dict__, and
+    interns the source and category strings, which repeat across every
+    article from the same site. Dict-style get()/[] access is supported for
+    code that still handles plain article dicts (e.g. Appwrite documents).
+    """
+
+    FIELDS = (
+        'title',
+        'content',
+        'author',
+        'published_date',
+        'url',
+        'image_url',
+        'images',
+        'category',
+        'tags',
+        'source',
+        'scraped_at',
+        'title_am',
+        'content_am',
+        'summary',
+        'summary_am',
+        'translation_service',
+    )
+
+    # trace_context (the article's root tracing span) travels with the record
+    # through the pipeline but is not part of its data
+    __slots__ = FIELDS + ('trace_context',)
+
+    # Keys used by older scraper output, mapped to the field they now live in
+    LEGACY_KEYS = {
+        'source_url': 'url',
+        'featured_image': 'image_url',
+    }
+
+    # Length of the stored summary when no explicit summary is set
+    SUMMARY_LENGTH = 500
+
+    def __init__(self, title: str = '', content: str = '', author: str = '', published_date: str = '',
+                 url: str = '', image_url: Optional[str] = None, images: Iterable[str] = (),
+                 category: str = 'Technology', tags: Iterable[str] = (), source: str = '',
+                 scraped_at: str = '', title_am: Optional[str] = None, content_am: Optional[str] = None,
+                 summary: Optional[str] = None, summary_am: Optional[str] = None,
+                 translation_service: Optional[str] = None):
+        self.title = title
+        self.content = content
+        self.author = author
+        self.published_date = published_date
+        self.url = url
+        self.image_url = image_url
+        self.images = tuple(images)
+        self.category = sys.intern(category or 'Technology')
+        self.tags = tuple(tags)
+        self.source = sys.intern(source or '')
+        self.scraped_at = scraped_at
+        self.title_am = title_am
+        self.content_am = content_am
+        self.summary = summary
+        self.summary_am = summary_am
+        self.translation_service = translation_service
+        self.trace_context = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        """
+        Build an Article from a dict, accepting legacy key names.
+
+        Unknown keys (e.g. Appwrite's $id) are ignored.
+
+        Args:
+            data: Article dictionary
+
+        Returns:
+            Article instance
+        """
+        if isinstance(data, Article):
+            return data
+
+        fields = {}
+        for key, value in data.items():
+            key = cls.LEGACY_KEYS.get(key, key)
+            if key in cls.FIELDS and value is not None:
+                fields.setdefault(key, value)
+        return cls(**fields)
+
+    def to_dict(self) -> Dict:
+        """Serialize all fields to a plain dict (e.g. for JSON output)."""
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        data['images'] = list(self.images)
+        data['tags'] = list(self.tags)
+        return data
+
+    def to_appwrite(self) -> Dict:
+        """
+        Serialize to the articles collection schema.
+
+        Schema: title, title_am, url, summary, summary_am, source, image_url,
+        published_date, category
+        """
+        return {
+            'title': self.title,
+            'title_am': self.title_am or '',
+            'url': self.url,
+            'summary': self.get_summary(),
+            'summary_am': self.summary_am or '',
+            'source': self.source,
+            'image_url': self.image_url or '',
+            'published_date': self.published_date,
+            'category': self.category,
+        }
+
+    def get_summary(self) -> str:
+        """Return the explicit summary, or the start of the content."""
+        if self.summary:
+            return self.summary
+        return self.content[:self.SUMMARY_LENGTH] if self.content else ''
+
+    # Dict-style access for code paths that also handle plain dicts
+
+    def get(self, key: str, default=None):
+        key = self.LEGACY_KEYS.get(key, key)
+        if key not in self.FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __getitem__(self, key: str):
+        key = self.LEGACY_KEYS.get(key, key)
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        key = self.LEGACY_KEYS.get(key, key)
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        if key in ('source', 'category') and isinstance(value, str):
+            value = sys.intern(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.LEGACY_KEYS.get(key, key) in self.FIELDS
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Article(source={self.source!r}, url={self.url!r}, title={self.title[:40]!r})"
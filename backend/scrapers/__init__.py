@@ -2,6 +2,13 @@
 Web Scraping Modules
 """
 
-from .base_scraper import BaseScraper
-
 __all__ = ['BaseScraper']
+
+
+def __getattr__(name):
+    # Loaded on first use so importing scrapers.feeds or scrapers.registry
+    # does not pull in the HTTP stack
+    if name == 'BaseScraper':
+        from .base_scraper import BaseScraper
+        return BaseScraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
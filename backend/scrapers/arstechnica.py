@@ -3,8 +3,9 @@ Ars Technica Scraper
 Scrapes tech news articles from ArsTechnica.com
 """
 
-from typing import Dict, List, Optional
+from typing import List, Optional
 from bs4 import BeautifulSoup
+from models.article import Article
 from .base_scraper import BaseScraper
 
 
@@ -26,9 +27,12 @@ class ArsTechnicaScraper(BaseScraper):
                 if 'arstechnica.com' in url:
                     links.append(url)
         
+        # Free the parse tree now rather than at the next garbage collection
+        self.release(soup)
+        
         return list(dict.fromkeys(links))
     
-    def extract_article_content(self, url: str, html: str) -> Optional[Dict]:
+    def extract_article_content(self, url: str, html: str) -> Optional[Article]:
         """Extract article content from Ars Technica article page."""
         soup = BeautifulSoup(html, 'html.parser')
         
@@ -45,10 +49,7 @@ class ArsTechnicaScraper(BaseScraper):
             if not article_content:
                 article_content = soup.find('article')
             
-            content = ''
-            if article_content:
-                paragraphs = article_content.find_all('p')
-                content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+            content = self.extract_body(soup, article_content)
             
             # Extract author
             author = 'Ars Technica Staff'
@@ -78,18 +79,20 @@ class ArsTechnicaScraper(BaseScraper):
                 if src and src.startswith('http'):
                     images.append(src)
             
-            return {
-                'title': title,
-                'content': content,
-                'author': author,
-                'published_date': published_date,
-                'source_url': url,
-                'featured_image': featured_image,
-                'images': images,
-                'category': 'Technology',
-                'tags': [],
-            }
+            return Article(
+                title=title,
+                content=content,
+                author=author,
+                published_date=published_date,
+                url=url,
+                image_url=featured_image,
+                images=images,
+                category='Technology',
+                tags=[]
+            )
         
         except Exception as e:
             print(f"Error extracting content from {url}: {str(e)}")
             return None
+        finally:
+            self.release(soup)
@@ -3,14 +3,39 @@ Base Scraper Class
 All site-specific scrapers inherit from this base class.
 """
 
+import json
 import os
+import sys
 import time
 import random
-import logging
 import requests
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from urllib.parse import urlsplit
+
+from models.article import Article
+from utils import metrics
+from utils.http import MAX_BODY_BYTES, get_session, read_body, read_text
+from utils.logger import get_logger
+from utils.profiling import stage
+from utils.tracing import get_tracer
+from .content_extractor import body_paragraphs, extract_main_content
+from .feeds import entries_since, parse_feed, parse_timestamp
+from .fetch_backends import FETCH_BYTES, FETCH_SECONDS, get_fetch_backend
+
+FETCH_ERRORS = metrics.counter('crawler_fetch_errors_total', 'Page and feed fetches that returned nothing', ['host'])
+FEED_REQUESTS = metrics.counter(
+    'crawler_feed_requests_total', 'Conditional feed requests by result (not_modified is a cache hit)', ['result'])
+PARSE_SECONDS = metrics.histogram('crawler_parse_seconds', 'Article page extraction time', ['source'])
+CONTENT_EXTRACTION = metrics.counter(
+    'crawler_content_extraction_total', 'Article bodies by how they were extracted', ['source', 'method'])
+
+# Article bodies shorter than this in 'fallback' mode are re-extracted by text density
+MIN_BODY_CHARS = int(os.getenv('MIN_BODY_CHARS', '500'))
+
+# Largest Zyte API response read (JSON-escaped browser HTML is bigger than the page itself)
+ZYTE_MAX_BODY_BYTES = int(os.getenv('ZYTE_MAX_BODY_BYTES', str(3 * MAX_BODY_BYTES)))
 
 
 class BaseScraper(ABC):
@@ -27,6 +52,9 @@ class BaseScraper(ABC):
 
     ZYTE_API_URL = "https://api.zyte.com/v1/extract"
 
+    # Upper bound on child sitemaps followed from a sitemap index per crawl
+    MAX_CHILD_SITEMAPS = 3
+
     def __init__(self, source_config: Dict):
         """
         Initialize the scraper with source configuration.
@@ -41,12 +69,39 @@ class BaseScraper(ABC):
         self.zyte_api_key: Optional[str] = os.getenv('ZYTE_API_KEY')
         self.use_zyte: bool = os.getenv('USE_ZYTE', 'false').lower() == 'true'
 
+        # Polite delay range after each direct fetch
+        self.fetch_delay: Tuple[float, float] = (
+            float(os.getenv('FETCH_DELAY_MIN_SECONDS', '1')),
+            float(os.getenv('FETCH_DELAY_MAX_SECONDS', '3')),
+        )
+
         self.user_agents: List[str] = source_config.get('user_agents', self.DEFAULT_USER_AGENTS)
 
+        # Shared keep-alive session (connection pools survive across runs)
+        self.session: requests.Session = get_session()
+
+        # Transport behind fetch_page/fetch_feed: live, record (WARC) or replay (WARC)
+        self.fetch_backend = get_fetch_backend()
+
+        # Link discovery: 'homepage' (default) or 'feed' (RSS/Atom/sitemap at feed_url)
+        self.link_source: str = source_config.get('link_source', 'homepage')
+        self.feed_url: Optional[str] = source_config.get('feed_url')
+        # Feed entries up to this time have been crawled (see run()); crawl state
+        # without a stored cutoff falls back to the last crawl time
+        self.feed_cutoff: Optional[datetime] = parse_timestamp(
+            source_config.get('feed_cutoff') or source_config.get('last_crawled'))
+        self._feed_validators: Dict[str, Dict[str, str]] = {}
+        # Timestamps of the entries the last feed discovery returned
+        self._entry_times: Dict[str, Optional[datetime]] = {}
+
+        # Body extraction: 'fallback' (default), 'selectors' or 'density' (see extract_body)
+        self.content_extraction: str = source_config.get('content_extraction', 'fallback')
+
+        # Set when the last run() could not discover any links (used for backoff)
+        self.last_error: Optional[str] = None
+
         # Logging setup
-        self.logger = logging.getLogger(self.source_name)
-        if not self.logger.handlers:
-            logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+        self.logger = get_logger(self.source_name)
 
     def get_random_user_agent(self) -> str:
         """Return a random user agent string."""
@@ -56,6 +111,9 @@ class BaseScraper(ABC):
         """
         Fetch a web page using either direct requests or Zyte API.
 
+        The request goes through the configured fetch backend, which may
+        record the response to a WARC file or replay it from one instead.
+
         Args:
             url: The URL to fetch.
             use_zyte: Override default Zyte usage.
@@ -64,13 +122,25 @@ class BaseScraper(ABC):
             HTML content as string or None if failed.
         """
         use_zyte = self.use_zyte if use_zyte is None else use_zyte
-        try:
+
+        def fetch_live():
             if use_zyte and self.zyte_api_key:
                 return self._fetch_with_zyte(url)
             return self._fetch_direct(url)
-        except Exception as e:
-            self.logger.error(f"Error fetching {url}: {e}")
-            return None
+
+        with get_tracer().span('fetch', url=url, backend=self.fetch_backend.name) as span, stage('fetch'):
+            try:
+                html = self.fetch_backend.fetch(url, fetch_live)
+            except Exception as e:
+                self.logger.error(f"Error fetching {url}: {e}")
+                span.record_error(e)
+                html = None
+
+            if html is None:
+                FETCH_ERRORS.inc(host=urlsplit(url).netloc)
+            else:
+                span.set_attribute('characters', len(html))
+        return html
 
     def _fetch_direct(self, url: str) -> Optional[str]:
         """Fetch page directly with the requests library."""
@@ -79,37 +149,52 @@ class BaseScraper(ABC):
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
         }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        host = urlsplit(url).netloc
+        # Streamed: the body is decoded as it arrives and abandoned past MAX_BODY_BYTES
+        with get_tracer().span('http.direct', url=url) as span, FETCH_SECONDS.time(host=host, transport='direct'), \
+                self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+            span.set_attribute('http.status_code', response.status_code)
+            response.raise_for_status()
+            html, size = read_text(response)
+        FETCH_BYTES.inc(size, host=host, transport='direct')
 
         # Random polite delay
-        time.sleep(random.uniform(1, 3))
+        delay = random.uniform(*self.fetch_delay)
+        if delay > 0:
+            time.sleep(delay)
 
-        return response.text
+        return html
 
     def _fetch_with_zyte(self, url: str) -> Optional[str]:
         """Fetch page using Zyte API for anti-bot protection."""
         payload = {
             "url": url,
-            "httpResponseBody": True,  # Get the HTML content
-            "browserHtml": True,       # Use browser rendering
+            "browserHtml": True,  # Use browser rendering
         }
         try:
-            response = requests.post(
-                self.ZYTE_API_URL,
-                auth=(self.zyte_api_key, ''),  # API key as username, empty password
-                json=payload,
-                timeout=60
-            )
-
-            if response.status_code == 401:
+            host = urlsplit(url).netloc
+            with get_tracer().span('http.zyte', url=url) as span, FETCH_SECONDS.time(host=host, transport='zyte'), \
+                    self.session.post(
+                        self.ZYTE_API_URL,
+                        auth=(self.zyte_api_key, ''),  # API key as username, empty password
+                        json=payload,
+                        timeout=60,
+                        stream=True
+                    ) as response:
+                span.set_attribute('http.status_code', response.status_code)
+                unauthorized = response.status_code == 401
+                if not unauthorized:
+                    response.raise_for_status()
+                    body = read_body(response, ZYTE_MAX_BODY_BYTES)
+
+            if unauthorized:
                 self.logger.warning("Zyte API authentication failed. Falling back to direct requests.")
                 return self._fetch_direct(url)
+            FETCH_BYTES.inc(len(body), host=host, transport='zyte')
 
-            response.raise_for_status()
-            data = response.json()
-
-            html = data.get('browserHtml') or data.get('httpResponseBody')
+            # Keep only the page: drop the raw JSON before returning
+            html = json.loads(body).get('browserHtml')
+            del body
             if html:
                 self.logger.info("✓ Successfully fetched via Zyte API")
                 return html
@@ -121,6 +206,131 @@ class BaseScraper(ABC):
             self.logger.error(f"Zyte API error: {e}. Falling back to direct requests.")
             return self._fetch_direct(url)
 
+    def fetch_feed(self, url: str) -> Tuple[Optional[bytes], bool]:
+        """
+        Fetch a feed or sitemap with a conditional GET.
+
+        ETag and Last-Modified validators from the previous fetch of the
+        same URL are sent back, so an unchanged feed costs a 304 only.
+
+        Args:
+            url: The feed URL.
+
+        Returns:
+            Tuple of (raw XML bytes, not_modified). Content is None when the
+            feed is unchanged or the request failed.
+        """
+        status = {'not_modified': False}
+
+        def fetch_live():
+            content, status['not_modified'] = self._fetch_feed_direct(url)
+            return content
+
+        with get_tracer().span('fetch_feed', url=url, backend=self.fetch_backend.name) as span, stage('fetch'):
+            try:
+                content = self.fetch_backend.fetch(url, fetch_live, binary=True)
+            except Exception as e:
+                self.logger.error(f"Error fetching feed {url}: {e}")
+                span.record_error(e)
+                content = None
+            span.set_attribute('not_modified', status['not_modified'])
+
+        if status['not_modified']:
+            FEED_REQUESTS.inc(result='not_modified')
+        elif content is None:
+            FETCH_ERRORS.inc(host=urlsplit(url).netloc)
+        else:
+            FEED_REQUESTS.inc(result='modified')
+        return content, status['not_modified']
+
+    def _fetch_feed_direct(self, url: str) -> Tuple[Optional[bytes], bool]:
+        """Conditional GET of a feed over the network."""
+        headers = {
+            'User-Agent': self.get_random_user_agent(),
+            'Accept': 'application/rss+xml,application/atom+xml,application/xml;q=0.9,text/xml;q=0.8',
+        }
+        validators = self._feed_validators.get(url, {})
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+        host = urlsplit(url).netloc
+        try:
+            with FETCH_SECONDS.time(host=host, transport='direct'), \
+                    self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+                if response.status_code == 304:
+                    return None, True
+                response.raise_for_status()
+                content = read_body(response)
+            FETCH_BYTES.inc(len(content), host=host, transport='direct')
+        except Exception as e:
+            self.logger.error(f"Error fetching feed {url}: {e}")
+            return None, False
+
+        self._feed_validators[url] = {
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+        }
+        return content, False
+
+    def extract_feed_links(self) -> Optional[List[str]]:
+        """
+        Extract article URLs published since the last crawl from the feed.
+
+        Returns:
+            List of article URLs (newest first), or None if the feed could
+            not be fetched or parsed.
+        """
+        document, not_modified = self.fetch_feed(self.feed_url)
+        if not_modified:
+            self.logger.info(f"Feed unchanged since last crawl for {self.source_name}")
+            return []
+        if document is None:
+            return None
+
+        kind, entries = parse_feed(document)
+        if not kind:
+            self.logger.warning(f"Unrecognised feed format at {self.feed_url}")
+            return None
+
+        if kind == 'sitemapindex':
+            # Only follow child sitemaps modified since the last crawl
+            children = entries_since(entries, self.feed_cutoff)[:self.MAX_CHILD_SITEMAPS]
+            entries = []
+            for child_url, _ in children:
+                child_document, _ = self.fetch_feed(child_url)
+                if child_document:
+                    entries.extend(parse_feed(child_document)[1])
+
+        fresh = entries_since(entries, self.feed_cutoff)
+        self._entry_times = dict(fresh)
+        return [url for url, _ in fresh]
+
+    def discover_article_links(self) -> List[str]:
+        """
+        Find article URLs to scrape.
+
+        Uses the feed when the source is configured with link_source 'feed',
+        falling back to parsing the homepage if the feed is unavailable.
+
+        Returns:
+            List of article URLs.
+        """
+        if self.link_source == 'feed' and self.feed_url:
+            links = self.extract_feed_links()
+            if links is not None:
+                return links
+            self.logger.warning(f"Feed discovery failed for {self.source_name}, falling back to homepage")
+
+        html = self.fetch_page(self.base_url)
+        if not html:
+            self.logger.error(f"Failed to fetch main page for {self.source_name}")
+            self.last_error = f"Failed to fetch main page for {self.source_name}"
+            return []
+
+        return self.extract_article_links(html)
+
     @abstractmethod
     def extract_article_links(self, html: str) -> List[str]:
         """
@@ -136,7 +346,7 @@ class BaseScraper(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def extract_article_content(self, url: str, html: str) -> Optional[Dict]:
+    def extract_article_content(self, url: str, html: str) -> Optional[Article]:
         """
         Extract article content from an article page.
         Must be implemented by each scraper.
@@ -146,42 +356,177 @@ class BaseScraper(ABC):
             html: HTML content of the article page.
 
         Returns:
-            Dictionary containing article data or None if failed.
+            Article record or None if failed.
         """
         raise NotImplementedError
 
-    def run(self, max_articles: int = 10) -> List[Dict]:
+    @staticmethod
+    def release(soup):
+        """
+        Free a parse tree now rather than at the next garbage collection.
+
+        bs4 trees are reference cycles (parent, sibling and element links),
+        so a page's tree outlives the method that parsed it until the cyclic
+        GC runs. decompose() on the BeautifulSoup object alone does not reach
+        the tree, so each top-level node is decomposed.
+
+        Args:
+            soup: Parsed page; unusable afterwards (extract plain strings first).
+        """
+        for node in list(soup.contents):
+            node.decompose()
+        soup.decompose()
+
+    def extract_body(self, soup, container) -> str:
+        """
+        Article body text of a parsed page, per the source's content_extraction mode:
+
+        - 'selectors': every <p> in the container the scraper selected
+        - 'fallback': the container's paragraphs without boilerplate blocks
+          (share widgets, sign-ups, captions, link lists); text density
+          scoring over the whole page when the container is missing or
+          yields less than MIN_BODY_CHARS
+        - 'density': text density scoring over the whole page only
+
+        Args:
+            soup: Parsed article page.
+            container: Body element found by the scraper's selectors, or None.
+
+        Returns:
+            Paragraphs separated by blank lines.
+        """
+        if self.content_extraction == 'selectors':
+            CONTENT_EXTRACTION.inc(source=self.source_name, method='selectors')
+            if container is None:
+                return ''
+            paragraphs = container.find_all('p')
+            return '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+
+        content = ''
+        if container is not None and self.content_extraction != 'density':
+            content = '\n\n'.join(body_paragraphs(container))
+            if len(content) >= MIN_BODY_CHARS:
+                CONTENT_EXTRACTION.inc(source=self.source_name, method='selectors')
+                return content
+
+        density_content = extract_main_content(soup)
+        if len(density_content) <= len(content):
+            CONTENT_EXTRACTION.inc(source=self.source_name, method='selectors')
+            return content
+        CONTENT_EXTRACTION.inc(source=self.source_name, method='density')
+        return density_content
+
+    def run(self, max_articles: int = 10, skip_urls=None, checkpoint=None) -> List[Article]:
         """
         Main scraping logic. Fetches articles from the source.
 
         Args:
             max_articles: Maximum number of articles to scrape.
+            skip_urls: Optional container of URLs already scraped (e.g. in an
+                earlier daemon cycle); these are not fetched again, unless
+                it has a saved_before(url, updated) that says their feed
+                entry was updated since.
+            checkpoint: Optional CheckpointStore; each article is recorded
+                once fetched and again once parsed.
 
         Returns:
-            List of article dictionaries.
+            List of Article records.
         """
         self.logger.info(f"Starting scraper for {self.source_name}")
-
-        html = self.fetch_page(self.base_url)
-        if not html:
-            self.logger.error(f"Failed to fetch main page for {self.source_name}")
-            return []
-
-        article_urls = self.extract_article_links(html)
+        self.last_error = None
+        self._entry_times = {}
+
+        # One trace for link discovery; each article then gets its own trace linked to it
+        tracer = get_tracer()
+        crawl_span = tracer.start_span('crawl_source', new_trace=True, source=self.source_name)
+        with tracer.activate(crawl_span):
+            article_urls = self.discover_article_links()
         self.logger.info(f"Found {len(article_urls)} article links")
+        if skip_urls:
+            article_urls = [url for url in article_urls if not self._already_scraped(url, skip_urls)]
 
-        articles: List[Dict] = []
+        articles: List[Article] = []
+        crawled = set()
         for url in article_urls[:max_articles]:
             self.logger.info(f"Scraping: {url}")
-            article_html = self.fetch_page(url)
-            if not article_html:
+            article_span = tracer.start_span('article', new_trace=True, links=[crawl_span],
+                                             url=url, source=self.source_name)
+            with tracer.activate(article_span):
+                article_html = self.fetch_page(url)
+                article = None
+                if article_html:
+                    if checkpoint is not None:
+                        checkpoint.mark_fetched(url, article_html, source=self.source_name)
+                    article = self.parse_article(url, article_html)
+
+            if article:
+                # Ended by the pipeline once the article is translated and saved
+                article.trace_context = article_span
+                articles.append(article)
+                crawled.add(url)
+                if checkpoint is not None:
+                    checkpoint.mark_parsed(url, article, source=self.source_name)
                 continue
 
-            article_data = self.extract_article_content(url, article_html)
-            if article_data:
-                article_data['source'] = self.source_name
-                article_data['scraped_at'] = datetime.utcnow().isoformat()
-                articles.append(article_data)
-
+            article_span.record_error('fetch failed' if not article_html else 'parse failed')
+            article_span.end()
+            if article_html and checkpoint is not None:
+                checkpoint.discard(url)
+
+        if self.last_error:
+            crawl_span.record_error(self.last_error)
+        else:
+            self.advance_feed_cutoff([url for url in article_urls if url not in crawled])
+        crawl_span.set_attribute('articles', len(articles))
+        crawl_span.end()
         self.logger.info(f"Successfully scraped {len(articles)} articles from {self.source_name}")
         return articles
+
+    def _already_scraped(self, url: str, skip_urls) -> bool:
+        """Whether a URL in skip_urls can be skipped (its feed entry has not been updated since)."""
+        if url not in skip_urls:
+            return False
+        # A republished article is scraped again, so its saved copy can be updated
+        updated = self._entry_times.get(url)
+        saved_before = getattr(skip_urls, 'saved_before', None)
+        return updated is None or saved_before is None or not saved_before(url, updated)
+
+    def advance_feed_cutoff(self, left_over: List[str]):
+        """
+        Move the feed cutoff up to the newest entry this run took care of,
+        but never past an entry left for a later run.
+
+        Args:
+            left_over: Discovered URLs that were not crawled (beyond
+                max_articles, or their fetch or parse failed)
+        """
+        if not self._entry_times:
+            # Homepage discovery, an unchanged feed or a failed one: nothing new to go past
+            return
+        dated = [timestamp for timestamp in self._entry_times.values() if timestamp is not None]
+        held_back = [self._entry_times[url] for url in left_over if self._entry_times.get(url) is not None]
+        if held_back:
+            oldest = min(held_back)
+            dated = [timestamp for timestamp in dated if timestamp < oldest]
+            # A 304 would hide the entries still to crawl
+            self._feed_validators.clear()
+        if dated:
+            self.feed_cutoff = max(dated)
+
+    def parse_article(self, url: str, html: str) -> Optional[Article]:
+        """
+        Extract an article and stamp it with its source and scrape time.
+
+        Args:
+            url: The article URL.
+            html: HTML content of the article page.
+
+        Returns:
+            Article record or None if extraction failed.
+        """
+        with get_tracer().span('parse', url=url), stage('parse'), PARSE_SECONDS.time(source=self.source_name):
+            article = self.extract_article_content(url, html)
+        if article:
+            article.source = sys.intern(self.source_name)
+            article.scraped_at = datetime.utcnow().isoformat()
+        return article
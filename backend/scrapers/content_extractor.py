@@ -0,0 +1,199 @@
+"""
+Main Content Extractor
+Readability-style body extraction from a parsed article page: candidate
+containers are scored by the text and link density of the paragraphs they
+hold, and boilerplate blocks (share widgets, newsletter sign-ups, related
+links, captions, navigation) are dropped from the chosen container.
+
+The soup is only read, never modified, so a scraper can keep using it for
+the title, author and images after extracting the body.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from bs4 import Tag
+
+# Elements whose paragraphs are never article body
+BOILERPLATE_TAGS = frozenset({
+    'aside', 'nav', 'footer', 'header', 'form', 'figcaption', 'button', 'select',
+    'script', 'style', 'noscript', 'template', 'iframe', 'svg',
+})
+
+# class/id fragments of boilerplate blocks and of likely body containers
+BOILERPLATE_NAMES = re.compile(
+    r'share|social|newsletter|sign-?up|subscribe|related|recommend|promo|sponsor|advert|^ads?$|[-_]ads?\b|'
+    r'comment|footer|sidebar|widget|popup|modal|cookie|consent|breadcrumb|caption|credit|byline|'
+    r'author-bio|tags?$|nav|menu|masthead|paywall',
+    re.I
+)
+CONTENT_NAMES = re.compile(r'article|body|content|entry|main|post|story|text', re.I)
+
+# Never pruned by class/id: a page-level class such as "has-sidebar" would otherwise drop everything
+PAGE_TAGS = frozenset({'html', 'body', 'main', 'article'})
+
+# Readability's initial score per container tag
+TAG_SCORES = {
+    'div': 5, 'section': 3, 'pre': 3, 'td': 3, 'blockquote': 3,
+    'address': -3, 'ol': -3, 'ul': -3, 'dl': -3, 'dd': -3, 'dt': -3, 'li': -3, 'form': -3,
+    'h1': -5, 'h2': -5, 'h3': -5, 'h4': -5, 'h5': -5, 'h6': -5, 'th': -5,
+}
+
+# Paragraphs shorter than this do not vote for their container
+MIN_PARAGRAPH_CHARS = 25
+
+# Paragraphs with more of their text in links than this are navigation
+MAX_PARAGRAPH_LINK_DENSITY = 0.5
+
+# Siblings of the best container scoring at least this share of it are body too
+SIBLING_SCORE_RATIO = 0.2
+
+
+def class_weight(tag: Tag) -> int:
+    """+25 for a body-like class/id, -25 for a boilerplate one (both can apply)."""
+    names = _names(tag)
+    if not names:
+        return 0
+    weight = 0
+    if any(BOILERPLATE_NAMES.search(name) for name in names):
+        weight -= 25
+    if any(CONTENT_NAMES.search(name) for name in names):
+        weight += 25
+    return weight
+
+
+def is_boilerplate(tag: Tag) -> bool:
+    """Whether an element is a boilerplate block by tag name or class/id."""
+    if tag.name in BOILERPLATE_TAGS:
+        return True
+    if tag.name in PAGE_TAGS:
+        return False
+    return any(BOILERPLATE_NAMES.search(name) for name in _names(tag))
+
+
+def link_density(tag: Tag, text_length: Optional[int] = None) -> float:
+    """Share of an element's text that sits inside links."""
+    if text_length is None:
+        text_length = len(tag.get_text(strip=True))
+    if not text_length:
+        return 0.0
+    link_length = sum(len(link.get_text(strip=True)) for link in tag.find_all('a'))
+    return min(1.0, link_length / text_length)
+
+
+def body_paragraphs(container: Tag) -> List[str]:
+    """
+    Paragraph texts of a container, without the ones inside boilerplate
+    blocks or made up mostly of links.
+
+    Args:
+        container: Element holding the article body
+
+    Returns:
+        Non-empty paragraph texts in document order
+    """
+    verdicts: Dict[int, bool] = {id(container): False}
+    paragraphs = []
+    for paragraph in container.find_all('p'):
+        if _pruned(paragraph, verdicts):
+            continue
+        text = paragraph.get_text(strip=True)
+        if text and link_density(paragraph, len(text)) <= MAX_PARAGRAPH_LINK_DENSITY:
+            paragraphs.append(text)
+    return paragraphs
+
+
+def find_main_content(soup: Tag) -> List[Tag]:
+    """
+    Score every paragraph container on the page and return the best one,
+    followed in document order by siblings that score close to it.
+
+    Each paragraph outside boilerplate blocks adds 1 point, 1 per comma and
+    1 per 100 characters (up to 3) to its parent and half that to its
+    grandparent. A container's total is then scaled by 1 - its link density.
+
+    Args:
+        soup: Parsed page (or any element to search within)
+
+    Returns:
+        Body containers in document order, or [] when no paragraph qualifies
+    """
+    verdicts: Dict[int, bool] = {}
+    scores: Dict[int, float] = {}
+    candidates: Dict[int, Tag] = {}
+
+    for paragraph in soup.find_all('p'):
+        if _pruned(paragraph, verdicts):
+            continue
+        text = paragraph.get_text(strip=True)
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(',') + min(len(text) // 100, 3)
+        for ancestor, share in ((paragraph.parent, 1.0), (paragraph.parent and paragraph.parent.parent, 0.5)):
+            if not isinstance(ancestor, Tag) or ancestor.name in ('html', '[document]'):
+                continue
+            key = id(ancestor)
+            if key not in candidates:
+                candidates[key] = ancestor
+                scores[key] = TAG_SCORES.get(ancestor.name, 0) + class_weight(ancestor)
+            scores[key] += score * share
+
+    if not candidates:
+        return []
+
+    for key, candidate in candidates.items():
+        scores[key] *= 1 - link_density(candidate)
+    best_key = max(scores, key=scores.get)
+    best = candidates[best_key]
+    if best.parent is None:
+        return [best]
+
+    # Bodies split across sibling blocks (e.g. one div per paragraph group)
+    threshold = max(10.0, scores[best_key] * SIBLING_SCORE_RATIO)
+    return [
+        sibling for sibling in best.parent.find_all(True, recursive=False)
+        if sibling is best or (id(sibling) in scores and scores[id(sibling)] >= threshold)
+    ]
+
+
+def extract_main_content(soup: Tag) -> str:
+    """
+    Article body of a page found by text density alone.
+
+    Args:
+        soup: Parsed page
+
+    Returns:
+        Body paragraphs separated by blank lines ('' if none were found)
+    """
+    paragraphs = []
+    for container in find_main_content(soup):
+        paragraphs.extend(body_paragraphs(container))
+    return '\n\n'.join(paragraphs)
+
+
+def _names(tag: Tag) -> List[str]:
+    names = list(tag.get('class') or ())
+    element_id = tag.get('id')
+    if element_id:
+        names.append(element_id)
+    return names
+
+
+def _pruned(tag: Optional[Tag], verdicts: Dict[int, bool]) -> bool:
+    """Whether tag or an ancestor is boilerplate; verdicts caches elements already walked."""
+    path = []
+    pruned = False
+    while isinstance(tag, Tag):
+        key = id(tag)
+        if key in verdicts:
+            pruned = verdicts[key]
+            break
+        path.append(key)
+        if is_boilerplate(tag):
+            pruned = True
+            break
+        tag = tag.parent
+    for key in path:
+        verdicts[key] = pruned
+    return pruned
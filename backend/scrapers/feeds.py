@@ -0,0 +1,160 @@
+"""
+Feed Parsing
+Extracts article URLs and timestamps from RSS, Atom and sitemap documents.
+"""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Tuple
+
+# (url, timestamp) pairs; timestamp is None when the feed does not carry one
+FeedEntry = Tuple[str, Optional[datetime]]
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an RFC 822 (RSS) or ISO 8601 (Atom, sitemap) timestamp.
+
+    Args:
+        value: Raw timestamp string
+
+    Returns:
+        Timezone-aware UTC datetime or None if it cannot be parsed
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element: ET.Element, *names: str) -> Optional[str]:
+    """Return the text of the first direct child matching any of the names."""
+    for child in element:
+        if _local_name(child.tag) in names and child.text:
+            return child.text.strip()
+    return None
+
+
+def _parse_rss(root: ET.Element) -> List[FeedEntry]:
+    entries = []
+    for item in root.iter():
+        if _local_name(item.tag) != 'item':
+            continue
+        url = _child_text(item, 'link')
+        if not url:
+            continue
+        timestamp = parse_timestamp(_child_text(item, 'pubDate', 'date', 'updated'))
+        entries.append((url, timestamp))
+    return entries
+
+
+def _parse_atom(root: ET.Element) -> List[FeedEntry]:
+    entries = []
+    for entry in root:
+        if _local_name(entry.tag) != 'entry':
+            continue
+        url = None
+        for child in entry:
+            if _local_name(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate':
+                url = child.get('href')
+                break
+        if not url:
+            continue
+        timestamp = parse_timestamp(_child_text(entry, 'updated', 'published'))
+        entries.append((url, timestamp))
+    return entries
+
+
+def _parse_sitemap(root: ET.Element) -> List[FeedEntry]:
+    entries = []
+    for node in root:
+        if _local_name(node.tag) not in ('url', 'sitemap'):
+            continue
+        url = _child_text(node, 'loc')
+        if not url:
+            continue
+
+        raw_timestamp = _child_text(node, 'lastmod')
+        if not raw_timestamp:
+            # Google News sitemaps nest the date inside <news:news>
+            for child in node:
+                if _local_name(child.tag) == 'news':
+                    raw_timestamp = _child_text(child, 'publication_date')
+                    break
+        entries.append((url, parse_timestamp(raw_timestamp)))
+    return entries
+
+
+def parse_feed(document: str) -> Tuple[str, List[FeedEntry]]:
+    """
+    Parse an RSS, Atom or sitemap document.
+
+    For a sitemap index the entries are the child sitemap URLs.
+
+    Args:
+        document: Raw XML content
+
+    Returns:
+        Tuple of (kind, entries) where kind is 'rss', 'atom', 'sitemap',
+        'sitemapindex' or '' if the document is not a recognised feed
+    """
+    try:
+        root = ET.fromstring(document.encode('utf-8') if isinstance(document, str) else document)
+    except ET.ParseError:
+        return '', []
+
+    kind = _local_name(root.tag)
+    if kind in ('rss', 'RDF'):
+        return 'rss', _parse_rss(root)
+    if kind == 'feed':
+        return 'atom', _parse_atom(root)
+    if kind == 'urlset':
+        return 'sitemap', _parse_sitemap(root)
+    if kind == 'sitemapindex':
+        return 'sitemapindex', _parse_sitemap(root)
+    return '', []
+
+
+def entries_since(entries: List[FeedEntry], since: Optional[datetime]) -> List[FeedEntry]:
+    """
+    Keep entries newer than a cutoff, newest first.
+
+    Entries without a timestamp are kept since their age is unknown.
+
+    Args:
+        entries: Parsed feed entries
+        since: Cutoff (timezone-aware); None keeps everything
+
+    Returns:
+        Filtered, de-duplicated entries sorted newest first
+    """
+    seen = set()
+    fresh = []
+    for url, timestamp in entries:
+        if url in seen:
+            continue
+        seen.add(url)
+        if since is not None and timestamp is not None and timestamp <= since:
+            continue
+        fresh.append((url, timestamp))
+
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    fresh.sort(key=lambda entry: entry[1] or oldest, reverse=True)
+    return fresh
@@ -0,0 +1,179 @@
+"""
+Fetch Backends
+Pluggable transports behind BaseScraper.fetch_page: live HTTP, live HTTP
+recorded to WARC files, or offline replay of recorded WARC files
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from config.settings import (
+    FETCH_BACKEND,
+    WARC_DIR,
+    REPLAY_LATENCY_MS,
+    REPLAY_JITTER_MS,
+    REPLAY_CONCURRENCY,
+)
+from utils import metrics
+from utils.warc import WarcWriter, body_charset, iter_responses
+
+FETCH_SECONDS = metrics.histogram('crawler_fetch_seconds', 'Page and feed fetch latency', ['host', 'transport'])
+FETCH_BYTES = metrics.counter('crawler_fetch_bytes_total', 'Response bytes fetched', ['host', 'transport'])
+
+# Zero-argument callable performing the real network fetch
+LiveFetch = Callable[[], Optional[Union[str, bytes]]]
+
+
+class LiveBackend:
+    """Fetches over the network (the default)."""
+
+    name = 'live'
+
+    def fetch(self, url: str, fetch_live: LiveFetch, binary: bool = False):
+        """
+        Fetch a URL.
+
+        Args:
+            url: URL being fetched
+            fetch_live: Callable doing the network request
+            binary: Whether the caller expects bytes (feeds) rather than text
+
+        Returns:
+            Page text (or bytes when binary), or None if unavailable
+        """
+        return fetch_live()
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class RecordingBackend(LiveBackend):
+    """Fetches over the network and appends every successful response to a WARC file."""
+
+    name = 'record'
+
+    def __init__(self, warc_dir: str = WARC_DIR):
+        """
+        Initialize the recorder.
+
+        Args:
+            warc_dir: Directory for the WARC file (one file per process)
+        """
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        self.writer = WarcWriter(str(Path(warc_dir) / f"crawl-{stamp}-{os.getpid()}.warc.gz"))
+
+    def fetch(self, url: str, fetch_live: LiveFetch, binary: bool = False):
+        content = fetch_live()
+        if content:
+            if binary:
+                self.writer.write_response(url, content, content_type='application/xml')
+            else:
+                self.writer.write_response(url, content.encode('utf-8'))
+        return content
+
+    def close(self):
+        self.writer.close()
+
+
+class ReplayBackend(LiveBackend):
+    """
+    Serves pages from recorded WARC files without touching the network.
+
+    Each fetch waits latency_ms (+/- jitter_ms) while holding one of
+    `concurrency` slots, modelling a server that answers at most that many
+    requests at once. Unrecorded URLs and non-200 records are served as
+    failures (None), like a failed live fetch.
+    """
+
+    name = 'replay'
+
+    def __init__(self, warc_path: str = WARC_DIR, latency_ms: float = REPLAY_LATENCY_MS,
+                 jitter_ms: float = REPLAY_JITTER_MS, concurrency: int = REPLAY_CONCURRENCY):
+        """
+        Load recorded responses.
+
+        Args:
+            warc_path: A .warc/.warc.gz file or a directory of them
+            latency_ms: Mean simulated response time
+            jitter_ms: Maximum random deviation from latency_ms
+            concurrency: Maximum simultaneous in-flight responses
+        """
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self.responses: Dict[str, Tuple[int, bytes, str]] = {}
+
+        for path in self._warc_files(Path(warc_path)):
+            for url, status, headers, body in iter_responses(str(path)):
+                # Later recordings of the same URL replace earlier ones
+                self.responses[url] = (status, body, body_charset(headers))
+
+        if not self.responses:
+            print(f"Warning: no WARC responses found at {warc_path}")
+
+    def fetch(self, url: str, fetch_live: LiveFetch, binary: bool = False):
+        host = urlsplit(url).netloc
+        with FETCH_SECONDS.time(host=host, transport='replay'), self._slots:
+            delay = self.latency + random.uniform(-self.jitter, self.jitter)
+            if delay > 0:
+                time.sleep(delay)
+
+        response = self.responses.get(url)
+        if response is None or response[0] != 200:
+            return None
+
+        _, body, charset = response
+        FETCH_BYTES.inc(len(body), host=host, transport='replay')
+        if binary:
+            return body
+        return body.decode(charset, errors='replace')
+
+    @staticmethod
+    def _warc_files(path: Path) -> List[Path]:
+        if path.is_file():
+            return [path]
+        if not path.is_dir():
+            return []
+        return sorted(p for p in path.iterdir() if p.name.endswith(('.warc', '.warc.gz')))
+
+
+BACKENDS = {
+    'live': LiveBackend,
+    'record': RecordingBackend,
+    'replay': ReplayBackend,
+}
+
+_backend: Optional[LiveBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_fetch_backend() -> LiveBackend:
+    """
+    Return the process-wide fetch backend selected by FETCH_BACKEND.
+
+    Shared so all scrapers record into one WARC file and replay from one
+    loaded index.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if FETCH_BACKEND not in BACKENDS:
+                    raise ValueError(f"Unsupported FETCH_BACKEND: {FETCH_BACKEND}")
+                _backend = BACKENDS[FETCH_BACKEND]()
+    return _backend
+
+
+def close_fetch_backend():
+    """Close the shared fetch backend (flushes the WARC file when recording)."""
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+            _backend = None
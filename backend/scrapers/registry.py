@@ -0,0 +1,83 @@
+"""
+Scraper Registry
+Resolves the scraper_class of a source configuration to a scraper class,
+importing its module only when a source actually needs it
+"""
+
+import importlib
+import threading
+from typing import Dict, Optional, Type
+
+# Bare class names used by older sources.json files and the Appwrite
+# sources collection, mapped to their "module:Class" paths
+BUILTIN_SCRAPERS = {
+    'TechCrunchScraper': 'scrapers.techcrunch:TechCrunchScraper',
+    'TheVergeScraper': 'scrapers.theverge:TheVergeScraper',
+    'ArsTechnicaScraper': 'scrapers.arstechnica:ArsTechnicaScraper',
+    'WiredScraper': 'scrapers.wired:WiredScraper',
+}
+
+_classes: Dict[str, type] = {}
+_lock = threading.Lock()
+
+
+def scraper_path(scraper_class: str) -> Optional[str]:
+    """
+    Normalise a scraper_class value to "module:Class".
+
+    Args:
+        scraper_class: "module:Class" or a built-in class name
+
+    Returns:
+        "module:Class" path, or None if the value is not recognised
+    """
+    if not scraper_class:
+        return None
+    if ':' in scraper_class:
+        return scraper_class
+    return BUILTIN_SCRAPERS.get(scraper_class)
+
+
+def resolve_scraper_class(scraper_class: str) -> Optional[Type]:
+    """
+    Import and return the scraper class named by a source configuration.
+
+    Args:
+        scraper_class: "module:Class" (e.g. "scrapers.wired:WiredScraper") or a built-in class name
+
+    Returns:
+        Scraper class, or None if it is unknown or cannot be imported
+    """
+    path = scraper_path(scraper_class)
+    if path is None:
+        return None
+
+    cls = _classes.get(path)
+    if cls is None:
+        module_name, _, class_name = path.partition(':')
+        try:
+            module = importlib.import_module(module_name)
+            cls = getattr(module, class_name)
+        except (ImportError, AttributeError) as e:
+            print(f"Warning: Could not load scraper {path}: {str(e)}")
+            return None
+        with _lock:
+            _classes[path] = cls
+    return cls
+
+
+def create_scraper(source: Dict):
+    """
+    Instantiate the scraper for a source configuration.
+
+    Args:
+        source: Source configuration with a scraper_class
+
+    Returns:
+        Scraper instance, or None if no scraper is available
+    """
+    cls = resolve_scraper_class(source.get('scraper_class'))
+    if cls is None:
+        print(f"Warning: No scraper for {source.get('name')} ({source.get('scraper_class')}). Skipping.")
+        return None
+    return cls(source)
@@ -3,8 +3,9 @@ TechCrunch Scraper
 Scrapes tech news articles from TechCrunch.com
 """
 
-from typing import Dict, List, Optional
+from typing import List, Optional
 from bs4 import BeautifulSoup
+from models.article import Article
 from .base_scraper import BaseScraper
 
 
@@ -24,6 +25,9 @@ class TechCrunchScraper(BaseScraper):
                 if url.startswith('http') and 'techcrunch.com' in url:
                     links.append(url)
         
+        # Free the parse tree now rather than at the next garbage collection
+        self.release(soup)
+        
         # Remove duplicates while preserving order
         seen = set()
         unique_links = []
@@ -34,7 +38,7 @@ class TechCrunchScraper(BaseScraper):
         
         return unique_links
     
-    def extract_article_content(self, url: str, html: str) -> Optional[Dict]:
+    def extract_article_content(self, url: str, html: str) -> Optional[Article]:
         """Extract article content from TechCrunch article page."""
         soup = BeautifulSoup(html, 'html.parser')
         
@@ -51,10 +55,7 @@ class TechCrunchScraper(BaseScraper):
             if not content_div:
                 content_div = soup.find('article')
             
-            content = ''
-            if content_div:
-                paragraphs = content_div.find_all('p')
-                content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+            content = self.extract_body(soup, content_div)
             
             # Extract author
             author_tag = soup.find('a', {'rel': 'author'})
@@ -84,18 +85,20 @@ class TechCrunchScraper(BaseScraper):
             for tag_link in tag_links:
                 tags.append(tag_link.get_text(strip=True))
             
-            return {
-                'title': title,
-                'content': content,
-                'author': author,
-                'published_date': published_date,
-                'source_url': url,
-                'featured_image': featured_image,
-                'images': images,
-                'category': category,
-                'tags': tags,
-            }
+            return Article(
+                title=title,
+                content=content,
+                author=author,
+                published_date=published_date,
+                url=url,
+                image_url=featured_image,
+                images=images,
+                category=category,
+                tags=tags
+            )
         
         except Exception as e:
             print(f"Error extracting content from {url}: {str(e)}")
             return None
+        finally:
+            self.release(soup)
@@ -3,8 +3,9 @@ The Verge Scraper
 Scrapes tech news articles from TheVerge.com
 """
 
-from typing import Dict, List, Optional
+from typing import List, Optional
 from bs4 import BeautifulSoup
+from models.article import Article
 from .base_scraper import BaseScraper
 
 
@@ -27,10 +28,13 @@ class TheVergeScraper(BaseScraper):
                 if 'theverge.com' in url and '/23' in url:  # Verge article pattern
                     links.append(url)
         
+        # Free the parse tree now rather than at the next garbage collection
+        self.release(soup)
+        
         # Remove duplicates
         return list(dict.fromkeys(links))
     
-    def extract_article_content(self, url: str, html: str) -> Optional[Dict]:
+    def extract_article_content(self, url: str, html: str) -> Optional[Article]:
         """Extract article content from The Verge article page."""
         soup = BeautifulSoup(html, 'html.parser')
         
@@ -47,10 +51,7 @@ class TheVergeScraper(BaseScraper):
             if not article_body:
                 article_body = soup.find('article')
             
-            content = ''
-            if article_body:
-                paragraphs = article_body.find_all('p')
-                content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+            content = self.extract_body(soup, article_body)
             
             # Extract author
             author = 'The Verge Staff'
@@ -77,18 +78,20 @@ class TheVergeScraper(BaseScraper):
                 if src and src.startswith('http'):
                     images.append(src)
             
-            return {
-                'title': title,
-                'content': content,
-                'author': author,
-                'published_date': published_date,
-                'source_url': url,
-                'featured_image': featured_image,
-                'images': images,
-                'category': 'Technology',
-                'tags': [],
-            }
+            return Article(
+                title=title,
+                content=content,
+                author=author,
+                published_date=published_date,
+                url=url,
+                image_url=featured_image,
+                images=images,
+                category='Technology',
+                tags=[]
+            )
         
         except Exception as e:
             print(f"Error extracting content from {url}: {str(e)}")
             return None
+        finally:
+            self.release(soup)
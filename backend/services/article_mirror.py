@@ -0,0 +1,238 @@
+"""
+Article Mirror
+Local SQLite copy of the Appwrite articles collection, indexed by canonical
+URL and content hash, so "have we already saved this?" and lookups by ID or
+URL are answered without an HTTP round trip
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from appwrite.query import Query
+from utils.text_cleaner import canonical_url
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def document_hash(document) -> str:
+    """
+    Hash the text of an article document, so the same story saved under a
+    different URL is still recognised.
+
+    Args:
+        document: Article document (or Article) with title and summary
+
+    Returns:
+        Hex SHA-256 of the normalised title and summary
+    """
+    if hasattr(document, 'to_appwrite'):
+        document = document.to_appwrite()
+    text = f"{document.get('title') or ''}\n{document.get('summary') or ''}"
+    return hashlib.sha256(_WHITESPACE.sub(' ', text).strip().lower().encode('utf-8')).hexdigest()
+
+
+class ArticleMirror:
+    """
+    SQLite mirror of the articles collection.
+
+    Kept current by sync() (incremental by $updatedAt) and by
+    AppwriteManager writing through every save, update and delete.
+    Deletions made outside this process only disappear on a full sync.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the mirror database.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS articles ('
+            ' id TEXT PRIMARY KEY,'
+            ' canonical_url TEXT,'
+            ' content_hash TEXT,'
+            ' updated_at TEXT,'
+            ' data TEXT NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_url ON articles (canonical_url)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_articles_hash ON articles (content_hash)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)')
+        # Last translated text of each article, including fields the collection does not store (content)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS translations (id TEXT PRIMARY KEY, data TEXT NOT NULL)')
+        self._conn.commit()
+
+    def upsert(self, document: Dict):
+        """Store or replace one Appwrite document."""
+        self.upsert_many([document])
+
+    def upsert_many(self, documents: Iterable[Dict]):
+        """Store or replace Appwrite documents in one transaction."""
+        rows = [
+            (
+                document['$id'],
+                canonical_url(document.get('url') or ''),
+                document_hash(document),
+                document.get('$updatedAt'),
+                json.dumps(document, ensure_ascii=False),
+            )
+            for document in documents
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                'INSERT INTO articles (id, canonical_url, content_hash, updated_at, data) VALUES (?, ?, ?, ?, ?)'
+                ' ON CONFLICT(id) DO UPDATE SET canonical_url = excluded.canonical_url,'
+                ' content_hash = excluded.content_hash, updated_at = excluded.updated_at, data = excluded.data',
+                rows
+            )
+            self._conn.commit()
+
+    def remove(self, document_id: str):
+        """Forget a deleted document."""
+        with self._lock:
+            self._conn.execute('DELETE FROM articles WHERE id = ?', (document_id,))
+            self._conn.execute('DELETE FROM translations WHERE id = ?', (document_id,))
+            self._conn.commit()
+
+    def get_translation(self, document_id: str) -> Optional[Dict]:
+        """Return the stored source and translated fields of an article, or None."""
+        return self._fetch_one('SELECT data FROM translations WHERE id = ?', document_id)
+
+    def put_translation(self, document_id: str, fields: Dict):
+        """
+        Remember the text an article was translated from and its translation,
+        so a later version only needs its changed paragraphs translated.
+        
+        Args:
+            document_id: The document ID
+            fields: e.g. title, title_am, content, content_am
+        """
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO translations (id, data) VALUES (?, ?)',
+                               (document_id, json.dumps(fields, ensure_ascii=False)))
+            self._conn.commit()
+
+    def get(self, document_id: str) -> Optional[Dict]:
+        """Return a mirrored document by ID, or None."""
+        return self._fetch_one('SELECT data FROM articles WHERE id = ?', document_id)
+
+    def get_by_url(self, url: str) -> Optional[Dict]:
+        """Return the mirrored document for a URL (compared in canonical form), or None."""
+        return self._fetch_one('SELECT data FROM articles WHERE canonical_url = ? LIMIT 1', canonical_url(url))
+
+    def get_by_hash(self, content_hash: str) -> Optional[Dict]:
+        """Return a mirrored document with this content hash, or None."""
+        return self._fetch_one('SELECT data FROM articles WHERE content_hash = ? LIMIT 1', content_hash)
+
+    def contains_url(self, url: str) -> bool:
+        """Whether an article with this URL (in canonical form) has been saved."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM articles WHERE canonical_url = ? LIMIT 1', (canonical_url(url),)
+            ).fetchone()
+        return row is not None
+
+    def find(self, article) -> Optional[Dict]:
+        """
+        Find an already saved copy of an article, by URL or else by content.
+
+        Args:
+            article: Article record or document dict
+
+        Returns:
+            The saved document, or None
+        """
+        url = article.get('url') if hasattr(article, 'get') else None
+        document = self.get_by_url(url) if url else None
+        if document is None:
+            document = self.get_by_hash(document_hash(article))
+        return document
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def last_synced_at(self) -> Optional[str]:
+        """$updatedAt of the newest document seen by the last sync."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = 'updated_at'").fetchone()
+        return row[0] if row else None
+
+    def sync(self, appwrite_manager, full: bool = False, page_size: int = 500) -> int:
+        """
+        Pull documents changed since the last sync.
+
+        Args:
+            appwrite_manager: AppwriteManager to read from
+            full: Rebuild the mirror from scratch (also drops documents deleted remotely)
+            page_size: Documents per request
+
+        Returns:
+            Number of documents fetched
+        """
+        since = None if full else self.last_synced_at()
+        # Documents updated at exactly `since` are fetched again; upserts make that harmless
+        queries = [Query.order_asc('$updatedAt')]
+        if since:
+            queries.append(Query.greater_than_equal('$updatedAt', since))
+
+        documents = appwrite_manager.iter_articles(page_size=page_size, queries=queries)
+        if full:
+            # Only clear once the first page has arrived, so a failed sync keeps the old mirror
+            first = next(documents, None)
+            with self._lock:
+                self._conn.execute('DELETE FROM articles')
+                self._conn.commit()
+            if first is None:
+                return 0
+            documents = self._chain(first, documents)
+
+        count = 0
+        latest = since
+        batch = []
+        for document in documents:
+            batch.append(document)
+            updated_at = document.get('$updatedAt')
+            if updated_at and (latest is None or updated_at > latest):
+                latest = updated_at
+            if len(batch) >= page_size:
+                count += len(batch)
+                self.upsert_many(batch)
+                batch = []
+        count += len(batch)
+        self.upsert_many(batch)
+
+        if latest:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('updated_at', ?)", (latest,)
+                )
+                self._conn.commit()
+        return count
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _fetch_one(self, sql: str, value) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(sql, (value,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _chain(first, rest):
+        yield first
+        yield from rest
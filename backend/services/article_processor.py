@@ -3,12 +3,46 @@ Article Processor Service
 Orchestrates scraping, translation, and storage of articles
 """
 
-from typing import List, Dict
-from scrapers.techcrunch import TechCrunchScraper
-from scrapers.theverge import TheVergeScraper
-from scrapers.arstechnica import ArsTechnicaScraper
-from scrapers.wired import WiredScraper
-from translators.translator import Translator
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterator, List, Dict, Optional
+from config.settings import FRONTIER_MAX_URLS, TRANSLATION_SERVICE
+from config.sources import load_sources
+from models.article import Article
+from scrapers.feeds import parse_timestamp
+from scrapers.registry import create_scraper
+from services.checkpoint import FETCHED, PARSED, TRANSLATED, SAVED
+from services.translation_policy import MAX_DEFERRED_ATTEMPTS, TranslationPolicy
+from utils.tracing import get_tracer
+
+
+class _KnownUrls:
+    """
+    skip_urls view over the frontier and, when configured, the mirror of
+    saved articles, so already saved articles are not fetched again unless
+    their feed entry was updated since (see saved_before()).
+    """
+    
+    def __init__(self, frontier, mirror=None):
+        self.frontier = frontier
+        self.mirror = mirror
+    
+    def __contains__(self, url) -> bool:
+        return url in self.frontier or (self.mirror is not None and self.mirror.contains_url(url))
+    
+    def saved_before(self, url: str, updated: datetime) -> bool:
+        """Whether a known article was last scraped or saved before its feed entry was updated."""
+        seen = [self.frontier[url]] if self.frontier.get(url) is not None else []
+        document = self.mirror.get_by_url(url) if self.mirror is not None else None
+        saved_at = parse_timestamp(document.get('$updatedAt')) if document else None
+        if saved_at is not None:
+            seen.append(saved_at)
+        return bool(seen) and max(seen) < updated
+    
+    def __bool__(self) -> bool:
+        return bool(self.frontier) or self.mirror is not None
 
 
 class ArticleProcessor:
@@ -17,94 +51,413 @@ class ArticleProcessor:
     scrape -> translate -> store
     """
     
-    def __init__(self, appwrite_manager=None):
+    def __init__(self, appwrite_manager=None, sources: Optional[List[Dict]] = None, checkpoint=None,
+                 image_pipeline=None, translation_policy: Optional[TranslationPolicy] = None):
         """
         Initialize the article processor.
         
         Args:
             appwrite_manager: Instance of AppwriteManager for database operations
+            sources: Source configurations (defaults to enabled entries in config/sources.json)
+            checkpoint: Optional CheckpointStore for resumable pipeline runs
+            image_pipeline: Optional ImagePipeline moving featured images to Appwrite Storage before saving
+            translation_policy: What to translate now, later or not at all (defaults to TRANSLATION_MODE
+                with the TRANSLATION_*_CHAR_BUDGET budgets and no deferred queue)
         """
         self.appwrite_manager = appwrite_manager
-        self.translator = Translator(service='google')
-        
-        # Initialize scrapers
-        self.scrapers = {
-            'techcrunch': TechCrunchScraper({
-                'name': 'TechCrunch',
-                'url': 'https://techcrunch.com/'
-            }),
-            'theverge': TheVergeScraper({
-                'name': 'The Verge',
-                'url': 'https://www.theverge.com/'
-            }),
-            'arstechnica': ArsTechnicaScraper({
-                'name': 'Ars Technica',
-                'url': 'https://arstechnica.com/'
-            }),
-            'wired': WiredScraper({
-                'name': 'Wired',
-                'url': 'https://www.wired.com/'
-            })
-        }
-    
-    def scrape_all_sources(self, max_articles_per_source: int = 5) -> List[Dict]:
+        self.checkpoint = checkpoint
+        self.image_pipeline = image_pipeline
+        self.translation_policy = translation_policy or TranslationPolicy()
+        self._translator = None
+        
+        # URLs already scraped, kept across daemon cycles so they are not refetched
+        self.frontier: "OrderedDict[str, datetime]" = OrderedDict()
+        
+        # Set (e.g. from a SIGTERM handler) to stop scraping further sources
+        self.stop_event = threading.Event()
+        
+        # URLs checkpointed by earlier runs are either done or resumed, never refetched
+        # (unless their feed entry is updated after the checkpoint, see _KnownUrls)
+        if self.checkpoint is not None:
+            for url, updated_at in self.checkpoint.urls():
+                self._remember_urls([url], updated_at)
+        
+        # Scrapers are created (and their modules imported) on first use
+        self.sources = {}
+        for source in sources if sources is not None else load_sources():
+            self.sources[self._scraper_key(source)] = source
+        self.scrapers = {}
+    
+    @property
+    def translator(self):
+        """Translator for TRANSLATION_SERVICE, created on first use."""
+        if self._translator is None:
+            from translators.translator import Translator
+            self._translator = Translator(service=TRANSLATION_SERVICE)
+        return self._translator
+    
+    @translator.setter
+    def translator(self, translator):
+        self._translator = translator
+    
+    @staticmethod
+    def _scraper_key(source: Dict) -> str:
+        """Key used in self.scrapers for a source, e.g. 'The Verge' -> 'theverge'."""
+        return source['name'].lower().replace(' ', '')
+    
+    def get_scraper(self, key: str):
         """
-        Scrape articles from all configured sources.
+        Return the scraper for a configured source, creating it on first use.
         
         Args:
-            max_articles_per_source: Maximum articles to scrape from each source
+            key: Scraper key (see _scraper_key)
+            
+        Returns:
+            Scraper instance, or None if the source is unknown or has no scraper
+        """
+        scraper = self.scrapers.get(key)
+        if scraper is None and key in self.sources:
+            scraper = create_scraper(self.sources[key])
+            if scraper is None:
+                # Do not retry (and warn about) a source without a scraper
+                del self.sources[key]
+            else:
+                self.scrapers[key] = scraper
+        return scraper
+    
+    @property
+    def known_urls(self) -> _KnownUrls:
+        """URLs to skip when scraping: already scraped or already saved."""
+        return _KnownUrls(self.frontier, getattr(self.appwrite_manager, 'mirror', None))
+    
+    def _remember_urls(self, urls, scraped_at: Optional[datetime] = None):
+        """Add article URLs to the frontier with their scrape time (default now), evicting the oldest."""
+        scraped_at = scraped_at or datetime.now(timezone.utc)
+        for url in urls:
+            if url:
+                self.frontier[url] = scraped_at
+                self.frontier.move_to_end(url)
+        while len(self.frontier) > FRONTIER_MAX_URLS:
+            self.frontier.popitem(last=False)
+    
+    def scrape_source(self, source: Dict, max_articles: int = 5) -> List[Article]:
+        """
+        Scrape a single source, reusing its scraper if one already exists.
+        
+        Args:
+            source: Source configuration (e.g. from CrawlScheduler)
+            max_articles: Maximum articles to scrape
             
         Returns:
             List of scraped articles
+            
+        Raises:
+            RuntimeError: If the source has no scraper or its links could not be fetched
         """
-        all_articles = []
+        key = self._scraper_key(source)
+        scraper = self.scrapers.get(key)
+        if scraper is None:
+            scraper = create_scraper(source)
+            if scraper is None:
+                raise RuntimeError(f"No scraper available for {source.get('name')}")
+            self.scrapers[key] = scraper
         
-        for source_name, scraper in self.scrapers.items():
+        if scraper.feed_cutoff is None:
+            scraper.feed_cutoff = parse_timestamp(source.get('feed_cutoff') or source.get('last_crawled'))
+        
+        articles = scraper.run(max_articles=max_articles, skip_urls=self.known_urls, checkpoint=self.checkpoint)
+        self._remember_urls(article.url for article in articles)
+        if scraper.last_error:
+            raise RuntimeError(scraper.last_error)
+        return articles
+    
+    def feed_cutoff(self, source: Dict) -> Optional[datetime]:
+        """Feed entries of a source up to this time have been crawled (None if unknown)."""
+        scraper = self.scrapers.get(self._scraper_key(source))
+        return scraper.feed_cutoff if scraper is not None else None
+    
+    def iter_sources(self, max_articles_per_source: int = 5) -> Iterator[List[Article]]:
+        """
+        Scrape all configured sources, yielding each source's articles.
+        
+        Args:
+            max_articles_per_source: Maximum articles to scrape from each source
+            
+        Yields:
+            List of scraped articles for one source
+        """
+        # Configured sources, plus any scrapers added directly to self.scrapers
+        for source_name in list(dict.fromkeys([*self.sources, *self.scrapers])):
+            if self.stop_event.is_set():
+                print("Stop requested. Skipping remaining sources.")
+                break
+            
+            scraper = self.get_scraper(source_name)
+            if scraper is None:
+                continue
+            
             print(f"\n{'='*60}")
             print(f"Scraping {source_name}...")
             print(f"{'='*60}")
             
             try:
-                articles = scraper.run(max_articles=max_articles_per_source)
-                all_articles.extend(articles)
+                articles = scraper.run(
+                    max_articles=max_articles_per_source,
+                    skip_urls=self.known_urls,
+                    checkpoint=self.checkpoint
+                )
+                self._remember_urls(article.url for article in articles)
                 print(f"✓ Scraped {len(articles)} articles from {source_name}")
+                yield articles
             except Exception as e:
                 print(f"✗ Error scraping {source_name}: {str(e)}")
+    
+    def scrape_all_sources(self, max_articles_per_source: int = 5) -> List[Article]:
+        """
+        Scrape articles from all configured sources.
         
-        return all_articles
+        Args:
+            max_articles_per_source: Maximum articles to scrape from each source
+            
+        Returns:
+            List of scraped articles
+        """
+        return [article for articles in self.iter_sources(max_articles_per_source) for article in articles]
     
-    def translate_articles(self, articles: List[Dict]) -> List[Dict]:
+    def resume_checkpointed(self, translate: bool = True, save: bool = True) -> List[Article]:
         """
-        Translate a list of articles to Amharic.
+        Recover articles left unfinished by an interrupted run.
+        
+        Fetched pages are re-parsed from the stored HTML; parsed and
+        translated articles are picked up where they stopped.
         
         Args:
-            articles: List of article dictionaries
+            translate: Whether this run translates (parsed articles still need it)
+            save: Whether this run saves (translated articles still need it)
             
         Returns:
-            List of articles with translations added
+            List of articles to feed back into the pipeline
+        """
+        if self.checkpoint is None:
+            return []
+        
+        articles = []
+        if translate or save:
+            articles.extend(Article.from_dict(entry['data']) for entry in self.checkpoint.pending(PARSED))
+        if save:
+            articles.extend(Article.from_dict(entry['data']) for entry in self.checkpoint.pending(TRANSLATED))
+        
+        for entry in self.checkpoint.pending(FETCHED):
+            scraper = self.get_scraper(self._scraper_key({'name': entry['source'] or ''}))
+            article = scraper.parse_article(entry['url'], entry['data']) if scraper else None
+            if article:
+                self.checkpoint.mark_parsed(entry['url'], article, source=entry['source'])
+                articles.append(article)
+            else:
+                self.checkpoint.discard(entry['url'])
+        
+        if articles:
+            print(f"Resuming {len(articles)} articles from checkpoint")
+        return articles
+    
+    def _source_config(self, article: Article) -> Dict:
+        """Configuration of the source an article came from ({} if unknown)."""
+        return self.sources.get(self._scraper_key({'name': article.source or ''}), {})
+    
+    def _translate_fields(self, article: Article, fields, previous: Optional[Dict]) -> Article:
+        """Translate some fields of an article and charge what was sent to the budgets."""
+        sent = self.translator.characters_sent
+        try:
+            return self.translator.translate_article(article, previous=previous, fields=fields)
+        finally:
+            self.translation_policy.charge(article.source, self.translator.characters_sent - sent)
+    
+    def translate_article(self, article: Article) -> Article:
         """
-        translated_articles = []
+        Translate one article to Amharic, skipping it if a checkpoint shows
+        it was already translated.
         
-        for i, article in enumerate(articles, 1):
-            print(f"\nTranslating article {i}/{len(articles)}: {article.get('title', 'Unknown')[:50]}...")
+        The translation policy decides which fields are translated now;
+        fields it defers (by mode or budget) are queued for translate_deferred().
+        
+        Args:
+            article: Article record
+            
+        Returns:
+            Article with translations added (unchanged if translation failed)
+        """
+        url = article.url
+        if self.checkpoint is not None and self.checkpoint.get_stage(url) in (TRANSLATED, SAVED):
+            return article
+        
+        print(f"\nTranslating: {(article.title or 'Unknown')[:50]}...")
+        
+        try:
+            # A new version of a saved article only pays for its changed paragraphs
+            previous = self._stored_version(article)
+            now, later = self.translation_policy.plan(
+                article.source,
+                lambda fields: self.translator.untranslated_characters(article, previous, fields),
+                self._source_config(article),
+            )
+            translated_article = self._translate_fields(article, now, previous) if now else article
+        except Exception as e:
+            print(f"✗ Translation failed: {str(e)}")
+            # Still include the article without translation
+            return article
+        
+        if later and self.translation_policy.defer(translated_article, later):
+            print(f"⏸ Deferred {', '.join(later)} translation")
+        if self.checkpoint is not None and url:
+            self.checkpoint.mark(url, TRANSLATED, translated_article)
+        if now:
+            print(f"✓ Translation successful")
+        return translated_article
+    
+    def translate_deferred(self) -> Iterator[Article]:
+        """
+        Translate queued fields while the budgets allow, oldest first.
+        
+        Articles whose queued fields do not fit the remaining budget stay
+        queued for the next cycle; those larger than a whole cycle's budget
+        are dropped.
+        
+        Yields:
+            Articles with their deferred fields translated
+        """
+        queue = self.translation_policy.queue
+        if queue is None:
+            return
+        
+        for item in queue.items():
+            if self.stop_event.is_set():
+                break
+            article, fields = item['article'], item['fields']
+            previous = self._stored_version(article)
+            cost = self.translator.untranslated_characters(article, previous, fields)
+            if self.translation_policy.exceeds_budget(article.source, cost, self._source_config(article)):
+                queue.remove(item['url'])
+                print(f"✗ Dropping deferred translation: {cost} characters exceed the budget")
+                continue
+            if not self.translation_policy.fits(article.source, cost, self._source_config(article)):
+                continue
             
+            print(f"\nTranslating deferred {', '.join(fields)}: {(article.title or 'Unknown')[:50]}...")
             try:
-                translated_article = self.translator.translate_article(article)
-                translated_articles.append(translated_article)
-                print(f"✓ Translation successful")
+                article = self._translate_fields(article, fields, previous)
+                failed = any(article[f'{field}_am'] is None for field in fields)
             except Exception as e:
                 print(f"✗ Translation failed: {str(e)}")
-                # Still include the article without translation
-                translated_articles.append(article)
+                failed = True
+            
+            if failed:
+                if queue.failed(item['url']) >= MAX_DEFERRED_ATTEMPTS:
+                    queue.remove(item['url'])
+                    print(f"✗ Giving up on deferred translation after {MAX_DEFERRED_ATTEMPTS} attempts")
+                continue
+            queue.remove(item['url'])
+            yield article
+    
+    def translate_articles(self, articles: List[Article]) -> List[Article]:
+        """
+        Translate a list of articles to Amharic.
         
-        return translated_articles
+        Args:
+            articles: List of Article records
+            
+        Returns:
+            List of articles with translations added
+        """
+        return [self.translate_article(article) for article in articles]
     
-    def save_articles(self, articles: List[Dict]) -> int:
+    def _stored_version(self, article: Article) -> Optional[Dict]:
+        """The saved document for the article's URL with its last translation, from the mirror."""
+        mirror = getattr(self.appwrite_manager, 'mirror', None)
+        if mirror is None or not article.url:
+            return None
+        document = mirror.get_by_url(article.url)
+        if document is None:
+            return None
+        return {**document, **(mirror.get_translation(document['$id']) or {})}
+    
+    @staticmethod
+    def _translation_fields(article: Article) -> Dict:
+        """Source and translated text to remember for the next version of the article."""
+        fields = {}
+        for field in ('title', 'content', 'summary'):
+            if article[f'{field}_am'] is not None:
+                fields[field] = article.get_summary() if field == 'summary' else article[field]
+                fields[f'{field}_am'] = article[f'{field}_am']
+        return fields
+    
+    def _update_saved(self, article: Article, stored: Dict) -> bool:
+        """Write only the fields that changed since the stored version of an article."""
+        patch = {key: value for key, value in article.to_appwrite().items() if stored.get(key, '') != value}
+        # A failed translation never blanks out a stored one
+        patch = {key: value for key, value in patch.items() if value or not key.endswith('_am')}
+        
+        if patch:
+            if not self.appwrite_manager.update_article(stored['$id'], patch):
+                print(f"✗ Failed to update: {(article.title or 'Unknown')[:50]}...")
+                return False
+            print(f"↻ Updated {', '.join(sorted(patch))}: {(article.title or 'Unknown')[:50]}...")
+        else:
+            print(f"⏭ Already saved: {(article.title or 'Unknown')[:50]}...")
+        
+        fields = self._translation_fields(article)
+        if fields:
+            self.appwrite_manager.mirror.put_translation(stored['$id'], fields)
+        if self.checkpoint is not None and article.url:
+            self.checkpoint.mark(article.url, SAVED)
+        return True
+    
+    def save_article(self, article: Article) -> bool:
+        """
+        Save one article to Appwrite.
+        
+        A new version of an already saved article (same URL) is written as a
+        partial update of the fields that changed.
+        
+        Args:
+            article: Article record
+            
+        Returns:
+            True if the article was saved (or had been already)
+        """
+        mirror = getattr(self.appwrite_manager, 'mirror', None)
+        if mirror is not None:
+            stored = mirror.get_by_url(article.url) if article.url else None
+            if stored is not None:
+                return self._update_saved(article, stored)
+            if mirror.find(article) is not None:
+                # Same story under another URL
+                if self.checkpoint is not None and article.url:
+                    self.checkpoint.mark(article.url, SAVED)
+                print(f"⏭ Already saved: {(article.title or 'Unknown')[:50]}...")
+                return True
+        
+        try:
+            result = self.appwrite_manager.save_article(article)
+            if not result:
+                print(f"✗ Failed to save: {(article.title or 'Unknown')[:50]}...")
+                return False
+        except Exception as e:
+            print(f"✗ Failed to save article: {str(e)}")
+            return False
+        
+        if mirror is not None and self._translation_fields(article):
+            mirror.put_translation(result['$id'], self._translation_fields(article))
+        if self.checkpoint is not None and article.url:
+            self.checkpoint.mark(article.url, SAVED)
+        print(f"✓ Saved: {(article.title or 'Unknown')[:50]}...")
+        return True
+    
+    def save_articles(self, articles: List[Article]) -> int:
         """
         Save articles to Appwrite database.
         
         Args:
-            articles: List of article dictionaries
+            articles: List of Article records
             
         Returns:
             Number of successfully saved articles
@@ -113,19 +466,70 @@ class ArticleProcessor:
             print("Warning: No Appwrite manager configured. Articles not saved.")
             return 0
         
-        saved_count = 0
+        return sum(1 for article in articles if self.save_article(article))
+    
+    def iter_pipeline(self, max_articles_per_source: int = 5, translate: bool = True, save: bool = True,
+                      scheduler=None, defer_content: bool = True) -> Iterator[Article]:
+        """
+        Run the pipeline, yielding each article as soon as it is finished.
         
-        for article in articles:
-            try:
-                self.appwrite_manager.save_article(article)
-                saved_count += 1
-                print(f"✓ Saved: {article.get('title', 'Unknown')[:50]}...")
-            except Exception as e:
-                print(f"✗ Failed to save article: {str(e)}")
+        Articles flow through translate and save one source at a time, so
+        only the current source's batch is held in memory.
+        
+        Args:
+            max_articles_per_source: Maximum articles per source
+            translate: Whether to translate articles
+            save: Whether to save to database
+            scheduler: Optional CrawlScheduler; when given only sources that are due are scraped
+            defer_content: Whether content that cannot be translated now is queued
+                (False skips it; the caller has nowhere to keep content_am)
+            
+        Yields:
+            Processed Article records
+        """
+        if save and not self.appwrite_manager:
+            print("Warning: No Appwrite manager configured. Articles not saved.")
+            save = False
+        
+        # Translation budgets are per cycle
+        self.translation_policy.start_cycle(defer_content)
+        
+        # Resume anything an interrupted run left in flight, then scrape
+        batches = [self.resume_checkpointed(translate=translate, save=save)]
+        if scheduler is not None:
+            sources = scheduler.iter_due(self, max_articles_per_source)
+        else:
+            sources = self.iter_sources(max_articles_per_source)
+        
+        tracer = get_tracer()
+        for articles in chain(batches, sources):
+            if save and self.image_pipeline is not None:
+                # A whole source's images at once, so downloads and resizes overlap
+                self.image_pipeline.process(articles)
+            for article in articles:
+                # Continue the trace started when the article was fetched (resumed articles start a new one)
+                span = article.trace_context or tracer.start_span(
+                    'article', new_trace=True, url=article.url, source=article.source, resumed=True
+                )
+                with tracer.activate(span):
+                    if translate:
+                        article = self.translate_article(article)
+                    if save and not self.save_article(article):
+                        span.record_error('save failed')
+                span.end()
+                article.trace_context = None
+                yield article
         
-        return saved_count
+        # Deferred translations use whatever budget this cycle left
+        if translate and not self.stop_event.is_set():
+            for article in self.translate_deferred():
+                with tracer.span('article', new_trace=True, url=article.url, source=article.source, deferred=True) as span:
+                    if save and not self.save_article(article):
+                        span.record_error('save failed')
+                yield article
     
-    def process_pipeline(self, max_articles_per_source: int = 5, translate: bool = True, save: bool = True):
+    def process_pipeline(self, max_articles_per_source: int = 5, translate: bool = True, save: bool = True,
+                         scheduler=None, sink=None) -> List[Article]:
         """
         Run the complete article processing pipeline.
         
@@ -133,33 +537,31 @@ class ArticleProcessor:
             max_articles_per_source: Maximum articles per source
             translate: Whether to translate articles
             save: Whether to save to database
+            scheduler: Optional CrawlScheduler; when given only sources that are due are scraped
+            sink: Optional writer with a write(article) method; articles are
+                streamed to it as they finish instead of being returned
+            
+        Returns:
+            List of processed articles (empty when a sink is given)
         """
         print("\n" + "="*60)
         print("STARTING ARTICLE PROCESSING PIPELINE")
         print("="*60)
         
-        # Step 1: Scrape
-        print("\n[1/3] Scraping articles...")
-        articles = self.scrape_all_sources(max_articles_per_source)
-        print(f"\nTotal articles scraped: {len(articles)}")
-        
-        if not articles:
-            print("No articles scraped. Exiting.")
-            return
-        
-        # Step 2: Translate
-        if translate:
-            print("\n[2/3] Translating articles...")
-            articles = self.translate_articles(articles)
-        
-        # Step 3: Save
-        if save:
-            print("\n[3/3] Saving articles to database...")
-            saved_count = self.save_articles(articles)
-            print(f"\nSaved {saved_count}/{len(articles)} articles")
+        articles = []
+        count = 0
+        # The collection does not store content_am: a content translation done
+        # later only ends up in the mirror (for future diffs) or the sink
+        defer_content = sink is not None or getattr(self.appwrite_manager, 'mirror', None) is not None
+        for article in self.iter_pipeline(max_articles_per_source, translate, save, scheduler, defer_content):
+            count += 1
+            if sink is not None:
+                sink.write(article)
+            else:
+                articles.append(article)
         
         print("\n" + "="*60)
-        print("PIPELINE COMPLETED")
+        print(f"PIPELINE COMPLETED: {count} articles processed")
         print("="*60)
         
         return articles
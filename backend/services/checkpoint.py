@@ -0,0 +1,147 @@
+"""
+Pipeline Checkpoints
+Records the stage each article has reached in a local SQLite store so an
+interrupted pipeline run can resume instead of refetching and retranslating
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Pipeline stages, in order
+FETCHED = 'fetched'
+PARSED = 'parsed'
+TRANSLATED = 'translated'
+SAVED = 'saved'
+
+STAGES = [FETCHED, PARSED, TRANSLATED, SAVED]
+
+
+class CheckpointStore:
+    """
+    SQLite-backed record of per-article pipeline progress.
+
+    Each article is keyed by its source URL. The stored payload is the raw
+    HTML at the fetched stage and the article dictionary at the parsed and
+    translated stages; it is dropped once the article is saved.
+    """
+
+    def __init__(self, db_path: str, retention_days: int = 7):
+        """
+        Open (or create) the checkpoint database.
+
+        Args:
+            db_path: Path to the SQLite file
+            retention_days: Entries not updated for this long are pruned on open
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS checkpoints ('
+            ' url TEXT PRIMARY KEY,'
+            ' source TEXT,'
+            ' stage TEXT NOT NULL,'
+            ' data TEXT,'
+            ' updated_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_checkpoints_stage ON checkpoints (stage)')
+        self._conn.commit()
+        self.prune(retention_days)
+
+    def mark(self, url: str, stage: str, data=None, source: Optional[str] = None):
+        """
+        Record that an article reached a stage.
+
+        Args:
+            url: Article source URL
+            stage: One of FETCHED, PARSED, TRANSLATED, SAVED
+            data: Raw HTML (str) or Article/dict to resume from; ignored for SAVED
+            source: Source name (needed to re-parse fetched HTML)
+        """
+        payload = None
+        if stage != SAVED and data is not None:
+            if hasattr(data, 'to_dict'):
+                data = data.to_dict()
+            payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO checkpoints (url, source, stage, data, updated_at) VALUES (?, ?, ?, ?, ?)'
+                ' ON CONFLICT(url) DO UPDATE SET'
+                ' source = COALESCE(excluded.source, checkpoints.source),'
+                ' stage = excluded.stage, data = excluded.data, updated_at = excluded.updated_at',
+                (url, source, stage, payload, time.time())
+            )
+            self._conn.commit()
+
+    def mark_fetched(self, url: str, html: str, source: Optional[str] = None):
+        """Record a fetched article page (raw HTML is kept for re-parsing)."""
+        self.mark(url, FETCHED, html, source=source)
+
+    def mark_parsed(self, url: str, article, source: Optional[str] = None):
+        """Record a parsed article."""
+        self.mark(url, PARSED, article, source=source)
+
+    def discard(self, url: str):
+        """Forget a URL (e.g. its page could not be parsed)."""
+        with self._lock:
+            self._conn.execute('DELETE FROM checkpoints WHERE url = ?', (url,))
+            self._conn.commit()
+
+    def get_stage(self, url: str) -> Optional[str]:
+        """Return the last recorded stage for a URL, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute('SELECT stage FROM checkpoints WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else None
+
+    def pending(self, stage: str) -> List[Dict]:
+        """
+        List entries stuck at a stage.
+
+        Args:
+            stage: Stage to query
+
+        Returns:
+            List of dicts with url, source and data (HTML string for FETCHED,
+            article dict otherwise)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url, source, data FROM checkpoints WHERE stage = ? ORDER BY updated_at',
+                (stage,)
+            ).fetchall()
+
+        entries = []
+        for url, source, data in rows:
+            if data is None:
+                continue
+            entries.append({
+                'url': url,
+                'source': source,
+                'data': data if stage == FETCHED else json.loads(data),
+            })
+        return entries
+
+    def urls(self) -> List[Tuple[str, datetime]]:
+        """Return every URL with a checkpoint and when it was last updated, oldest first."""
+        with self._lock:
+            rows = self._conn.execute('SELECT url, updated_at FROM checkpoints ORDER BY updated_at').fetchall()
+        return [(url, datetime.fromtimestamp(updated_at, timezone.utc)) for url, updated_at in rows]
+
+    def prune(self, retention_days: int):
+        """Delete entries not updated within the retention window."""
+        cutoff = time.time() - retention_days * 86400
+        with self._lock:
+            self._conn.execute('DELETE FROM checkpoints WHERE updated_at < ?', (cutoff,))
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,191 @@
+"""
+Shared Clients
+Process-wide, lazily created clients (Appwrite, translators, the translation
+cache and the HTTP session) that survive across warm Appwrite function
+invocations, with periodic health checks and reinitialization on failure
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+from config.settings import TRANSLATION_SERVICE
+
+T = TypeVar('T')
+
+# Seconds between health checks of a reused client (0 checks on every use)
+HEALTH_CHECK_INTERVAL = float(os.getenv('CLIENT_HEALTH_CHECK_SECONDS', '300'))
+
+
+class SharedClient(Generic[T]):
+    """
+    Lazily created, thread-safe shared instance.
+
+    The instance is created on first get(). Afterwards it is health-checked
+    at most every `check_interval` seconds (or on the next get() after
+    mark_unhealthy()) and rebuilt if the check fails or raises.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T],
+                 health_check: Optional[Callable[[T], bool]] = None,
+                 close: Optional[Callable[[T], None]] = None,
+                 check_interval: Optional[float] = None):
+        """
+        Args:
+            name: Name used in log messages
+            factory: Creates the instance
+            health_check: Returns False (or raises) when the instance must be rebuilt
+            close: Releases a discarded instance
+            check_interval: Seconds between health checks (defaults to CLIENT_HEALTH_CHECK_SECONDS)
+        """
+        self.name = name
+        self.factory = factory
+        self.health_check = health_check
+        self.close_instance = close
+        self.check_interval = HEALTH_CHECK_INTERVAL if check_interval is None else check_interval
+        self._instance: Optional[T] = None
+        self._checked_at = 0.0
+        self._check_now = False
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """
+        Return the shared instance, creating or rebuilding it if needed.
+
+        Raises:
+            Whatever the factory raises (e.g. ValueError for missing configuration)
+        """
+        with self._lock:
+            if self._instance is not None and self._check_due() and not self._healthy():
+                print(f"{self.name} failed its health check. Reinitializing.")
+                self._discard()
+            if self._instance is None:
+                self._instance = self.factory()
+                self._checked_at = time.monotonic()
+            return self._instance
+
+    def mark_unhealthy(self):
+        """Force a health check on the next get() (e.g. after a failed call)."""
+        with self._lock:
+            self._check_now = True
+
+    def reset(self):
+        """Discard the instance; the next get() creates a new one."""
+        with self._lock:
+            self._discard()
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def _check_due(self) -> bool:
+        if self.health_check is None:
+            return False
+        return self._check_now or time.monotonic() - self._checked_at >= self.check_interval
+
+    def _healthy(self) -> bool:
+        try:
+            healthy = bool(self.health_check(self._instance))
+        except Exception as e:
+            print(f"{self.name} health check raised: {str(e)}")
+            healthy = False
+        self._checked_at = time.monotonic()
+        self._check_now = False
+        return healthy
+
+    def _discard(self):
+        instance, self._instance = self._instance, None
+        if instance is not None and self.close_instance is not None:
+            try:
+                self.close_instance(instance)
+            except Exception as e:
+                print(f"Error closing {self.name}: {str(e)}")
+
+
+def _create_http_session():
+    from utils.http import get_session
+    return get_session()
+
+
+def _close_http_session(session):
+    from utils.http import close_session
+    close_session()
+
+
+def _create_translation_cache():
+    from translators.translator import TranslationCache
+    return TranslationCache()
+
+
+def _create_appwrite_manager():
+    from services.appwrite_manager import AppwriteManager
+    return AppwriteManager()
+
+
+http_session = SharedClient('HTTP session', _create_http_session, close=_close_http_session)
+translation_cache = SharedClient('Translation cache', _create_translation_cache)
+appwrite = SharedClient('Appwrite client', _create_appwrite_manager,
+                        health_check=lambda manager: manager.check_health())
+
+_translators: Dict[str, SharedClient] = {}
+_translators_lock = threading.Lock()
+
+
+def _translator_client(service: str) -> SharedClient:
+    with _translators_lock:
+        client = _translators.get(service)
+        if client is None:
+            def create():
+                from translators.translator import Translator
+                # The cache is shared, so it survives the translator being rebuilt
+                return Translator(service=service, cache=translation_cache.get())
+
+            client = _translators[service] = SharedClient(
+                f'Translator ({service})', create, health_check=lambda translator: translator.check_health())
+        return client
+
+
+def get_http_session():
+    """Return the shared pooled requests.Session."""
+    return http_session.get()
+
+
+def get_translation_cache():
+    """Return the shared TranslationCache."""
+    return translation_cache.get()
+
+
+def get_appwrite_manager():
+    """
+    Return the shared AppwriteManager.
+
+    Raises:
+        ValueError: If Appwrite credentials are not configured
+    """
+    return appwrite.get()
+
+
+def get_translator(service: str = TRANSLATION_SERVICE):
+    """
+    Return the shared Translator for a service.
+
+    Args:
+        service: Translation service ('google', 'libre', 'azure', 'openai')
+    """
+    return _translator_client(service).get()
+
+
+def mark_unhealthy():
+    """Health-check every initialized client on its next use (call after a failed invocation)."""
+    for client in (appwrite, *_translators.values()):
+        client.mark_unhealthy()
+
+
+def reset_clients():
+    """Discard all shared clients and close the HTTP session."""
+    with _translators_lock:
+        translators = list(_translators.values())
+        _translators.clear()
+    for client in (appwrite, *translators, translation_cache, http_session):
+        client.reset()
@@ -0,0 +1,407 @@
+"""
+Image Pipeline
+Downloads article featured images concurrently, drops duplicates by content
+and perceptual hash, resizes and recompresses them with Pillow in a process
+pool and uploads them to Appwrite Storage from memory, reusing files that
+were uploaded before
+"""
+
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils import metrics
+from utils.http import get_session
+from utils.profiling import stage
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow is in requirements.txt
+    Image = None
+    ImageOps = None
+
+IMAGE_MAX_DIMENSION = int(os.getenv('IMAGE_MAX_DIMENSION', '1200'))
+IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', '80'))
+IMAGE_FORMAT = os.getenv('IMAGE_FORMAT', 'webp').lower()  # webp or jpeg
+IMAGE_MAX_BYTES = int(os.getenv('IMAGE_MAX_BYTES', str(10 * 1024 * 1024)))
+IMAGE_DOWNLOAD_WORKERS = int(os.getenv('IMAGE_DOWNLOAD_WORKERS', '8'))
+# Processes for resizing (0 resizes on the calling thread)
+IMAGE_PROCESS_WORKERS = int(os.getenv('IMAGE_PROCESS_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Maximum dHash Hamming distance at which two images count as the same picture (-1 disables)
+IMAGE_DHASH_DISTANCE = int(os.getenv('IMAGE_DHASH_DISTANCE', '4'))
+IMAGE_TIMEOUT_SECONDS = float(os.getenv('IMAGE_TIMEOUT_SECONDS', '15'))
+
+IMAGES = metrics.counter('crawler_images_total', 'Featured images handled by the image pipeline', ['result'])
+IMAGE_BYTES = metrics.counter('crawler_image_bytes_total', 'Image bytes downloaded and uploaded', ['direction'])
+
+MIME_TYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+def dhash(image, size: int = 8) -> int:
+    """
+    Difference hash of a Pillow image: one bit per horizontally adjacent
+    pixel pair of a (size+1) x size greyscale thumbnail. Resized or
+    recompressed copies of a picture hash to the same or nearby values.
+
+    Args:
+        image: PIL.Image.Image
+        size: Hash side (size * size bits)
+
+    Returns:
+        Hash as a non-negative integer
+    """
+    grey = image.convert('L').resize((size + 1, size), Image.LANCZOS)
+    pixels = list(grey.getdata())
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def optimize_image(data: bytes, max_dimension: int = IMAGE_MAX_DIMENSION, quality: int = IMAGE_QUALITY,
+                   image_format: str = IMAGE_FORMAT) -> Tuple[bytes, int]:
+    """
+    Resize and recompress an image. Runs in a worker process.
+
+    Args:
+        data: Original image bytes
+        max_dimension: Longest side of the result in pixels (smaller images are not enlarged)
+        quality: Encoder quality (1-95)
+        image_format: 'webp' or 'jpeg'
+
+    Returns:
+        Tuple of (encoded bytes, dHash of the picture)
+
+    Raises:
+        RuntimeError: If Pillow is not installed
+        OSError: If the data is not a readable image
+    """
+    if Image is None:
+        raise RuntimeError("Pillow is not installed")
+
+    with Image.open(io.BytesIO(data)) as image:
+        # Lets the JPEG decoder downscale by a power of two while decoding
+        image.draft('RGB', (max_dimension, max_dimension))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+        picture_hash = dhash(image)
+
+        if image_format == 'jpeg' or image.mode not in ('RGB', 'RGBA'):
+            alpha = 'A' in image.getbands() or 'transparency' in image.info
+            image = image.convert('RGBA' if image_format == 'webp' and alpha else 'RGB')
+
+        output = io.BytesIO()
+        if image_format == 'jpeg':
+            image.save(output, 'JPEG', quality=quality, optimize=True, progressive=True)
+        else:
+            image.save(output, 'WEBP', quality=quality, method=4)
+        return output.getvalue(), picture_hash
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count('1')
+
+
+class ImageIndex:
+    """
+    SQLite index of uploaded images: source URL -> content hash and content
+    hash -> file ID, plus the dHash of every uploaded picture (kept in memory
+    for near-duplicate lookups).
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS images ('
+            ' content_hash TEXT PRIMARY KEY,'
+            ' dhash TEXT,'
+            ' file_id TEXT NOT NULL)'
+        )
+        self._conn.execute('CREATE TABLE IF NOT EXISTS image_urls (url TEXT PRIMARY KEY, content_hash TEXT NOT NULL)')
+        self._conn.commit()
+        self._dhashes: Dict[int, str] = {
+            int(value, 16): file_id
+            for value, file_id in self._conn.execute('SELECT dhash, file_id FROM images WHERE dhash IS NOT NULL')
+        }
+
+    def file_for_url(self, url: str) -> Optional[str]:
+        """File ID of an image already downloaded from this URL, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT images.file_id FROM image_urls JOIN images USING (content_hash) WHERE image_urls.url = ?',
+                (url,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def file_for_hash(self, content_hash: str) -> Optional[str]:
+        """File ID of an upload of exactly these bytes, or None."""
+        with self._lock:
+            row = self._conn.execute('SELECT file_id FROM images WHERE content_hash = ?', (content_hash,)).fetchone()
+        return row[0] if row else None
+
+    def file_for_dhash(self, value: int, max_distance: int = IMAGE_DHASH_DISTANCE) -> Optional[str]:
+        """File ID of the closest uploaded picture within max_distance bits, or None."""
+        if max_distance < 0:
+            return None
+        with self._lock:
+            best = min(self._dhashes.items(), key=lambda item: hamming(item[0], value), default=None)
+        if best is None or hamming(best[0], value) > max_distance:
+            return None
+        return best[1]
+
+    def add(self, url: str, content_hash: str, file_id: str, value: Optional[int] = None):
+        """
+        Record an image.
+
+        Args:
+            url: URL the image was downloaded from
+            content_hash: SHA-256 of the downloaded bytes
+            file_id: Appwrite Storage file ID serving it
+            value: dHash of the picture, if known
+        """
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO images (content_hash, dhash, file_id) VALUES (?, ?, ?) ON CONFLICT(content_hash)'
+                ' DO UPDATE SET file_id = excluded.file_id, dhash = COALESCE(excluded.dhash, images.dhash)',
+                (content_hash, None if value is None else format(value, '016x'), file_id)
+            )
+            self._conn.execute('INSERT OR REPLACE INTO image_urls (url, content_hash) VALUES (?, ?)',
+                               (url, content_hash))
+            self._conn.commit()
+            if value is not None:
+                self._dhashes.setdefault(value, file_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM images').fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class ImagePipeline:
+    """
+    Replaces each article's featured image URL with an optimized copy in
+    Appwrite Storage.
+
+    For a batch of articles: images not seen before are downloaded
+    concurrently, identical downloads are collapsed by SHA-256, the rest are
+    resized in a process pool, pictures already uploaded (same dHash) are
+    reused, and only new ones are uploaded. Articles whose image cannot be
+    fetched or decoded keep their original URL.
+    """
+
+    def __init__(self, appwrite_manager, index: ImageIndex, download_workers: int = IMAGE_DOWNLOAD_WORKERS,
+                 process_workers: int = IMAGE_PROCESS_WORKERS):
+        """
+        Args:
+            appwrite_manager: AppwriteManager used for uploads
+            index: ImageIndex of earlier uploads
+            download_workers: Concurrent downloads
+            process_workers: Resize processes (0 resizes on the calling thread)
+        """
+        self.appwrite_manager = appwrite_manager
+        self.index = index
+        self.download_workers = download_workers
+        self.process_workers = process_workers
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def process(self, articles: Iterable) -> int:
+        """
+        Upload (or reuse) the featured images of a batch of articles.
+
+        Args:
+            articles: Article records; image_url is rewritten in place
+
+        Returns:
+            Number of articles whose image now points at Appwrite Storage
+        """
+        articles = [article for article in articles if self._is_external(article.image_url)]
+        if not articles:
+            return 0
+
+        with stage('images'):
+            file_ids = {}
+            pending = []
+            for url in dict.fromkeys(article.image_url for article in articles):
+                file_id = self.index.file_for_url(url)
+                if file_id is not None:
+                    IMAGES.inc(result='reused')
+                    file_ids[url] = file_id
+                else:
+                    pending.append(url)
+
+            file_ids.update(self._fetch_and_upload(pending))
+
+            updated = 0
+            for article in articles:
+                file_id = file_ids.get(article.image_url)
+                if file_id is not None:
+                    article.image_url = self.appwrite_manager.file_view_url(file_id)
+                    updated += 1
+            return updated
+
+    def close(self):
+        """Shut down the resize processes."""
+        if self._processes is not None:
+            self._processes.shutdown()
+            self._processes = None
+
+    @staticmethod
+    def _is_external(url: Optional[str]) -> bool:
+        # Images already served from Appwrite Storage are left alone
+        return bool(url) and url.startswith(('http://', 'https://')) and '/storage/buckets/' not in url
+
+    def _fetch_and_upload(self, urls: List[str]) -> Dict[str, str]:
+        """Download, dedupe, optimize and upload images; return URL -> file ID."""
+        if not urls:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self.download_workers, len(urls))) as pool:
+            downloads = dict(zip(urls, pool.map(download_image, urls)))
+
+        # Identical bytes (e.g. the same image behind two URLs) are handled once
+        by_hash: Dict[str, List[str]] = {}
+        contents = {}
+        for url, data in downloads.items():
+            if data is None:
+                IMAGES.inc(result='failed')
+                continue
+            content_hash = hashlib.sha256(data).hexdigest()
+            by_hash.setdefault(content_hash, []).append(url)
+            contents[content_hash] = data
+
+        file_ids = {}
+        new_hashes = []
+        for content_hash, hash_urls in by_hash.items():
+            file_id = self.index.file_for_hash(content_hash)
+            if file_id is not None:
+                IMAGES.inc(len(hash_urls), result='reused')
+                for url in hash_urls:
+                    self.index.add(url, content_hash, file_id)
+                    file_ids[url] = file_id
+            else:
+                new_hashes.append(content_hash)
+
+        # Decide what to upload; near-duplicates within the batch share one upload
+        uploads = []  # (data, content hashes, dHash)
+        reused = []  # (content hash, file ID, dHash)
+        for content_hash, result in zip(new_hashes, self._optimize_all([contents[h] for h in new_hashes])):
+            if isinstance(result, Exception):
+                print(f"Could not process image {by_hash[content_hash][0]}: {result}")
+                IMAGES.inc(len(by_hash[content_hash]), result='failed')
+                continue
+
+            data, picture_hash = result
+            file_id = self.index.file_for_dhash(picture_hash)
+            if file_id is not None:
+                reused.append((content_hash, file_id, picture_hash))
+                continue
+            match = next((upload for upload in uploads if IMAGE_DHASH_DISTANCE >= 0
+                          and hamming(upload[2], picture_hash) <= IMAGE_DHASH_DISTANCE), None)
+            if match is not None:
+                match[1].append(content_hash)
+            else:
+                uploads.append((data, [content_hash], picture_hash))
+
+        # Uploads run concurrently, straight from the optimized buffers
+        uploaded = self.appwrite_manager.upload_images(
+            (data, f"{hashes[0][:32]}.{IMAGE_FORMAT}", MIME_TYPES.get(IMAGE_FORMAT)) for data, hashes, _ in uploads
+        )
+        for (data, hashes, picture_hash), file_id in zip(uploads, uploaded):
+            if file_id is None:
+                IMAGES.inc(sum(len(by_hash[h]) for h in hashes), result='failed')
+                continue
+            IMAGES.inc(result='uploaded')
+            IMAGE_BYTES.inc(len(data), direction='uploaded')
+            reused.extend((content_hash, file_id, picture_hash) for content_hash in hashes[1:])
+            for url in by_hash[hashes[0]]:
+                self.index.add(url, hashes[0], file_id, picture_hash)
+                file_ids[url] = file_id
+
+        for content_hash, file_id, picture_hash in reused:
+            IMAGES.inc(len(by_hash[content_hash]), result='reused')
+            for url in by_hash[content_hash]:
+                self.index.add(url, content_hash, file_id, picture_hash)
+                file_ids[url] = file_id
+        return file_ids
+
+    def _optimize_all(self, images: List[bytes]) -> List:
+        """Optimize images in the process pool; failures are returned as exceptions."""
+        if not images:
+            return []
+        if self.process_workers <= 0 or len(images) == 1:
+            return [self._optimize_safely(data) for data in images]
+
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+        futures = [self._processes.submit(optimize_image, data) for data in images]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    @staticmethod
+    def _optimize_safely(data: bytes):
+        try:
+            return optimize_image(data)
+        except Exception as e:
+            return e
+
+
+def download_image(url: str, max_bytes: int = IMAGE_MAX_BYTES) -> Optional[bytes]:
+    """
+    Download an image, giving up on non-images and bodies over max_bytes.
+
+    Args:
+        url: Image URL
+        max_bytes: Size limit
+
+    Returns:
+        Image bytes, or None on failure
+    """
+    try:
+        with get_session().get(url, timeout=IMAGE_TIMEOUT_SECONDS, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if content_type and not content_type.startswith('image/'):
+                print(f"Skipping image {url}: content type {content_type}")
+                return None
+            if int(response.headers.get('Content-Length') or 0) > max_bytes:
+                print(f"Skipping image {url}: larger than {max_bytes} bytes")
+                return None
+
+            buffer = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                buffer += chunk
+                if len(buffer) > max_bytes:
+                    print(f"Skipping image {url}: larger than {max_bytes} bytes")
+                    return None
+        IMAGE_BYTES.inc(len(buffer), direction='downloaded')
+        return bytes(buffer)
+    except Exception as e:
+        print(f"Error downloading image {url}: {str(e)}")
+        return None
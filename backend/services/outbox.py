@@ -0,0 +1,273 @@
+"""
+Write Outbox
+Durable, local write-behind queue for Appwrite document writes. Writes are
+committed to SQLite first and delivered by a background flusher in batches,
+with backoff while Appwrite is slow or down, so the pipeline never waits on
+the database and a translated article is never lost to a failed request
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from appwrite.exception import AppwriteException
+from utils import metrics
+
+OUTBOX_BATCH_SIZE = int(os.getenv('OUTBOX_BATCH_SIZE', '25'))
+OUTBOX_FLUSH_INTERVAL_SECONDS = float(os.getenv('OUTBOX_FLUSH_INTERVAL_SECONDS', '1'))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv('OUTBOX_MAX_BACKOFF_SECONDS', '300'))
+# Seconds close() keeps flushing before leaving the rest for the next run
+OUTBOX_DRAIN_SECONDS = float(os.getenv('OUTBOX_DRAIN_SECONDS', '30'))
+
+# Operations, as understood by AppwriteManager.write_document
+UPSERT = 'upsert'
+UPDATE = 'update'
+DELETE = 'delete'
+
+OUTBOX_WRITES = metrics.counter('crawler_outbox_writes_total', 'Outbox entries by outcome', ['result'])
+
+
+def is_permanent(error: AppwriteException) -> bool:
+    """Whether retrying a failed write cannot help (client errors other than timeouts and rate limits)."""
+    return isinstance(error.code, int) and 400 <= error.code < 500 and error.code not in (408, 429)
+
+
+class WriteOutbox:
+    """
+    SQLite outbox of pending document writes, one row per document.
+
+    Writes to a document that is still queued are coalesced into its row:
+    an update is merged into a queued upsert or update (including one that
+    failed, which is then retried), an update to a document queued for
+    deletion is dropped, and an upsert or delete replaces whatever was
+    queued. Entries that fail with a transient error are retried with
+    exponential backoff; entries Appwrite rejects outright are kept as
+    failed for inspection (failed()).
+    """
+
+    def __init__(self, db_path: str, batch_size: int = OUTBOX_BATCH_SIZE,
+                 flush_interval: float = OUTBOX_FLUSH_INTERVAL_SECONDS,
+                 max_backoff: float = OUTBOX_MAX_BACKOFF_SECONDS):
+        """
+        Open (or create) the outbox.
+
+        Args:
+            db_path: Path to the SQLite file
+            batch_size: Entries delivered per flush round
+            flush_interval: Seconds the flusher waits between rounds when idle
+            max_backoff: Upper bound of the retry delay in seconds
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS outbox ('
+            ' document_id TEXT PRIMARY KEY,'
+            ' operation TEXT NOT NULL,'
+            ' data TEXT,'
+            ' version INTEGER NOT NULL DEFAULT 0,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' next_attempt REAL NOT NULL,'
+            ' enqueued_at REAL NOT NULL,'
+            ' failed INTEGER NOT NULL DEFAULT 0,'
+            ' last_error TEXT)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (failed, next_attempt)')
+        self._conn.commit()
+
+        self._writer = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+
+    def enqueue(self, operation: str, document_id: str, data: Optional[Dict] = None):
+        """
+        Durably queue a write. Returns once it is committed locally.
+
+        Args:
+            operation: UPSERT, UPDATE or DELETE
+            document_id: Target document ID
+            data: Document fields (UPSERT: the whole document, UPDATE: changed fields)
+        """
+        now = time.time()
+        with self._lock:
+            # Failed entries count too: a rejected upsert still holds the whole document
+            row = self._conn.execute(
+                'SELECT operation, data FROM outbox WHERE document_id = ?', (document_id,)
+            ).fetchone()
+            if row is not None and operation == UPDATE:
+                if row[0] == DELETE:
+                    # The document is going away; updating it would undo the delete
+                    OUTBOX_WRITES.inc(result='dropped')
+                    return
+                # Fold the change into the queued write
+                operation = row[0]
+                data = {**json.loads(row[1]), **(data or {})}
+            payload = None if operation == DELETE else json.dumps(data or {}, ensure_ascii=False)
+            self._conn.execute(
+                'INSERT INTO outbox (document_id, operation, data, next_attempt, enqueued_at) VALUES (?, ?, ?, ?, ?)'
+                ' ON CONFLICT(document_id) DO UPDATE SET operation = excluded.operation, data = excluded.data,'
+                ' version = outbox.version + 1, failed = 0, last_error = NULL,'
+                ' attempts = CASE WHEN outbox.failed THEN 0 ELSE outbox.attempts END,'
+                ' next_attempt = CASE WHEN outbox.failed THEN excluded.next_attempt ELSE outbox.next_attempt END',
+                (document_id, operation, payload, now, now)
+            )
+            self._conn.commit()
+        OUTBOX_WRITES.inc(result='queued')
+        self._wake.set()
+
+    def get(self, document_id: str) -> Optional[Dict]:
+        """Return the queued write for a document ({'operation', 'data'}), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT operation, data FROM outbox WHERE document_id = ? AND failed = 0', (document_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'operation': row[0], 'data': json.loads(row[1]) if row[1] else None}
+
+    def pending(self) -> int:
+        """Number of writes waiting to be delivered."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM outbox WHERE failed = 0').fetchone()[0]
+
+    def failed(self) -> List[Dict]:
+        """Writes Appwrite rejected permanently, with the error."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT document_id, operation, data, last_error FROM outbox WHERE failed = 1 ORDER BY enqueued_at'
+            ).fetchall()
+        return [{'document_id': document_id, 'operation': operation,
+                 'data': json.loads(data) if data else None, 'error': error}
+                for document_id, operation, data, error in rows]
+
+    def flush(self, writer=None, limit: Optional[int] = None) -> int:
+        """
+        Deliver due writes now, batch by batch, until none are due or one fails.
+
+        Args:
+            writer: Object with write_document(operation, document_id, data)
+                (defaults to the one given to start())
+            limit: Maximum entries to deliver
+
+        Returns:
+            Number of writes delivered
+        """
+        writer = writer or self._writer
+        delivered = 0
+        with self._flush_lock:
+            while limit is None or delivered < limit:
+                with self._lock:
+                    batch = self._conn.execute(
+                        'SELECT document_id, operation, data, version, attempts FROM outbox'
+                        ' WHERE failed = 0 AND next_attempt <= ? ORDER BY enqueued_at LIMIT ?',
+                        (time.time(), self.batch_size)
+                    ).fetchall()
+                if not batch:
+                    break
+
+                for document_id, operation, data, version, attempts in batch:
+                    try:
+                        writer.write_document(operation, document_id, json.loads(data) if data else None)
+                    except AppwriteException as e:
+                        if is_permanent(e):
+                            self._mark_failed(document_id, version, e)
+                            continue
+                        # Appwrite is down or overloaded: back off and stop this flush
+                        self._retry_later(document_id, version, attempts, e)
+                        return delivered
+                    except Exception as e:
+                        self._retry_later(document_id, version, attempts, e)
+                        return delivered
+                    self._remove(document_id, version)
+                    delivered += 1
+        return delivered
+
+    def start(self, writer):
+        """
+        Start the background flusher (idempotent).
+
+        Args:
+            writer: Object with write_document(operation, document_id, data), e.g. AppwriteManager
+        """
+        self._writer = writer
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='appwrite-outbox', daemon=True)
+        self._thread.start()
+
+    def close(self, drain_seconds: float = OUTBOX_DRAIN_SECONDS):
+        """
+        Stop the flusher, first trying for up to drain_seconds to deliver
+        what is queued. Anything left is delivered by the next run.
+        """
+        if self._thread is not None:
+            deadline = time.monotonic() + drain_seconds
+            while self._due() and time.monotonic() < deadline:
+                self._wake.set()
+                time.sleep(min(0.05, max(0.0, deadline - time.monotonic())))
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout=max(1.0, deadline - time.monotonic()))
+            self._thread = None
+        remaining = self.pending()
+        if remaining:
+            print(f"Outbox: {remaining} writes left for the next run")
+        with self._lock:
+            self._conn.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Outbox flush failed: {str(e)}")
+
+    def _due(self) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM outbox WHERE failed = 0 AND next_attempt <= ? LIMIT 1', (time.time(),)
+            ).fetchone()
+        return row is not None
+
+    def _remove(self, document_id: str, version: int):
+        # A write enqueued while this one was in flight bumped the version and stays queued
+        with self._lock:
+            self._conn.execute('DELETE FROM outbox WHERE document_id = ? AND version = ?', (document_id, version))
+            self._conn.commit()
+        OUTBOX_WRITES.inc(result='delivered')
+
+    def _retry_later(self, document_id: str, version: int, attempts: int, error: Exception):
+        delay = min(self.max_backoff, 2 ** attempts) * random.uniform(0.5, 1.0)
+        with self._lock:
+            self._conn.execute(
+                'UPDATE outbox SET attempts = attempts + 1, next_attempt = ?, last_error = ?'
+                ' WHERE document_id = ? AND version = ?',
+                (time.time() + delay, str(error), document_id, version)
+            )
+            self._conn.commit()
+        OUTBOX_WRITES.inc(result='retried')
+        print(f"Outbox: write to {document_id} failed ({str(error)}), retrying in {delay:.0f}s")
+
+    def _mark_failed(self, document_id: str, version: int, error: AppwriteException):
+        with self._lock:
+            self._conn.execute(
+                'UPDATE outbox SET failed = 1, last_error = ? WHERE document_id = ? AND version = ?',
+                (str(error.message), document_id, version)
+            )
+            self._conn.commit()
+        OUTBOX_WRITES.inc(result='failed')
+        print(f"Outbox: Appwrite rejected the write to {document_id}: {error.message}")
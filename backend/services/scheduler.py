@@ -0,0 +1,229 @@
+"""
+Crawl Scheduler
+Decides which sources are due for a crawl based on their priority,
+crawl frequency and recent error count
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from config.settings import CRAWL_STATE_FILE, DEFAULT_CRAWL_FREQUENCY
+from config.sources import load_sources
+from scrapers.feeds import parse_timestamp
+
+# Crawl state attributes the sources collection may not define
+OPTIONAL_STATE = ('feed_cutoff', 'last_attempt')
+
+
+class CrawlScheduler:
+    """
+    Schedules source crawls.
+
+    Sources are loaded from the Appwrite sources collection when an
+    AppwriteManager is available (crawl state is written back to the
+    collection), otherwise from config/sources.json with crawl state kept
+    in a local JSON file.
+
+    A source is due when last_crawled + crawl_frequency has passed. Each
+    consecutive error doubles the effective interval, up to
+    2 ** MAX_BACKOFF_EXPONENT times the configured frequency, counted from
+    the last failed attempt (last_attempt) when that is stored, otherwise
+    from the last successful crawl.
+
+    Besides the crawl time, each source keeps its feed cutoff (feed_cutoff):
+    feed entries up to that time have been crawled. When the sources
+    collection does not define feed_cutoff or last_attempt, they are kept
+    in the local state file instead.
+    """
+
+    MAX_BACKOFF_EXPONENT = 5
+
+    def __init__(self, appwrite_manager=None, state_file: str = CRAWL_STATE_FILE):
+        """
+        Initialize the scheduler.
+
+        Args:
+            appwrite_manager: Optional AppwriteManager to read/write the sources collection
+            state_file: Local crawl state file used for sources.json sources
+        """
+        self.appwrite_manager = appwrite_manager
+        self.state_file = Path(state_file)
+        # Attributes of the sources collection, as seen in the documents last loaded
+        self._collection_fields = set()
+
+    def load_sources(self) -> List[Dict]:
+        """
+        Load enabled sources with their crawl state.
+
+        Collection documents take precedence; fields they do not define
+        (e.g. feed_url) are filled in from the sources.json entry of the
+        same name, and optional crawl state the collection cannot store
+        from the local state file.
+
+        Returns:
+            List of source dictionaries
+        """
+        file_sources = {source['name']: source for source in load_sources(enabled_only=False)}
+
+        documents = self.appwrite_manager.list_sources() if self.appwrite_manager else []
+        state = self._read_state()
+        if documents:
+            self._collection_fields = {field for doc in documents for field in doc}
+            sources = [
+                {**file_sources.get(doc.get('name'), {}), **state.get(doc.get('name'), {}), **doc}
+                for doc in documents
+            ]
+        else:
+            sources = [{**source, **state.get(name, {})} for name, source in file_sources.items()]
+
+        return [
+            source for source in sources
+            if source.get('enabled', True) and source.get('status', 'active') == 'active'
+        ]
+
+    def next_crawl_at(self, source: Dict) -> datetime:
+        """
+        Compute when a source is next due, including error backoff.
+
+        Args:
+            source: Source dictionary
+
+        Returns:
+            Timezone-aware UTC datetime (epoch start if never crawled)
+        """
+        error_count = int(source.get('error_count') or 0)
+        last_crawled = parse_timestamp(source.get('last_crawled'))
+        if error_count:
+            last_crawled = parse_timestamp(source.get('last_attempt')) or last_crawled
+        if last_crawled is None:
+            return datetime.fromtimestamp(0, timezone.utc)
+
+        frequency = int(source.get('crawl_frequency') or DEFAULT_CRAWL_FREQUENCY)
+        backoff = 2 ** min(error_count, self.MAX_BACKOFF_EXPONENT)
+        return last_crawled + timedelta(seconds=frequency * backoff)
+
+    def due_sources(self, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        Return sources due for a crawl, highest priority first.
+
+        Args:
+            now: Reference time (defaults to the current UTC time)
+
+        Returns:
+            List of due source dictionaries
+        """
+        now = now or datetime.now(timezone.utc)
+        due = [source for source in self.load_sources() if self.next_crawl_at(source) <= now]
+        due.sort(key=lambda source: (-int(source.get('priority') or 0), self.next_crawl_at(source)))
+        return due
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> float:
+        """
+        Seconds until the next source becomes due (0 if one is due now).
+
+        Args:
+            now: Reference time (defaults to the current UTC time)
+        """
+        now = now or datetime.now(timezone.utc)
+        sources = self.load_sources()
+        if not sources:
+            return float(DEFAULT_CRAWL_FREQUENCY)
+        next_due = min(self.next_crawl_at(source) for source in sources)
+        return max(0.0, (next_due - now).total_seconds())
+
+    def record_success(self, source: Dict, crawled_at: Optional[datetime] = None,
+                       feed_cutoff: Optional[datetime] = None):
+        """Reset the error count and stamp the crawl time (and feed cutoff) for a source."""
+        crawled_at = crawled_at or datetime.now(timezone.utc)
+        state = {'last_crawled': crawled_at.isoformat(), 'error_count': 0}
+        if feed_cutoff is not None:
+            state['feed_cutoff'] = feed_cutoff.isoformat()
+        self._save_state(source, state)
+
+    def record_failure(self, source: Dict, crawled_at: Optional[datetime] = None):
+        """Increment the error count and stamp the failed attempt for a source so it is backed off."""
+        crawled_at = crawled_at or datetime.now(timezone.utc)
+        error_count = int(source.get('error_count') or 0) + 1
+        self._save_state(source, {'last_attempt': crawled_at.isoformat(), 'error_count': error_count})
+
+    def iter_due(self, processor, max_articles_per_source: int = 5,
+                 now: Optional[datetime] = None) -> Iterator[List[Dict]]:
+        """
+        Scrape every due source with the given ArticleProcessor.
+
+        Args:
+            processor: ArticleProcessor used to scrape each source
+            max_articles_per_source: Fallback when a source has no max_articles
+            now: Reference time (defaults to the current UTC time)
+
+        Yields:
+            List of scraped articles for one source
+        """
+        for source in self.due_sources(now):
+            if processor.stop_event.is_set():
+                print("Stop requested. Skipping remaining sources.")
+                break
+
+            max_articles = int(source.get('max_articles') or max_articles_per_source)
+            print(f"\nScraping {source['name']} (priority {source.get('priority', 0)})...")
+
+            try:
+                articles = processor.scrape_source(source, max_articles)
+            except Exception as e:
+                print(f"✗ Error scraping {source['name']}: {str(e)}")
+                self.record_failure(source)
+                continue
+
+            self.record_success(source, feed_cutoff=processor.feed_cutoff(source))
+            print(f"✓ Scraped {len(articles)} articles from {source['name']}")
+            yield articles
+
+    def run_due(self, processor, max_articles_per_source: int = 5, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        Scrape every due source and return all articles.
+
+        Args:
+            processor: ArticleProcessor used to scrape each source
+            max_articles_per_source: Fallback when a source has no max_articles
+            now: Reference time (defaults to the current UTC time)
+
+        Returns:
+            List of scraped articles
+        """
+        return [article for articles in self.iter_due(processor, max_articles_per_source, now) for article in articles]
+
+    def _save_state(self, source: Dict, state: Dict):
+        """Persist crawl state to the collection or the local state file."""
+        source.update(state)
+
+        if self.appwrite_manager and source.get('$id'):
+            # A collection created without an optional attribute rejects the whole update,
+            # so that state is kept in the local file instead
+            local = {key: value for key, value in state.items()
+                     if key in OPTIONAL_STATE and key not in self._collection_fields}
+            self.appwrite_manager.update_source(
+                source['$id'], {key: value for key, value in state.items() if key not in local})
+            if not local:
+                return
+            state = local
+
+        all_state = self._read_state()
+        all_state[source['name']] = {**all_state.get(source['name'], {}), **state}
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(all_state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def _read_state(self) -> Dict:
+        """Read the local crawl state file."""
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
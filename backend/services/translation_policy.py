@@ -0,0 +1,253 @@
+"""
+Translation Policy
+Decides which article fields are translated now and which are deferred,
+per translation mode and within per-cycle character budgets. Deferred
+translations wait in a SQLite queue and are done at the end of a cycle
+from whatever budget is left, or in a later cycle.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import (
+    TRANSLATION_MODE,
+    TRANSLATION_RUN_CHAR_BUDGET,
+    TRANSLATION_SOURCE_CHAR_BUDGET,
+)
+from models.article import Article
+from utils import metrics
+
+# Modes
+FULL = 'full'
+SUMMARY = 'summary'
+SUMMARY_FIRST = 'summary_first'
+MODES = (FULL, SUMMARY, SUMMARY_FIRST)
+
+# What the articles collection stores, so what a fast publish needs
+HEADLINE_FIELDS = ('title', 'summary')
+ALL_FIELDS = ('title', 'content', 'summary')
+
+# Deferred translations that fail this many times are dropped
+MAX_DEFERRED_ATTEMPTS = 3
+
+TRANSLATION_DECISIONS = metrics.counter(
+    'crawler_translation_policy_total', 'Article fields by translation policy decision', ['decision'])
+TRANSLATION_BUDGET_SPENT = metrics.counter(
+    'crawler_translation_budget_characters_total', 'Characters charged to translation budgets', ['source'])
+
+
+class DeferredTranslations:
+    """SQLite queue of article fields waiting to be translated, one row per article URL."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the queue.
+
+        Args:
+            db_path: Path to the SQLite file
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS deferred ('
+            ' url TEXT PRIMARY KEY,'
+            ' source TEXT,'
+            ' fields TEXT NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' enqueued_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    def add(self, article: Article, fields: Sequence[str]):
+        """
+        Queue fields of an article for translation. The article data
+        replaces what was queued for its URL; the fields add to it.
+
+        Args:
+            article: Article as it should be saved once translated
+            fields: Fields still to translate, e.g. ('content',)
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT fields FROM deferred WHERE url = ?', (article.url,)).fetchone()
+            queued = set(row[0].split(',')) if row else set()
+            merged = ','.join(field for field in ALL_FIELDS if field in queued or field in fields)
+            self._conn.execute(
+                'INSERT INTO deferred (url, source, fields, data, enqueued_at) VALUES (?, ?, ?, ?, ?)'
+                ' ON CONFLICT(url) DO UPDATE SET source = excluded.source, fields = excluded.fields,'
+                ' data = excluded.data',
+                (article.url, article.source, merged, json.dumps(article.to_dict(), ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+
+    def items(self, limit: Optional[int] = None) -> List[Dict]:
+        """Queued articles, oldest first: {'url', 'source', 'fields', 'attempts', 'article'}."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url, source, fields, attempts, data FROM deferred ORDER BY enqueued_at LIMIT ?',
+                (-1 if limit is None else limit,)
+            ).fetchall()
+        return [{'url': url, 'source': source, 'fields': tuple(fields.split(',')), 'attempts': attempts,
+                 'article': Article.from_dict(json.loads(data))}
+                for url, source, fields, attempts, data in rows]
+
+    def failed(self, url: str) -> int:
+        """Record a failed attempt; returns the attempts so far."""
+        with self._lock:
+            self._conn.execute('UPDATE deferred SET attempts = attempts + 1 WHERE url = ?', (url,))
+            self._conn.commit()
+            row = self._conn.execute('SELECT attempts FROM deferred WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else 0
+
+    def remove(self, url: str):
+        """Drop an article from the queue."""
+        with self._lock:
+            self._conn.execute('DELETE FROM deferred WHERE url = ?', (url,))
+            self._conn.commit()
+
+    def count(self) -> int:
+        """Number of queued articles."""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM deferred').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TranslationPolicy:
+    """
+    Translation mode and character budgets for a pipeline.
+
+    Modes (TRANSLATION_MODE, or "translation_mode" in a source's config):
+        full: title, content and summary
+        summary: title and summary only; the content is never translated
+        summary_first: title and summary right away, content deferred
+
+    Budgets count characters actually sent to the translation service per
+    cycle, in total and per source ("translation_char_budget" in a source's
+    config overrides TRANSLATION_SOURCE_CHAR_BUDGET); 0 means unlimited.
+    Text that does not fit is deferred, headline fields before content.
+    """
+
+    def __init__(self, mode: str = TRANSLATION_MODE, run_budget: int = TRANSLATION_RUN_CHAR_BUDGET,
+                 source_budget: int = TRANSLATION_SOURCE_CHAR_BUDGET,
+                 queue: Optional[DeferredTranslations] = None):
+        """
+        Args:
+            mode: Default mode (full, summary or summary_first)
+            run_budget: Characters per cycle (0 = unlimited)
+            source_budget: Characters per source per cycle (0 = unlimited)
+            queue: Where deferred translations wait; without one they are skipped
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unsupported translation mode: {mode}")
+        self.mode = mode
+        self.run_budget = run_budget
+        self.source_budget = source_budget
+        self.queue = queue
+        self.spent = 0
+        self.spent_by_source: Dict[str, int] = {}
+        # Whether a content translation done later has anywhere to go
+        self.defer_content = True
+
+    def start_cycle(self, defer_content: bool = True):
+        """
+        Reset the budgets.
+
+        Args:
+            defer_content: False when a deferred content translation would be
+                lost (the collection does not store it), so it is skipped
+        """
+        self.spent = 0
+        self.spent_by_source = {}
+        self.defer_content = defer_content
+
+    def mode_for(self, source_config: Optional[Dict] = None) -> str:
+        """Translation mode of a source."""
+        mode = (source_config or {}).get('translation_mode') or self.mode
+        return mode if mode in MODES else self.mode
+
+    def remaining(self, source: str, source_config: Optional[Dict] = None) -> Optional[int]:
+        """
+        Characters a source may still send this cycle.
+
+        Returns:
+            Remaining characters, or None when unlimited
+        """
+        limits = []
+        if self.run_budget:
+            limits.append(self.run_budget - self.spent)
+        source_budget = (source_config or {}).get('translation_char_budget', self.source_budget)
+        if source_budget:
+            limits.append(source_budget - self.spent_by_source.get(source, 0))
+        return max(0, min(limits)) if limits else None
+
+    def plan(self, source: str, cost: Callable[[Sequence[str]], int],
+             source_config: Optional[Dict] = None) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Decide what to translate now and what to defer for one article.
+
+        Args:
+            source: Article source name
+            cost: Characters it would take to translate the given fields
+            source_config: The source's configuration
+
+        Returns:
+            (fields to translate now, fields to defer)
+        """
+        mode = self.mode_for(source_config)
+        wanted = HEADLINE_FIELDS if mode in (SUMMARY, SUMMARY_FIRST) else ALL_FIELDS
+        later = ('content',) if mode == SUMMARY_FIRST else ()
+
+        remaining = self.remaining(source, source_config)
+        if remaining is not None and cost(wanted) > remaining:
+            if wanted != HEADLINE_FIELDS and cost(HEADLINE_FIELDS) <= remaining:
+                # Publish with a translated headline, the content follows when budget allows
+                wanted, later = HEADLINE_FIELDS, ('content',)
+            else:
+                wanted, later = (), wanted + later
+        if not self.defer_content:
+            later = tuple(field for field in later if field != 'content')
+
+        TRANSLATION_DECISIONS.inc(len(wanted), decision='now')
+        TRANSLATION_DECISIONS.inc(len(ALL_FIELDS) - len(wanted) - len(later), decision='skipped')
+        return wanted, later
+
+    def exceeds_budget(self, source: str, characters: int, source_config: Optional[Dict] = None) -> bool:
+        """Whether this many characters are more than a whole cycle's budget, so they never fit."""
+        source_budget = (source_config or {}).get('translation_char_budget', self.source_budget)
+        return any(budget and characters > budget for budget in (self.run_budget, source_budget))
+
+    def fits(self, source: str, characters: int, source_config: Optional[Dict] = None) -> bool:
+        """Whether a source may send this many more characters this cycle."""
+        remaining = self.remaining(source, source_config)
+        return remaining is None or characters <= remaining
+
+    def charge(self, source: str, characters: int):
+        """Count characters sent for a source against the budgets."""
+        self.spent += characters
+        self.spent_by_source[source] = self.spent_by_source.get(source, 0) + characters
+        TRANSLATION_BUDGET_SPENT.inc(characters, source=source or 'unknown')
+
+    def defer(self, article: Article, fields: Sequence[str]) -> bool:
+        """
+        Queue fields of an article for a later translation.
+
+        Returns:
+            False when there is no queue (the fields stay untranslated)
+        """
+        if not fields:
+            return False
+        if self.queue is None or not article.url:
+            TRANSLATION_DECISIONS.inc(len(fields), decision='skipped')
+            return False
+        self.queue.add(article, fields)
+        TRANSLATION_DECISIONS.inc(len(fields), decision='deferred')
+        return True
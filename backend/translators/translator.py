@@ -4,40 +4,180 @@ Handles translation of articles from English to Amharic
 """
 
 import os
-from typing import Optional, Dict
+import re
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, List
 
-# Make googletrans optional for Python 3.13+ compatibility
-try:
-    from googletrans import Translator as GoogleTranslator
-    GOOGLETRANS_AVAILABLE = True
-except (ImportError, ModuleNotFoundError):
-    GOOGLETRANS_AVAILABLE = False
-    GoogleTranslator = None
+from models.article import Article
+from utils import metrics
+from utils.http import get_session
+from utils.profiling import stage
+from utils.tracing import get_tracer
+
+TRANSLATION_CACHE = metrics.counter(
+    'crawler_translation_cache_total', 'Translation cache lookups by result (hit/miss)', ['result'])
+TRANSLATION_SECONDS = metrics.histogram(
+    'crawler_translation_seconds', 'Translation request latency (cache misses only)', ['service'])
+TRANSLATION_CHARACTERS = metrics.counter(
+    'crawler_translation_characters_total', 'Characters sent for translation', ['service'])
+TRANSLATION_ERRORS = metrics.counter('crawler_translation_errors_total', 'Failed translations', ['service'])
+TRANSLATION_PARAGRAPHS = metrics.counter(
+    'crawler_translation_paragraphs_total', 'Paragraphs translated or reused from the stored version', ['result'])
+
+# Changed paragraphs are sent together, up to this many characters per request
+PARAGRAPH_BATCH_CHARS = int(os.getenv('PARAGRAPH_BATCH_CHARS', '4500'))
+
+# Translatable article fields; summary comes after content so its paragraphs are reused from it
+TRANSLATED_FIELDS = ('title', 'content', 'summary')
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split text on blank lines into non-empty, stripped paragraphs."""
+    if not text:
+        return []
+    return [paragraph.strip() for paragraph in _PARAGRAPH_BREAK.split(text) if paragraph.strip()]
+
+
+def paragraph_key(paragraph: str) -> str:
+    """Digest identifying a paragraph regardless of surrounding or repeated whitespace."""
+    return hashlib.sha1(_WHITESPACE.sub(' ', paragraph).strip().encode('utf-8')).hexdigest()
+
+
+def aligned_translations(source: Optional[str], translated: Optional[str]) -> Dict[str, str]:
+    """
+    Pair the paragraphs of a stored text with those of its stored translation.
+    
+    Args:
+        source: Previously translated English text
+        translated: Its Amharic translation
+        
+    Returns:
+        paragraph_key(English paragraph) -> Amharic paragraph; empty when the
+        paragraph counts differ and the pairing would be a guess
+    """
+    sources = split_paragraphs(source or '')
+    translations = split_paragraphs(translated or '')
+    if not sources or len(sources) != len(translations):
+        return {}
+    return {paragraph_key(english): amharic for english, amharic in zip(sources, translations)}
+
+
+def field_text(article: Dict, field: str) -> str:
+    """Source text of a translatable field; the summary defaults to the start of the content."""
+    if field == 'summary':
+        return article.get('summary') or (article.get('content') or '')[:Article.SUMMARY_LENGTH]
+    return article.get(field) or ''
+
+
+def known_translations(article: Optional[Dict]) -> Dict[str, str]:
+    """Paragraph translations of every translated field of a stored article, by paragraph_key."""
+    known = {}
+    for field in TRANSLATED_FIELDS:
+        if article and article.get(f'{field}_am'):
+            known.update(aligned_translations(field_text(article, field), article[f'{field}_am']))
+    return known
+
+
+def _load_google_translator():
+    """
+    Import googletrans on first use: it is slow to import and only the
+    'google' service needs it. Optional for Python 3.13+ compatibility.
+
+    Returns:
+        googletrans.Translator class, or None if unavailable
+    """
+    try:
+        from googletrans import Translator as GoogleTranslator
+    except (ImportError, ModuleNotFoundError):
+        return None
+    return GoogleTranslator
+
+
+class TranslationCache:
+    """
+    Thread-safe LRU of translations.
+    
+    Can be shared by several Translator instances (and outlive them), so
+    keys include the service and target language.
+    """
+    
+    def __init__(self, max_size: Optional[int] = None):
+        """
+        Args:
+            max_size: Max cached translations (defaults to TRANSLATION_CACHE_SIZE, 0 disables)
+        """
+        self.max_size = max_size if max_size is not None else int(os.getenv('TRANSLATION_CACHE_SIZE', '2048'))
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: str, value: str):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class Translator:
     """
     Translation service for converting English content to Amharic.
-    Supports multiple translation backends (Google, Azure, OpenAI).
+    Supports multiple translation backends (Google, LibreTranslate, Azure, OpenAI).
     """
     
-    def __init__(self, service: str = 'google'):
+    def __init__(self, service: str = 'google', cache_size: Optional[int] = None,
+                 cache: Optional[TranslationCache] = None):
         """
         Initialize translator with specified service.
         
         Args:
-            service: Translation service to use ('google', 'azure', 'openai')
+            service: Translation service to use ('google', 'libre', 'azure', 'openai')
+            cache_size: Max cached translations (defaults to TRANSLATION_CACHE_SIZE, 0 disables)
+            cache: Shared translation cache to use instead of a private one
         """
         self.service = service
         self.source_lang = 'en'
         self.target_lang = 'am'  # Amharic
         
+        # LRU cache of translations keyed by source text digest
+        self._cache = cache if cache is not None else TranslationCache(cache_size)
+        self.cache_size = self._cache.max_size
+        
+        # Characters sent to the service (cache misses), for translation budgets
+        self.characters_sent = 0
+        
         if service == 'google':
-            if GOOGLETRANS_AVAILABLE:
+            GoogleTranslator = _load_google_translator()
+            if GoogleTranslator is not None:
                 self.translator = GoogleTranslator()
             else:
                 print("Warning: googletrans not available (Python 3.13+ compatibility issue). Translation disabled.")
                 self.translator = None
+        elif service == 'libre':
+            # LibreTranslate-compatible HTTP API (self-hosted or hosted instance)
+            self.libre_url = os.getenv('LIBRETRANSLATE_URL', 'http://localhost:5000').rstrip('/')
+            self.libre_api_key = os.getenv('LIBRETRANSLATE_API_KEY', '')
         elif service == 'azure':
             # Azure Translator setup (requires azure-ai-translation-text package)
             self.azure_key = os.getenv('AZURE_TRANSLATOR_KEY')
@@ -47,6 +187,24 @@ class Translator:
             # OpenAI setup (requires openai package)
             self.openai_api_key = os.getenv('OPENAI_API_KEY')
     
+    def check_health(self) -> bool:
+        """
+        Check that the translation backend is usable, so a long-lived
+        translator can be rebuilt when it is not.
+        
+        Returns:
+            True if the backend is available
+        """
+        if self.service == 'google':
+            return self.translator is not None
+        if self.service == 'libre':
+            try:
+                get_session().get(f"{self.libre_url}/languages", timeout=5).raise_for_status()
+            except Exception as e:
+                print(f"LibreTranslate health check failed: {str(e)}")
+                return False
+        return True
+    
     def translate_text(self, text: str) -> Optional[str]:
         """
         Translate text from English to Amharic.
@@ -60,18 +218,40 @@ class Translator:
         if not text or not text.strip():
             return text
         
-        try:
-            if self.service == 'google':
-                return self._translate_google(text)
-            elif self.service == 'azure':
-                return self._translate_azure(text)
-            elif self.service == 'openai':
-                return self._translate_openai(text)
-            else:
-                raise ValueError(f"Unsupported translation service: {self.service}")
-        except Exception as e:
-            print(f"Translation error: {str(e)}")
-            return None
+        cache_key = f"{self.service}:{self.target_lang}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            TRANSLATION_CACHE.inc(result='hit')
+            return cached
+        TRANSLATION_CACHE.inc(result='miss')
+        
+        TRANSLATION_CHARACTERS.inc(len(text), service=self.service)
+        self.characters_sent += len(text)
+        started = time.perf_counter()
+        with get_tracer().span('translate_text', service=self.service, characters=len(text)) as span:
+            try:
+                if self.service == 'google':
+                    translated = self._translate_google(text)
+                elif self.service == 'libre':
+                    translated = self._translate_libre(text)
+                elif self.service == 'azure':
+                    translated = self._translate_azure(text)
+                elif self.service == 'openai':
+                    translated = self._translate_openai(text)
+                else:
+                    raise ValueError(f"Unsupported translation service: {self.service}")
+            except Exception as e:
+                TRANSLATION_ERRORS.inc(service=self.service)
+                span.record_error(e)
+                print(f"Translation error: {str(e)}")
+                return None
+            finally:
+                TRANSLATION_SECONDS.observe(time.perf_counter() - started, service=self.service)
+        
+        if translated is not None:
+            self._cache.put(cache_key, translated)
+        
+        return translated
     
     def _translate_google(self, text: str) -> Optional[str]:
         """Translate using Google Translate API."""
@@ -85,14 +265,33 @@ class Translator:
             translated_chunks = []
             
             for chunk in chunks:
-                result = self.translator.translate(chunk, src=self.source_lang, dest=self.target_lang)
+                with get_tracer().span('translate_chunk', characters=len(chunk)):
+                    result = self.translator.translate(chunk, src=self.source_lang, dest=self.target_lang)
                 translated_chunks.append(result.text)
             
             return '\n\n'.join(translated_chunks)
         else:
-            result = self.translator.translate(text, src=self.source_lang, dest=self.target_lang)
+            with get_tracer().span('translate_chunk', characters=len(text)):
+                result = self.translator.translate(text, src=self.source_lang, dest=self.target_lang)
             return result.text
     
+    def _translate_libre(self, text: str) -> Optional[str]:
+        """Translate using a LibreTranslate-compatible /translate endpoint."""
+        max_length = 5000
+        chunks = self._split_text(text, max_length) if len(text) > max_length else [text]
+        
+        translated_chunks = []
+        for chunk in chunks:
+            payload = {'q': chunk, 'source': self.source_lang, 'target': self.target_lang, 'format': 'text'}
+            if self.libre_api_key:
+                payload['api_key'] = self.libre_api_key
+            with get_tracer().span('translate_chunk', characters=len(chunk)):
+                response = get_session().post(f"{self.libre_url}/translate", json=payload, timeout=30)
+                response.raise_for_status()
+            translated_chunks.append(response.json()['translatedText'])
+        
+        return '\n\n'.join(translated_chunks)
+    
     def _translate_azure(self, text: str) -> Optional[str]:
         """Translate using Azure Translator API."""
         # TODO: Implement Azure Translator
@@ -133,27 +332,131 @@ class Translator:
         
         return chunks
     
-    def translate_article(self, article: Dict) -> Dict:
+    def translate_paragraphs(self, paragraphs: List[str], known: Optional[Dict[str, str]] = None) -> List[Optional[str]]:
+        """
+        Translate paragraphs, reusing known translations.
+        
+        Paragraphs without a known translation are joined into requests of up
+        to PARAGRAPH_BATCH_CHARS characters and split back on blank lines; a
+        batch whose translation does not split into the same number of
+        paragraphs is retranslated one paragraph at a time.
+        
+        Args:
+            paragraphs: English paragraphs
+            known: paragraph_key -> Amharic paragraph (e.g. from aligned_translations)
+            
+        Returns:
+            Amharic paragraphs in the same order (None where translation failed)
+        """
+        known = known or {}
+        results = [known.get(paragraph_key(paragraph)) for paragraph in paragraphs]
+        missing = [index for index, result in enumerate(results) if result is None]
+        TRANSLATION_PARAGRAPHS.inc(len(paragraphs) - len(missing), result='reused')
+        TRANSLATION_PARAGRAPHS.inc(len(missing), result='translated')
+        
+        batches, batch, size = [], [], 0
+        for index in missing:
+            if batch and size + len(paragraphs[index]) > PARAGRAPH_BATCH_CHARS:
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(index)
+            size += len(paragraphs[index]) + 2
+        if batch:
+            batches.append(batch)
+        
+        for batch in batches:
+            translated = self.translate_text('\n\n'.join(paragraphs[index] for index in batch))
+            parts = split_paragraphs(translated) if translated else []
+            if len(parts) == len(batch):
+                for index, part in zip(batch, parts):
+                    results[index] = part
+            elif translated is not None and len(batch) == 1:
+                results[batch[0]] = translated.strip()
+            elif translated is not None:
+                for index in batch:
+                    results[index] = self.translate_text(paragraphs[index])
+        return results
+    
+    def untranslated_characters(self, article: Dict, previous: Optional[Dict] = None,
+                                fields=TRANSLATED_FIELDS) -> int:
         """
-        Translate an entire article (title and content).
+        Characters translate_article would send for the given fields, at most
+        (paragraphs already translated in the stored version are not counted;
+        cache hits are).
+        
+        Args:
+            article: Article data
+            previous: Stored version (source fields and their *_am translations)
+            fields: Fields to translate
+            
+        Returns:
+            Number of characters
+        """
+        known = known_translations(previous)
+        total = 0
+        for field in TRANSLATED_FIELDS:
+            if field not in fields:
+                continue
+            text = field_text(article, field)
+            if previous and previous.get(f'{field}_am') and field_text(previous, field) == text:
+                continue
+            for paragraph in split_paragraphs(text):
+                key = paragraph_key(paragraph)
+                if key not in known:
+                    total += len(paragraph)
+                    # Repeated paragraphs (e.g. the summary's) are only paid for once
+                    known[key] = paragraph
+        return total
+    
+    def _translate_field(self, text: str, previous: Optional[Dict], field: str,
+                         known: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """Translate one field paragraph by paragraph, reusing known paragraph translations."""
+        if not text or not text.strip():
+            return text
+        
+        previous_text = field_text(previous, field) if previous else None
+        previous_translation = previous.get(f'{field}_am') if previous else None
+        if previous_translation and previous_text == text:
+            TRANSLATION_PARAGRAPHS.inc(len(split_paragraphs(text)), result='reused')
+            return previous_translation
+        
+        translated = self.translate_paragraphs(split_paragraphs(text), known)
+        if any(paragraph is None for paragraph in translated):
+            return None
+        return '\n\n'.join(translated)
+    
+    def translate_article(self, article: Dict, previous: Optional[Dict] = None,
+                          fields=TRANSLATED_FIELDS) -> Dict:
+        """
+        Translate an article's title, content and summary.
+        
+        With the previously stored version of the article, only paragraphs
+        that are new or changed since then are sent for translation; the
+        stored Amharic text is reused for the rest. The summary reuses the
+        paragraphs it shares with the content.
         
         Args:
             article: Dictionary containing article data
+            previous: Stored version (title, content, summary and their *_am translations)
+            fields: Fields to translate now; the others are left as they are
             
         Returns:
             Article dictionary with translated fields added
         """
         print(f"Translating article: {article.get('title', 'Unknown')}")
         
-        # Translate title
-        translated_title = self.translate_text(article.get('title', ''))
-        
-        # Translate content
-        translated_content = self.translate_text(article.get('content', ''))
+        known = known_translations(previous)
+        with get_tracer().span('translate', service=self.service), stage('translate'):
+            for field in TRANSLATED_FIELDS:
+                if field not in fields:
+                    continue
+                text = field_text(article, field)
+                translated = self._translate_field(text, previous, field, known)
+                if translated:
+                    known.update(aligned_translations(text, translated))
+                # Add translated field to article
+                article[f'{field}_am'] = translated
         
-        # Add translated fields to article
-        article['title_am'] = translated_title
-        article['content_am'] = translated_content
         article['translation_service'] = self.service
         
         return article
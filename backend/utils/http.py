@@ -0,0 +1,141 @@
+"""
+Shared HTTP Session
+Pooled requests.Session reused by all scrapers so connections stay warm
+across crawl cycles, and bounded readers for streamed response bodies
+"""
+
+import codecs
+import os
+import re
+import threading
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+
+# Largest page or feed body read into memory; bigger responses are abandoned mid-download
+MAX_BODY_BYTES = int(os.getenv('MAX_BODY_BYTES', str(5 * 1024 * 1024)))
+
+READ_CHUNK_BYTES = 64 * 1024
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session, creating it on first use.
+
+    Returns:
+        Shared requests.Session with keep-alive connection pools
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def close_session():
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+class BodyTooLarge(requests.RequestException):
+    """A response body exceeded the size limit it was read with."""
+
+
+def _limited_chunks(response: requests.Response, max_bytes: int):
+    """Body chunks of a streamed response, raising BodyTooLarge past max_bytes."""
+    if int(response.headers.get('Content-Length') or 0) > max_bytes:
+        raise BodyTooLarge(f"{response.url}: Content-Length over {max_bytes} bytes")
+    size = 0
+    for chunk in response.iter_content(READ_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            raise BodyTooLarge(f"{response.url}: body over {max_bytes} bytes")
+        yield chunk
+
+
+def read_body(response: requests.Response, max_bytes: int = MAX_BODY_BYTES) -> bytes:
+    """
+    Read a response opened with stream=True, up to max_bytes.
+
+    Args:
+        response: Streamed response
+        max_bytes: Size limit (after content decoding)
+
+    Returns:
+        Body bytes
+
+    Raises:
+        BodyTooLarge: The body is larger than max_bytes (reading stops there)
+    """
+    buffer = bytearray()
+    for chunk in _limited_chunks(response, max_bytes):
+        buffer += chunk
+    return bytes(buffer)
+
+
+def response_encoding(response: requests.Response, head: bytes) -> str:
+    """
+    Text encoding of an HTML response: the Content-Type charset, else a
+    byte order mark or <meta charset> in the first bytes, else UTF-8.
+
+    requests falls back to ISO-8859-1 for text/* without a charset, or
+    guesses from the whole body; neither is used here.
+    """
+    if 'charset=' in response.headers.get('Content-Type', '').lower() and response.encoding:
+        encoding = response.encoding
+    elif head.startswith(codecs.BOM_UTF8):
+        encoding = 'utf-8-sig'
+    else:
+        match = _META_CHARSET.search(head[:4096])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return 'utf-8'
+
+
+def read_text(response: requests.Response, max_bytes: int = MAX_BODY_BYTES) -> Tuple[str, int]:
+    """
+    Read and decode a response opened with stream=True, up to max_bytes.
+
+    Chunks are decoded as they arrive, so the raw body is never held in
+    memory next to the decoded text.
+
+    Args:
+        response: Streamed response
+        max_bytes: Size limit (after content decoding)
+
+    Returns:
+        (text, number of body bytes read)
+
+    Raises:
+        BodyTooLarge: The body is larger than max_bytes (reading stops there)
+    """
+    decoder = None
+    parts = []
+    size = 0
+    for chunk in _limited_chunks(response, max_bytes):
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(response_encoding(response, chunk))(errors='replace')
+        size += len(chunk)
+        parts.append(decoder.decode(chunk))
+    if decoder is not None:
+        parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts), size
@@ -1,46 +1,183 @@
 """
 Logging Configuration
+Log records are handed to a queue and written to the console and the
+(optionally rotating, optionally JSON-lines) log file by a background
+listener thread, so logging never blocks a fetcher on terminal or disk I/O.
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional, Tuple
 
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
-def setup_logger(name: str = 'crawler', log_file: str = None, level: str = 'INFO'):
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.Handler] = None
+_config: Optional[Tuple] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener's handlers.
+
+    The stock prepare() renders the record with its own formatter, which
+    would bake the text format into JSON output; this only resolves the
+    message arguments and the traceback, the parts that cannot safely be
+    deferred to another thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _configure(log_file: Optional[str], json_format: bool, max_bytes: int, backup_count: int):
+    """Replace the queue handler on the root logger and restart the listener."""
+    global _listener, _queue_handler
+    _shutdown()
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+    handlers = [console_handler]
+
+    # File handler (optional), rotated once it reaches max_bytes
+    if log_file:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        if max_bytes > 0:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+            )
+        else:
+            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _QueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    logging.getLogger().addHandler(_queue_handler)
+
+
+def _shutdown():
+    global _listener, _queue_handler, _config
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        # Drains the queue before returning
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    _config = None
+
+
+def setup_logger(name: str = 'crawler', log_file: str = None, level: str = None,
+                 json_format: Optional[bool] = None, max_bytes: Optional[int] = None,
+                 backup_count: Optional[int] = None) -> logging.Logger:
     """
     Set up logger with console and optional file output.
-    
+
+    Output is configured once per process on the root logger, so scraper
+    and service loggers share it; calling this again with the same
+    settings only returns the named logger (no duplicate handlers).
+
     Args:
         name: Logger name
         log_file: Optional log file path
-        level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        
+        level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL; defaults to LOG_LEVEL)
+        json_format: Write JSON lines instead of text (defaults to LOG_FORMAT=json)
+        max_bytes: Rotate the log file at this size, 0 to never rotate (defaults to LOG_MAX_BYTES)
+        backup_count: Rotated files to keep (defaults to LOG_BACKUP_COUNT)
+
     Returns:
         Configured logger instance
     """
-    # Create logger
+    global _config
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    if json_format is None:
+        json_format = os.getenv('LOG_FORMAT', 'text').lower() == 'json'
+    if max_bytes is None:
+        max_bytes = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    if backup_count is None:
+        backup_count = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+
+    config = (log_file, json_format, max_bytes, backup_count)
+    with _lock:
+        if _config != config:
+            _configure(*config)
+            _config = config
+        logging.getLogger().setLevel(getattr(logging, level))
+
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper()))
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler (optional)
-    if log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+    logger.setLevel(getattr(logging, level))
     return logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Return a logger, setting up console logging first if nothing has
+    configured it yet (e.g. a scraper used outside main.py).
+
+    Args:
+        name: Logger name
+
+    Returns:
+        Logger instance
+    """
+    if _config is None and not logging.getLogger().handlers:
+        setup_logger(name=name)
+    return logging.getLogger(name)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread."""
+    with _lock:
+        _shutdown()
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,256 @@
+"""
+Metrics
+Thread-safe in-process counters and histograms, exposed in the Prometheus
+text format on /metrics (daemon mode) or printed as a summary (one-shot runs)
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from a warm cache hit to a slow remote call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class Metric:
+    """Base class holding one series per label combination."""
+
+    kind = ''
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def _format_labels(self, values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labels, values))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+        return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Add to the counter for the given label values."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Current value for the given label values (0 if never incremented)."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def total(self) -> float:
+        """Sum over all label values."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{self._format_labels(key)} {value:g}")
+        return lines
+
+    def summary(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(key)}: {value:g}" for key, value in items]
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        """Number of observations for the given label values."""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return int(sum(series[:-1])) if series else 0
+
+    def quantile(self, q: float, **labels) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            series = list(series) if series else None
+        return self._quantile(series, q)
+
+    def _quantile(self, series: Optional[List[float]], q: float) -> float:
+        if not series:
+            return 0.0
+        counts = series[:-1]
+        rank = q * sum(counts)
+        cumulative = 0
+        for index, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', le))} {cumulative:g}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {series[-1]:g}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative:g}")
+        return lines
+
+    def summary(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            count = sum(series[:-1])
+            lines.append(
+                f"{self.name}{self._format_labels(key)}: count={count:g} "
+                f"avg={series[-1] / count:.3f} p50<={self._quantile(series, 0.5):g} "
+                f"p95<={self._quantile(series, 0.95):g}"
+            )
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, description, labels)
+
+    def histogram(self, name: str, description: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, description, labels, buckets)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+    def summary(self) -> List[str]:
+        """One human-readable line per series that has data."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return [line for metric in metrics for line in metric.summary()]
+
+
+# Process-wide registry used by the crawler
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+    """Get or create a counter in the default registry."""
+    return REGISTRY.counter(name, description, labels)
+
+
+def histogram(name: str, description: str, labels: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Get or create a histogram in the default registry."""
+    return REGISTRY.histogram(name, description, labels, buckets)
+
+
+def start_metrics_server(port: int, host: str = '127.0.0.1',
+                         registry: MetricsRegistry = REGISTRY):
+    """
+    Serve the registry on http://host:port/metrics from a daemon thread.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        host: Interface to bind (local only by default)
+        registry: Registry to expose
+
+    Returns:
+        The running ThreadingHTTPServer (call shutdown() to stop it)
+    """
+    # Imported here: http.server is slow to import and only the daemon serves metrics
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
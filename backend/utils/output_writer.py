@@ -0,0 +1,139 @@
+"""
+Streaming Output Writer
+Appends one compact JSON line per article, optionally compressed and
+partitioned by time, so output can be tailed while a run is in progress
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+# zstandard is optional; gzip is used when it is not installed
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+
+PARTITION_FORMATS = {
+    None: None,
+    'day': '%Y-%m-%d',
+    'hour': '%Y-%m-%dT%H',
+}
+
+EXTENSIONS = {
+    None: '.jsonl',
+    'gzip': '.jsonl.gz',
+    'zstd': '.jsonl.zst',
+}
+
+
+class JsonlWriter:
+    """
+    Incremental JSON Lines sink.
+
+    Every write() appends and flushes one line, so memory use does not grow
+    with the run size. Compressed streams are flushed at block boundaries
+    and reopening a file appends a new gzip member / zstd frame, both of
+    which standard readers decode as one stream.
+    """
+
+    def __init__(self, directory: str = 'output', prefix: str = 'articles',
+                 compression: Optional[str] = None, partition: Optional[str] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            directory: Output directory
+            prefix: File name prefix
+            compression: None, 'gzip' or 'zstd'
+            partition: None (single file), 'day' or 'hour' (UTC)
+        """
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if partition not in PARTITION_FORMATS:
+            raise ValueError(f"Unsupported partition: {partition}")
+
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            print("Warning: zstandard not installed. Falling back to gzip output.")
+            compression = 'gzip'
+
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.compression = compression
+        self.partition = partition
+        self.count = 0
+
+        self._path: Optional[Path] = None
+        self._raw = None
+        self._stream = None
+
+    def path_for(self, when: datetime) -> Path:
+        """Return the output file for a timestamp."""
+        partition_format = PARTITION_FORMATS[self.partition]
+        suffix = f"-{when.strftime(partition_format)}" if partition_format else ''
+        return self.directory / f"{self.prefix}{suffix}{EXTENSIONS[self.compression]}"
+
+    def write(self, record: Dict):
+        """
+        Append one record as a compact JSON line.
+
+        Args:
+            record: Article record or JSON-serialisable dictionary
+        """
+        if hasattr(record, 'to_dict'):
+            record = record.to_dict()
+
+        path = self.path_for(datetime.now(timezone.utc))
+        if path != self._path:
+            self._open(path)
+
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+        self._stream.write(line.encode('utf-8'))
+        self._flush()
+        self.count += 1
+
+    def close(self):
+        """Flush and close the current file."""
+        if self._stream is None:
+            return
+        self._stream.close()
+        if self._raw is not None and self._raw is not self._stream:
+            self._raw.close()
+        self._stream = None
+        self._raw = None
+        self._path = None
+
+    def _open(self, path: Path):
+        self.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.compression == 'gzip':
+            self._raw = open(path, 'ab')
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='ab')
+        elif self.compression == 'zstd':
+            self._raw = open(path, 'ab')
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw)
+        else:
+            self._raw = open(path, 'ab')
+            self._stream = self._raw
+
+        self._path = path
+
+    def _flush(self):
+        if self.compression == 'zstd':
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        else:
+            self._stream.flush()
+        if self._raw is not self._stream:
+            self._raw.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
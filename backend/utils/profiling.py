@@ -0,0 +1,248 @@
+"""
+Profiling
+Per-stage CPU profiles (cProfile pstats), sampled collapsed stacks for
+flamegraphs and optional tracemalloc snapshots for a pipeline run
+
+Pipeline code marks its stages with `with stage('fetch'):`; outside a
+profiled run this is a no-op. cProfile and pstats are only imported once a
+profile is taken, so importing this module stays cheap.
+"""
+
+import io
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+STAGES = ('fetch', 'parse', 'translate', 'save')
+
+# Samples and CPU time outside any stage
+OTHER = 'other'
+
+_active: Optional['Profiler'] = None
+
+
+@contextmanager
+def stage(name: str):
+    """Attribute the enclosed work to a pipeline stage while a profiler is running."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+class Profiler:
+    """
+    Profiles a run, split by pipeline stage.
+
+    Modes:
+        cprofile: a cProfile.Profile per stage on the profiled thread (exact
+            call counts and times, higher overhead) plus stack sampling
+        sample: stack sampling only (low overhead, suitable for
+            production-like runs)
+
+    Stack samples are taken from every thread that is inside a stage, plus
+    the profiled thread, and written in the collapsed format understood by
+    flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, mode: str = 'cprofile', output_dir: Optional[str] = None,
+                 sample_interval_ms: Optional[float] = None, memory: bool = False, label: str = 'run'):
+        """
+        Configure the profiler.
+
+        Args:
+            mode: 'cprofile' or 'sample'
+            output_dir: Parent directory for profile output (defaults to PROFILE_DIR)
+            sample_interval_ms: Stack sampling interval (defaults to PROFILE_SAMPLE_INTERVAL_MS)
+            memory: Also record allocations with tracemalloc
+            label: Prefix for the output directory name
+        """
+        if mode not in ('cprofile', 'sample'):
+            raise ValueError(f"Unsupported profile mode: {mode}")
+
+        self.mode = mode
+        self.output_dir = Path(output_dir or os.getenv('PROFILE_DIR', 'output/profiles'))
+        interval_ms = sample_interval_ms or float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '5'))
+        self.sample_interval = interval_ms / 1000
+        self.memory = memory
+        self.label = label
+        self.path: Optional[Path] = None
+
+        self._thread_id: Optional[int] = None
+        self._profiles: Dict[str, 'cProfile.Profile'] = {}
+        self._stages: Dict[int, List[str]] = defaultdict(list)
+        self._samples: Dict[str, Counter] = defaultdict(Counter)
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start profiling the calling thread."""
+        global _active
+        if _active is not None:
+            raise RuntimeError("A profiler is already running")
+
+        self._thread_id = threading.get_ident()
+        if self.memory:
+            tracemalloc.start(25)
+        if self.mode == 'cprofile':
+            self._profile_for(OTHER).enable()
+
+        self._sampler = threading.Thread(target=self._sample_loop, name='profiler-sampler', daemon=True)
+        self._sampler.start()
+        _active = self
+
+    def stop(self) -> Path:
+        """
+        Stop profiling and write the output files.
+
+        Returns:
+            Directory containing the profiles
+        """
+        global _active
+        _active = None
+
+        if self.mode == 'cprofile':
+            for profile in self._profiles.values():
+                profile.disable()
+        self._stop.set()
+        self._sampler.join()
+
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        self.path = self.output_dir / f"{self.label}-{stamp}"
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        summary = [f"Profile mode: {self.mode}, sample interval {self.sample_interval * 1000:g} ms", '']
+        summary += self._write_samples()
+        if self.mode == 'cprofile':
+            summary += self._write_pstats()
+        if self.memory:
+            summary += self._write_memory()
+
+        (self.path / 'summary.txt').write_text('\n'.join(summary) + '\n', encoding='utf-8')
+        return self.path
+
+    @contextmanager
+    def stage(self, name: str):
+        """Attribute the enclosed work on this thread to a stage."""
+        thread_id = threading.get_ident()
+        stack = self._stages[thread_id]
+        previous = stack[-1] if stack else OTHER
+        switch = self.mode == 'cprofile' and thread_id == self._thread_id and name != previous
+
+        if switch:
+            self._profiles[previous].disable()
+            self._profile_for(name).enable()
+        stack.append(name)
+        try:
+            yield
+        finally:
+            stack.pop()
+            if switch and _active is self:
+                self._profiles[name].disable()
+                self._profiles[previous].enable()
+
+    def _profile_for(self, name: str) -> 'cProfile.Profile':
+        import cProfile
+
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = self._profiles[name] = cProfile.Profile()
+        return profile
+
+    def _sample_loop(self):
+        sampler_id = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                stack = self._stages.get(thread_id)
+                if stack:
+                    name = stack[-1]
+                elif thread_id == self._thread_id:
+                    name = OTHER
+                else:
+                    continue
+                self._samples[name][self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _write_samples(self) -> List[str]:
+        lines = ['Stack samples per stage:']
+        total = sum(sum(samples.values()) for samples in self._samples.values()) or 1
+        with open(self.path / 'all.collapsed', 'w', encoding='utf-8') as combined:
+            for name, samples in sorted(self._samples.items()):
+                with open(self.path / f'{name}.collapsed', 'w', encoding='utf-8') as f:
+                    for stack, count in samples.most_common():
+                        f.write(f"{stack} {count}\n")
+                        combined.write(f"{name};{stack} {count}\n")
+                count = sum(samples.values())
+                lines.append(f"  {name:<10} {count:>7} samples ({count * 100 / total:.1f}%)")
+        return lines + ['']
+
+    def _write_pstats(self) -> List[str]:
+        import pstats
+
+        lines = []
+        merged = None
+        for name, profile in sorted(self._profiles.items()):
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            profile.dump_stats(str(self.path / f'{name}.pstats'))
+
+            stats = pstats.Stats(profile)
+            merged = stats if merged is None else merged.add(profile)
+
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(15)
+            lines += [f"=== {name} (cProfile, top 15 by cumulative time) ===", stream.getvalue()]
+
+        if merged is not None:
+            merged.dump_stats(str(self.path / 'all.pstats'))
+        return lines
+
+    def _write_memory(self) -> List[str]:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot.dump(str(self.path / 'memory.tracemalloc'))
+
+        lines = [f"=== tracemalloc: current {current / 1024 / 1024:.1f} MiB, peak {peak / 1024 / 1024:.1f} MiB ==="]
+        lines += [str(stat) for stat in snapshot.statistics('lineno')[:25]]
+        return lines
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def profile_from_env(label: str):
+    """
+    Profiler configured by CRAWLER_PROFILE ('cprofile' or 'sample') and
+    CRAWLER_PROFILE_MEMORY, or a no-op context when profiling is off.
+
+    Used by entry points that take no command line (Appwrite functions).
+    """
+    mode = os.getenv('CRAWLER_PROFILE', '').lower()
+    if not mode or mode in ('0', 'false', 'none'):
+        return nullcontext()
+    memory = os.getenv('CRAWLER_PROFILE_MEMORY', 'false').lower() == 'true'
+    return Profiler(mode='cprofile' if mode in ('1', 'true') else mode, memory=memory, label=label)
@@ -1,9 +1,35 @@
 """
 Text Cleaning Utilities
+
+Patterns are compiled once at import. clean_batch() cleans a whole list of
+paragraphs with a few passes over one joined string instead of several
+regex calls per paragraph.
 """
 
+import html
 import re
-from typing import Optional
+from typing import Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|dclid|mc_cid|mc_eid|ref|ref_src|cmpid|guccounter|guce_\w+)$', re.I)
+
+# Anything but word characters, whitespace, basic punctuation and Ethiopic (Amharic) script
+_DISALLOWED = re.compile(r'[^\w\s\.,!?;:\-\u1200-\u137F]+')
+
+# Joins paragraphs in clean_batch; NUL is never kept by clean_text, so no input can contain a surviving one
+_SEPARATOR = '\x00'
+_DISALLOWED_BATCH = re.compile(r'[^\w\s\.,!?;:\-\u1200-\u137F\x00]+')
+
+# Markup whose contents are not text: comments, and script/style-like elements with their contents
+_NON_TEXT = re.compile(r'<!--.*?(?:-->|$)|<(script|style|noscript|template)\b[^>]*>.*?(?:</\1\s*>|$)', re.S | re.I)
+# Elements that start a new line, so words on either side do not run together
+_BLOCK_TAG = re.compile(
+    r'</?(?:address|article|aside|blockquote|br|dd|div|dl|dt|figcaption|figure|footer|h[1-6]|header|hr|li|main|'
+    r'nav|ol|p|pre|section|table|td|th|tr|ul)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>', re.I
+)
+# Any other tag (attribute values may contain '>'), doctype or processing instruction
+_TAG = re.compile(r'</?[a-zA-Z][^\s/>]*(?:[^>"\']|"[^"]*"|\'[^\']*\')*>|<![^>]*>|<\?[^>]*>')
 
 
 def clean_text(text: str) -> str:
@@ -19,17 +45,41 @@ def clean_text(text: str) -> str:
     if not text:
         return ''
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove leading/trailing whitespace
-    text = text.strip()
+    # Collapse whitespace runs and trim (str.split uses the same whitespace as \s)
+    text = ' '.join(text.split())
     
     # Remove special characters but keep punctuation
     # Keep Amharic characters if present
-    text = re.sub(r'[^\w\s\.,!?;:\-\u1200-\u137F]', '', text)
+    return _DISALLOWED.sub('', text)
+
+
+def clean_batch(texts: Iterable[str]) -> List[str]:
+    """
+    Clean many texts (e.g. an article's paragraphs) at once.
     
-    return text
+    The texts are joined, cleaned with one whitespace pass and one regex
+    pass over the joined string, then split apart again; results match
+    clean_text().
+    
+    Args:
+        texts: Raw texts (None and empty strings give '')
+        
+    Returns:
+        Cleaned texts, in order
+    """
+    texts = [text or '' for text in texts]
+    if len(texts) < 2:
+        return [clean_text(text) for text in texts]
+    
+    joined = _SEPARATOR.join(texts)
+    if joined.count(_SEPARATOR) != len(texts) - 1:
+        # An input contains the separator itself
+        return [clean_text(text) for text in texts]
+    
+    # The separator is not whitespace, so it survives the collapse; then trim around it
+    joined = ' '.join(joined.split())
+    joined = joined.replace(' ' + _SEPARATOR, _SEPARATOR).replace(_SEPARATOR + ' ', _SEPARATOR)
+    return _DISALLOWED_BATCH.sub('', joined).split(_SEPARATOR)
 
 
 def extract_summary(text: str, max_length: int = 200) -> str:
@@ -49,30 +99,37 @@ def extract_summary(text: str, max_length: int = 200) -> str:
     if len(text) <= max_length:
         return text
     
-    # Find the last sentence boundary before max_length
-    summary = text[:max_length]
-    last_period = summary.rfind('.')
-    
+    # Cut after the last sentence boundary before max_length
+    last_period = text.rfind('.', 0, max_length)
     if last_period > 0:
-        summary = summary[:last_period + 1]
-    else:
-        summary = summary + '...'
-    
-    return summary
+        return text[:last_period + 1]
+    return text[:max_length] + '...'
 
 
 def remove_html_tags(text: str) -> str:
     """
     Remove HTML tags from text.
     
+    Tags are matched as tags (a '<' in running text is kept, a '>' inside a
+    quoted attribute value does not end the tag), comments and script/style
+    contents are dropped, block elements (p, br, li, ...) become line
+    breaks and entities (&amp;, &#8217;, ...) are decoded.
+    
     Args:
         text: Text with HTML tags
         
     Returns:
         Clean text without HTML
     """
-    clean = re.compile('<.*?>')
-    return re.sub(clean, '', text)
+    if not text:
+        return ''
+    if '<' in text:
+        text = _NON_TEXT.sub('', text)
+        text = _BLOCK_TAG.sub('\n', text)
+        text = _TAG.sub('', text)
+    if '&' in text:
+        text = html.unescape(text)
+    return text.strip('\n')
 
 
 def normalize_url(url: str, base_url: Optional[str] = None) -> str:
@@ -94,3 +151,33 @@ def normalize_url(url: str, base_url: Optional[str] = None) -> str:
         return base_url.rstrip('/') + url
     
     return url
+
+
+def canonical_url(url: str) -> str:
+    """
+    Reduce an article URL to a canonical form for duplicate detection.
+    
+    Lowercases the host, drops "www.", default ports, the fragment, a
+    trailing slash and tracking parameters (utm_*, fbclid, ...), sorts the
+    remaining query parameters and treats http and https as the same.
+    
+    Args:
+        url: Absolute article URL
+        
+    Returns:
+        Canonical URL (empty string for an empty URL)
+    """
+    if not url:
+        return ''
+    
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not TRACKING_PARAMS.match(key)))
+    return urlunsplit(('https', host, path, query, ''))
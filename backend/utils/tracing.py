@@ -0,0 +1,362 @@
+"""
+Tracing
+Lightweight spans for following one article (or one source crawl) through
+fetch, parse, translate and save, exported to a local JSON Lines file or
+an OTLP/HTTP (JSON) collector
+
+Usage:
+    python -m utils.tracing output/traces.jsonl   # Slowest articles with a per-stage breakdown
+"""
+
+import json
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ('tracer', 'trace_id', 'span_id', 'parent_span_id', 'name', 'attributes',
+                 'links', 'start_ns', 'end_ns', 'error')
+
+    def __init__(self, tracer: 'Tracer', name: str, trace_id: str, parent_span_id: str = '',
+                 attributes: Optional[Dict] = None, links: Optional[List['Span']] = None):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.links = [(link.trace_id, link.span_id) for link in links or () if link.trace_id]
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, error):
+        """Mark the span as failed."""
+        self.error = str(error) or type(error).__name__
+
+    def end(self):
+        """Finish the span and hand it to the exporter (idempotent)."""
+        if self.end_ns:
+            return
+        self.end_ns = time.time_ns()
+        self.tracer.export(self)
+
+    def to_dict(self) -> Dict:
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_span_id,
+            'name': self.name,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'durationMs': round((self.end_ns - self.start_ns) / 1e6, 3),
+            'attributes': self.attributes,
+            'status': 'ERROR' if self.error else 'OK',
+            'error': self.error,
+            'links': [{'traceId': trace_id, 'spanId': span_id} for trace_id, span_id in self.links],
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    trace_id = ''
+    span_id = ''
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JsonFileExporter:
+    """Appends one JSON line per finished span."""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class OtlpHttpExporter:
+    """
+    Batches spans and posts them to an OTLP/HTTP collector using the JSON
+    encoding (POST <endpoint>/v1/traces), from a background thread.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, batch_size: int = 256, interval: float = 5.0):
+        self.url = endpoint.rstrip('/') + '/v1/traces'
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name='otlp-exporter', daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass  # Drop rather than block the pipeline
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join(timeout=30)
+
+    def _run(self):
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.interval
+        while True:
+            try:
+                span = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                span = False
+
+            if span:
+                batch.append(span)
+            if batch and (span is None or span is False or len(batch) >= self.batch_size):
+                self._post(batch)
+                batch = []
+            if span is None:
+                return
+            if span is False:
+                deadline = time.monotonic() + self.interval
+
+    def _post(self, spans: List[Span]):
+        payload = {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'crawler'},
+                    'spans': [self._otlp_span(span) for span in spans],
+                }],
+            }]
+        }
+        # Imported here so the tracer does not load requests unless exporting over HTTP
+        from utils.http import get_session
+        try:
+            get_session().post(self.url, json=payload, timeout=10).raise_for_status()
+        except Exception as e:
+            print(f"Trace export failed ({len(spans)} spans): {str(e)}")
+
+    @staticmethod
+    def _otlp_span(span: Span) -> Dict:
+        data = {
+            'traceId': span.trace_id,
+            'spanId': span.span_id,
+            'name': span.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(span.start_ns),
+            'endTimeUnixNano': str(span.end_ns),
+            'attributes': [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+            'status': {'code': 2, 'message': span.error} if span.error else {'code': 1},
+        }
+        if span.parent_span_id:
+            data['parentSpanId'] = span.parent_span_id
+        if span.links:
+            data['links'] = [{'traceId': trace_id, 'spanId': span_id} for trace_id, span_id in span.links]
+        return data
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class Tracer:
+    """
+    Creates spans and tracks the active one per thread/context.
+
+    With no exporter every call returns NOOP_SPAN, so instrumentation costs
+    next to nothing when tracing is off.
+    """
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start_span(self, name: str, parent=None, new_trace: bool = False,
+                   links: Optional[List[Span]] = None, **attributes):
+        """
+        Start a span without activating it; the caller must end() it.
+
+        Args:
+            name: Span name
+            parent: Parent span (defaults to the active span)
+            new_trace: Start a new trace even if a span is active
+            links: Spans in other traces this one relates to
+            **attributes: Span attributes
+
+        Returns:
+            Span (or NOOP_SPAN when tracing is disabled)
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        if parent is None and not new_trace:
+            parent = _current_span.get()
+        if parent is None or not parent.trace_id:
+            return Span(self, name, secrets.token_hex(16), attributes=attributes, links=links)
+        return Span(self, name, parent.trace_id, parent.span_id, attributes=attributes, links=links)
+
+    @contextmanager
+    def activate(self, span) -> Iterator:
+        """Make a span the parent of spans started inside the block (does not end it)."""
+        if span is None or span is NOOP_SPAN:
+            yield span
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator:
+        """Run a block in a child span of the active span, recording any exception."""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        span = self.start_span(name, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def export(self, span: Span):
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def shutdown(self):
+        """Flush and close the exporter."""
+        if self.exporter is not None:
+            self.exporter.shutdown()
+            self.exporter = None
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """
+    Return the process-wide tracer configured by TRACING_EXPORTER.
+
+    'file' writes spans to TRACING_FILE, 'otlp' posts them to
+    OTEL_EXPORTER_OTLP_ENDPOINT, anything else disables tracing.
+    """
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                exporter_name = os.getenv('TRACING_EXPORTER', 'none').lower()
+                exporter = None
+                if exporter_name == 'file':
+                    exporter = JsonFileExporter(os.getenv('TRACING_FILE', 'output/traces.jsonl'))
+                elif exporter_name == 'otlp':
+                    exporter = OtlpHttpExporter(
+                        os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT', 'http://localhost:4318'),
+                        os.getenv('OTEL_SERVICE_NAME', 'tech-news-crawler'),
+                    )
+                _tracer = Tracer(exporter)
+    return _tracer
+
+
+def shutdown_tracer():
+    """Flush pending spans and close the exporter."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.shutdown()
+            _tracer = None
+
+
+def summarize_traces(path: str, top: int = 10) -> List[str]:
+    """
+    Report the slowest article traces in a span file.
+
+    Args:
+        path: JSON Lines file written by JsonFileExporter
+        top: Number of traces to report
+
+    Returns:
+        Report lines: one per trace with its URL, total time and time per stage
+    """
+    traces = defaultdict(list)
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            span = json.loads(line)
+            traces[span['traceId']].append(span)
+
+    roots = []
+    for spans in traces.values():
+        root = next((span for span in spans if not span['parentSpanId'] and span['name'] == 'article'), None)
+        if root:
+            stages = defaultdict(float)
+            for span in spans:
+                if span['parentSpanId'] == root['spanId']:
+                    stages[span['name']] += span['durationMs']
+            roots.append((root, stages))
+
+    roots.sort(key=lambda item: -item[0]['durationMs'])
+    lines = []
+    for root, stages in roots[:top]:
+        attributes = root['attributes']
+        # Time not covered by a stage is spent waiting for the rest of the source's batch
+        stages['queued'] = max(0.0, root['durationMs'] - sum(stages.values()))
+        breakdown = ', '.join(f"{name} {ms:.0f}ms" for name, ms in sorted(stages.items(), key=lambda item: -item[1]))
+        status = ' ERROR' if root['status'] == 'ERROR' else ''
+        lines.append(f"{root['durationMs']:>9.0f}ms{status} [{attributes.get('source', '?')}] "
+                     f"{attributes.get('url', '?')}: {breakdown}")
+    return lines
+
+
+if __name__ == '__main__':
+    for report_line in summarize_traces(sys.argv[1] if len(sys.argv) > 1 else 'output/traces.jsonl'):
+        print(report_line)
@@ -0,0 +1,186 @@
+"""
+WARC Files
+Minimal reader and writer for WARC/1.0 response records, used to record
+live crawls and replay them offline
+"""
+
+import base64
+import gzip
+import hashlib
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+# (target URI, HTTP status, HTTP headers with lower-cased names, decoded body)
+WarcResponse = Tuple[str, int, Dict[str, str], bytes]
+
+
+class WarcWriter:
+    """
+    Appends response records to a WARC file.
+
+    Files ending in .gz get one gzip member per record (the usual .warc.gz
+    layout), so a file is readable up to the last complete record even if
+    the crawler is killed mid-run. Safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a WARC file for appending.
+
+        Args:
+            path: Output path; '.warc.gz' for per-record gzip, '.warc' for plain
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.compress = self.path.suffix == '.gz'
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'ab')
+
+    def write_response(self, url: str, body: bytes, status: int = 200,
+                       content_type: str = 'text/html; charset=utf-8'):
+        """
+        Append a response record.
+
+        Args:
+            url: Target URI
+            body: Response payload (already decoded from any transfer/content encoding)
+            status: HTTP status code
+            content_type: Payload Content-Type header
+        """
+        http_block = (
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Status'}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"\r\n"
+        ).encode('latin-1') + body
+
+        digest = base64.b32encode(hashlib.sha1(body).digest()).decode('ascii')
+        warc_headers = (
+            f"WARC/1.0\r\n"
+            f"WARC-Type: response\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"WARC-Payload-Digest: sha1:{digest}\r\n"
+            f"Content-Type: application/http; msgtype=response\r\n"
+            f"Content-Length: {len(http_block)}\r\n"
+            f"\r\n"
+        ).encode('utf-8')
+
+        record = warc_headers + http_block + b'\r\n\r\n'
+        if self.compress:
+            record = gzip.compress(record)
+
+        with self._lock:
+            self._file.write(record)
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        """Close the file."""
+        with self._lock:
+            self._file.close()
+
+
+def iter_responses(path: str) -> Iterator[WarcResponse]:
+    """
+    Iterate over the response records of a WARC file.
+
+    Accepts plain and gzip-compressed files, including ones written by other
+    tools: chunked transfer encoding and gzip/deflate content encoding are
+    removed from the payload. Non-response records are skipped.
+
+    Args:
+        path: Path to a .warc or .warc.gz file
+
+    Yields:
+        (url, status, headers, body) tuples
+    """
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        while True:
+            headers = _read_headers(f)
+            if headers is None:
+                return
+
+            block = f.read(int(headers.get('content-length', 0)))
+            f.readline()
+            f.readline()
+
+            if headers.get('warc-type') != 'response' or 'msgtype=response' not in headers.get('content-type', ''):
+                continue
+
+            status, http_headers, body = _parse_http_response(block)
+            yield headers.get('warc-target-uri', ''), status, http_headers, body
+
+
+def body_charset(headers: Dict[str, str], default: str = 'utf-8') -> str:
+    """Return the charset declared in a Content-Type header."""
+    for param in headers.get('content-type', '').split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'charset' and value:
+            return value.strip('"\'')
+    return default
+
+
+def _read_headers(f: BinaryIO) -> Optional[Dict[str, str]]:
+    """Read a WARC header block; returns None at end of file."""
+    line = f.readline()
+    while line in (b'\r\n', b'\n'):
+        line = f.readline()
+    if not line:
+        return None
+    if not line.startswith(b'WARC/'):
+        raise ValueError(f"Invalid WARC record header: {line[:40]!r}")
+
+    headers = {}
+    for line in iter(f.readline, b''):
+        if line in (b'\r\n', b'\n'):
+            break
+        name, _, value = line.decode('utf-8').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _parse_http_response(block: bytes) -> Tuple[int, Dict[str, str], bytes]:
+    """Split an HTTP response block into status, headers and decoded body."""
+    head, _, body = block.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split(' ', 2)
+    status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = _dechunk(body)
+
+    encoding = headers.get('content-encoding', '').lower()
+    if encoding in ('gzip', 'x-gzip'):
+        body = gzip.decompress(body)
+    elif encoding == 'deflate':
+        body = zlib.decompress(body)
+
+    return status, headers, body
+
+
+def _dechunk(body: bytes) -> bytes:
+    """Decode a chunked transfer-encoded body."""
+    chunks = []
+    position = 0
+    while position < len(body):
+        line_end = body.index(b'\r\n', position)
+        size = int(body[position:line_end].split(b';')[0], 16)
+        if size == 0:
+            break
+        start = line_end + 2
+        chunks.append(body[start:start + size])
+        position = start + size + 2
+    return b''.join(chunks)
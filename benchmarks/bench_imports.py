@@ -0,0 +1,170 @@
+"""
+Import-Time Benchmark
+
+Measures the cold-start cost of the crawler's entry points: each one is
+imported in a fresh interpreter (as a serverless container would) under
+`python -X importtime`, reporting wall-clock time, the number of modules
+loaded and the slowest imports. Exits non-zero when an entry point is
+slower than benchmarks/import_thresholds.json allows or imports a module
+it should only load on demand.
+
+Usage:
+    python benchmarks/bench_imports.py               # Benchmark and check thresholds
+    python benchmarks/bench_imports.py --runs 10     # More runs for steadier numbers
+    python benchmarks/bench_imports.py --top 20      # Show more of the slowest imports
+    python benchmarks/bench_imports.py --json out.json
+"""
+
+import argparse
+import compileall
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = ROOT / 'backend'
+THRESHOLDS_FILE = Path(__file__).resolve().parent / 'import_thresholds.json'
+
+# Entry point -> statement executed in the fresh interpreter
+ENTRY_POINTS = {
+    'scheduled_crawler': 'import appwrite_functions.scheduled_crawler.main',
+    'translate_article': 'import appwrite_functions.translate_article.main',
+    'main': 'import main',
+    # What a crawl needs before its first fetch: one scraper class resolved and built
+    'first_scraper': (
+        'from scrapers.registry import create_scraper; '
+        'create_scraper({"name": "Wired", "url": "https://www.wired.com/", '
+        '"scraper_class": "scrapers.wired:WiredScraper"})'
+    ),
+}
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        Module name -> self time in microseconds
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|', 2)
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def measure(statement: str) -> Dict:
+    """Run one statement in a fresh interpreter and time it."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{proc.stderr[-2000:]}")
+    return {'wall_ms': wall_ms, 'modules': parse_importtime(proc.stderr)}
+
+
+def benchmark_entry_point(statement: str, runs: int, top: int) -> Dict:
+    """
+    Import an entry point `runs` times in fresh interpreters.
+
+    Returns:
+        Median wall-clock and import times, module count and the slowest imports
+    """
+    samples = [measure(statement) for _ in range(runs)]
+    baseline = [measure('pass') for _ in range(runs)]
+
+    modules = samples[-1]['modules']
+    startup = set(baseline[-1]['modules'])
+    self_times = {name: statistics.median(sample['modules'].get(name, 0) for sample in samples)
+                  for name in modules if name not in startup}
+    slowest = sorted(self_times.items(), key=lambda item: -item[1])[:top]
+
+    return {
+        'wall_ms': round(statistics.median(sample['wall_ms'] for sample in samples), 1),
+        'interpreter_ms': round(statistics.median(sample['wall_ms'] for sample in baseline), 1),
+        'import_ms': round(sum(self_times.values()) / 1000, 1),
+        'module_count': len(self_times),
+        'modules': sorted(self_times),
+        'slowest': [{'module': name, 'self_ms': round(us / 1000, 2)} for name, us in slowest],
+    }
+
+
+def print_results(results: Dict):
+    for name, result in results.items():
+        print(f"\n=== {name} ===")
+        print(f"  wall clock:  {result['wall_ms']:>8.1f} ms "
+              f"(bare interpreter {result['interpreter_ms']:.1f} ms)")
+        print(f"  imports:     {result['import_ms']:>8.1f} ms across {result['module_count']} modules")
+        print("  slowest (self time):")
+        for entry in result['slowest']:
+            print(f"    {entry['self_ms']:>8.2f} ms  {entry['module']}")
+
+
+def check_thresholds(results: Dict, thresholds: Dict) -> List[str]:
+    """
+    Compare results with the regression thresholds.
+
+    import_thresholds.json maps entry point -> {max_import_ms, forbidden};
+    forbidden lists modules (or packages) that must not load at import time.
+
+    Returns:
+        List of human-readable regressions (empty when all pass)
+    """
+    failures = []
+    for name, result in results.items():
+        limit = thresholds.get(name, {})
+        if result['import_ms'] > limit.get('max_import_ms', float('inf')):
+            failures.append(f"{name}: imports take {result['import_ms']} ms > {limit['max_import_ms']}")
+        for forbidden in limit.get('forbidden', []):
+            loaded = [module for module in result['modules']
+                      if module == forbidden or module.startswith(forbidden + '.')]
+            if loaded:
+                failures.append(f"{name}: imports {forbidden} eagerly")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Entry point import-time benchmark')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per entry point')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list')
+    parser.add_argument('--entry-points', nargs='+', choices=sorted(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--no-check', action='store_true', help='Report only, do not enforce thresholds')
+    args = parser.parse_args()
+
+    # Measure imports from bytecode, as a deployed function would (not the
+    # one-off compile cost, which PYTHONDONTWRITEBYTECODE would repeat every run)
+    compileall.compile_dir(str(BACKEND_DIR), quiet=1)
+
+    results = {name: benchmark_entry_point(ENTRY_POINTS[name], args.runs, args.top) for name in args.entry_points}
+    print_results(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    if args.no_check:
+        return 0
+
+    thresholds = json.loads(THRESHOLDS_FILE.read_text(encoding='utf-8'))
+    failures = check_thresholds(results, thresholds)
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        return 1
+
+    print("\n✓ All entry points within thresholds")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
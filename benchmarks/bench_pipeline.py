@@ -0,0 +1,232 @@
+"""
+End-to-End Pipeline Benchmark
+
+Runs ArticleProcessor.process_pipeline against the local stub servers
+(benchmarks/stub_servers.py: fake news sites, fake LibreTranslate-style
+translator and fake Appwrite REST API) and reports articles/sec, p50/p95/p99
+latency per stage (fetch, parse, translate, save) and the crawler's CPU time
+and peak memory.
+
+The stub servers run in a separate process so their CPU and memory are not
+counted against the crawler. Real site URLs are routed to the fake site by a
+transport adapter mounted on the shared HTTP session; the translator and
+Appwrite clients are pointed at the stubs through the usual environment
+variables.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --cycles 5 --articles-per-source 30
+    python benchmarks/bench_pipeline.py --site-latency-ms 150 --site-error-rate 0.02 \\
+        --translator-latency-ms 300 --appwrite-latency-ms 40 --json results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(ROOT / 'backend'))
+
+import stub_servers
+
+STAGES = ('fetch', 'parse', 'translate', 'save')
+
+
+class StubSiteAdapter(HTTPAdapter):
+    """Transport adapter sending https://<host>/<path> to the fake site as /<host>/<path>."""
+
+    def __init__(self, stub_url: str, **kwargs):
+        self.stub_url = stub_url
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.stub_url}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else '')
+        return super().send(request, **kwargs)
+
+
+class StageTimer:
+    """Collects per-call durations for each pipeline stage."""
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self.failures: Dict[str, int] = defaultdict(int)
+
+    def wrap(self, stage: str, function, failed=lambda result: result is None):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            self.durations[stage].append(time.perf_counter() - start)
+            if failed(result):
+                self.failures[stage] += 1
+            return result
+        return timed
+
+    def summary(self) -> Dict[str, Dict]:
+        return {
+            stage: {
+                'calls': len(self.durations[stage]),
+                'failures': self.failures[stage],
+                'p50_ms': percentile(self.durations[stage], 50),
+                'p95_ms': percentile(self.durations[stage], 95),
+                'p99_ms': percentile(self.durations[stage], 99),
+            }
+            for stage in STAGES if self.durations[stage]
+        }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile in milliseconds."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return round(ordered[index] * 1000, 2)
+
+
+def start_stubs(args) -> (multiprocessing.Process, Dict[str, int]):
+    """Start the stub servers in a child process and wait for their ports."""
+    settings = {
+        service: {
+            'latency_ms': getattr(args, f'{service}_latency_ms'),
+            'jitter_ms': getattr(args, f'{service}_jitter_ms'),
+            'error_rate': getattr(args, f'{service}_error_rate'),
+        }
+        for service in ('site', 'translator', 'appwrite')
+    }
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=stub_servers.serve, kwargs={'ready_queue': queue, **settings}, daemon=True)
+    process.start()
+    return process, queue.get(timeout=30)
+
+
+def configure_environment(ports: Dict[str, int]):
+    """Point the crawler's clients at the stubs (before backend modules are imported)."""
+    os.environ.update({
+        'TRANSLATION_SERVICE': 'libre',
+        'LIBRETRANSLATE_URL': f"http://127.0.0.1:{ports['translator']}",
+        'APPWRITE_ENDPOINT': f"http://127.0.0.1:{ports['appwrite']}/v1",
+        'APPWRITE_PROJECT_ID': 'benchmark',
+        'APPWRITE_API_KEY': 'benchmark',
+        'FETCH_BACKEND': 'live',
+        'FETCH_DELAY_MIN_SECONDS': '0',
+        'FETCH_DELAY_MAX_SECONDS': '0',
+        'USE_ZYTE': 'false',
+    })
+
+
+def run_benchmark(args, ports: Dict[str, int]) -> Dict:
+    from config.sources import load_sources
+    from services.appwrite_manager import AppwriteManager
+    from services.article_processor import ArticleProcessor
+    from utils.http import HTTP_POOL_SIZE, get_session
+    from utils.output_writer import JsonlWriter
+
+    session = get_session()
+    adapter = StubSiteAdapter(f"http://127.0.0.1:{ports['site']}",
+                              pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    for host in stub_servers.SITES:
+        session.mount(f'https://{host}/', adapter)
+
+    # Homepage link discovery only; the fake site does not serve feeds
+    sources = [{**source, 'link_source': 'homepage'} for source in load_sources()]
+    appwrite_manager = None if args.no_save else AppwriteManager()
+    processor = ArticleProcessor(appwrite_manager=appwrite_manager, sources=sources)
+
+    timer = StageTimer()
+    for scraper in filter(None, map(processor.get_scraper, list(processor.sources))):
+        scraper.fetch_page = timer.wrap('fetch', scraper.fetch_page)
+        scraper.extract_article_content = timer.wrap('parse', scraper.extract_article_content)
+    processor.translate_article = timer.wrap(
+        'translate', processor.translate_article, failed=lambda article: article.title_am is None
+    )
+    processor.save_article = timer.wrap('save', processor.save_article, failed=lambda saved: not saved)
+
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as output_dir, JsonlWriter(directory=output_dir) as sink, quiet:
+        for _ in range(args.cycles):
+            processor.process_pipeline(
+                max_articles_per_source=args.articles_per_source,
+                translate=not args.no_translate,
+                save=not args.no_save,
+                sink=sink
+            )
+    elapsed = time.perf_counter() - start
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    cpu_seconds = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    return {
+        'articles': sink.count,
+        'seconds': round(elapsed, 3),
+        'articles_per_sec': round(sink.count / elapsed, 2) if elapsed else 0.0,
+        'cpu_seconds': round(cpu_seconds, 3),
+        'cpu_utilisation': round(cpu_seconds / elapsed, 3) if elapsed else 0.0,
+        # ru_maxrss is KiB on Linux
+        'peak_rss_mib': round(usage_after.ru_maxrss / 1024, 1),
+        'stages': timer.summary(),
+    }
+
+
+def print_results(results: Dict):
+    print(f"Articles:        {results['articles']} in {results['seconds']}s "
+          f"({results['articles_per_sec']} articles/sec)")
+    print(f"CPU:             {results['cpu_seconds']}s ({results['cpu_utilisation'] * 100:.0f}% of one core)")
+    print(f"Peak RSS:        {results['peak_rss_mib']} MiB")
+    print()
+    print(f"{'stage':<10} {'calls':>7} {'failed':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print('-' * 56)
+    for stage, stats in results['stages'].items():
+        print(f"{stage:<10} {stats['calls']:>7} {stats['failures']:>7} "
+              f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end pipeline benchmark against local stubs')
+    parser.add_argument('--cycles', type=int, default=3, help='process_pipeline runs (fresh links each run)')
+    parser.add_argument('--articles-per-source', type=int, default=10)
+    parser.add_argument('--no-translate', action='store_true')
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--verbose', action='store_true', help='Show pipeline output')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    for service, latency in (('site', 50), ('translator', 100), ('appwrite', 20)):
+        parser.add_argument(f'--{service}-latency-ms', type=float, default=latency)
+        parser.add_argument(f'--{service}-jitter-ms', type=float, default=latency / 2)
+        parser.add_argument(f'--{service}-error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    process, ports = start_stubs(args)
+    try:
+        configure_environment(ports)
+        results = run_benchmark(args, ports)
+    finally:
+        process.terminate()
+        process.join()
+
+    print_results(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
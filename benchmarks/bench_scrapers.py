@@ -0,0 +1,251 @@
+"""
+Offline Scraper Benchmark
+
+Parses the recorded homepage and article snapshots in tests/fixtures/html
+with each scraper and reports pages/sec, per-field extraction time and
+peak memory. Exits non-zero when a result regresses past
+benchmarks/thresholds.json.
+
+Usage:
+    python benchmarks/bench_scrapers.py                  # Benchmark and check thresholds
+    python benchmarks/bench_scrapers.py --iterations 50  # Longer run for steadier numbers
+    python benchmarks/bench_scrapers.py --json out.json  # Also write results as JSON
+    python benchmarks/bench_scrapers.py --record         # Refresh fixtures from the live sites
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from inspect import getsourcelines
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = ROOT / 'tests' / 'fixtures' / 'html'
+THRESHOLDS_FILE = Path(__file__).resolve().parent / 'thresholds.json'
+
+# Add backend directory to path
+sys.path.insert(0, str(ROOT / 'backend'))
+
+from scrapers.arstechnica import ArsTechnicaScraper
+from scrapers.techcrunch import TechCrunchScraper
+from scrapers.theverge import TheVergeScraper
+from scrapers.wired import WiredScraper
+
+SCRAPERS = {
+    'techcrunch': (TechCrunchScraper, 'https://techcrunch.com/'),
+    'theverge': (TheVergeScraper, 'https://www.theverge.com/'),
+    'arstechnica': (ArsTechnicaScraper, 'https://arstechnica.com/'),
+    'wired': (WiredScraper, 'https://www.wired.com/'),
+}
+
+# Scrapers mark each field with an "# Extract <field>" comment
+FIELD_COMMENT = re.compile(r'#\s*Extract\s+(.+?)\s*$')
+
+
+def load_fixture(site: str, page: str) -> str:
+    return (FIXTURES_DIR / site / f'{page}.html').read_text(encoding='utf-8')
+
+
+def field_blocks(function) -> Dict[int, str]:
+    """
+    Map each source line of a function to the field it extracts.
+
+    Lines before the first "# Extract ..." comment are attributed to
+    'parse' (building the soup); later lines belong to the most recent
+    comment until the return statement, which is attributed to 'build'.
+    """
+    lines, start = getsourcelines(function)
+    blocks = {}
+    field = 'parse'
+    for offset, line in enumerate(lines):
+        match = FIELD_COMMENT.search(line)
+        if match:
+            field = match.group(1).lower()
+        elif line.strip().startswith('return ') and field != 'parse':
+            field = 'build'
+        blocks[start + offset] = field
+    return blocks
+
+
+def time_fields(scraper, html: str, iterations: int) -> Dict[str, float]:
+    """
+    Attribute extract_article_content time to its field blocks.
+
+    Runs under a line tracer, so absolute numbers are inflated; the split
+    between fields is what this measures.
+
+    Returns:
+        Mean milliseconds per call for each field
+    """
+    function = type(scraper).extract_article_content
+    code = function.__code__
+    blocks = field_blocks(function)
+    totals = defaultdict(float)
+    state = {'field': 'parse', 'since': 0.0}
+
+    def tracer(frame, event, arg):
+        if frame.f_code is not code:
+            return None
+
+        def trace_lines(frame, event, arg):
+            now = time.perf_counter()
+            totals[state['field']] += now - state['since']
+            if event == 'line':
+                state['field'] = blocks.get(frame.f_lineno, state['field'])
+            state['since'] = time.perf_counter()
+            return trace_lines
+
+        state['field'] = 'parse'
+        state['since'] = time.perf_counter()
+        return trace_lines
+
+    sys.settrace(tracer)
+    try:
+        for _ in range(iterations):
+            scraper.extract_article_content(scraper.base_url, html)
+    finally:
+        sys.settrace(None)
+
+    return {field: round(seconds * 1000 / iterations, 3) for field, seconds in totals.items()}
+
+
+def measure(function, iterations: int) -> Dict[str, float]:
+    """Time a callable and record its peak traced memory."""
+    function()  # Warm up
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'pages_per_sec': round(iterations / elapsed, 1),
+        'ms_per_page': round(elapsed * 1000 / iterations, 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def benchmark_site(site: str, iterations: int) -> Dict:
+    """Benchmark link and content extraction for one scraper."""
+    scraper_class, base_url = SCRAPERS[site]
+    scraper = scraper_class({'name': site, 'url': base_url})
+    homepage = load_fixture(site, 'homepage')
+    article = load_fixture(site, 'article')
+
+    return {
+        'extract_article_links': measure(lambda: scraper.extract_article_links(homepage), iterations),
+        'extract_article_content': measure(lambda: scraper.extract_article_content(base_url, article), iterations),
+        'fields_ms': time_fields(scraper, article, max(1, iterations // 5)),
+    }
+
+
+def check_thresholds(results: Dict, thresholds: Dict) -> List[str]:
+    """
+    Compare results with the regression thresholds.
+
+    thresholds.json maps site -> method -> {min_pages_per_sec, max_peak_kib};
+    a "default" entry applies to sites without their own.
+
+    Returns:
+        List of human-readable regressions (empty when all pass)
+    """
+    failures = []
+    for site, site_results in results.items():
+        limits = thresholds.get(site, thresholds.get('default', {}))
+        for method in ('extract_article_links', 'extract_article_content'):
+            result = site_results[method]
+            limit = limits.get(method, {})
+            if result['pages_per_sec'] < limit.get('min_pages_per_sec', 0):
+                failures.append(
+                    f"{site}.{method}: {result['pages_per_sec']} pages/sec "
+                    f"< {limit['min_pages_per_sec']}"
+                )
+            if result['peak_kib'] > limit.get('max_peak_kib', float('inf')):
+                failures.append(f"{site}.{method}: peak {result['peak_kib']} KiB > {limit['max_peak_kib']}")
+    return failures
+
+
+def print_results(results: Dict):
+    print(f"{'scraper':<12} {'method':<24} {'pages/sec':>10} {'ms/page':>9} {'peak KiB':>10}")
+    print('-' * 69)
+    for site, site_results in results.items():
+        for method in ('extract_article_links', 'extract_article_content'):
+            result = site_results[method]
+            print(f"{site:<12} {method:<24} {result['pages_per_sec']:>10} "
+                  f"{result['ms_per_page']:>9} {result['peak_kib']:>10}")
+
+    print("\nPer-field extract_article_content time (ms/page, under line tracing):")
+    for site, site_results in results.items():
+        fields = sorted(site_results['fields_ms'].items(), key=lambda item: -item[1])
+        print(f"  {site:<12} " + ', '.join(f"{field} {ms}" for field, ms in fields))
+
+
+def record_fixtures(sites: List[str]):
+    """Fetch fresh homepage and article snapshots from the live sites."""
+    for site in sites:
+        scraper_class, base_url = SCRAPERS[site]
+        scraper = scraper_class({'name': site, 'url': base_url})
+
+        homepage = scraper.fetch_page(base_url)
+        if not homepage:
+            print(f"✗ {site}: could not fetch homepage")
+            continue
+        links = scraper.extract_article_links(homepage)
+        article = scraper.fetch_page(links[0]) if links else None
+        if not article:
+            print(f"✗ {site}: could not fetch an article page")
+            continue
+
+        site_dir = FIXTURES_DIR / site
+        site_dir.mkdir(parents=True, exist_ok=True)
+        (site_dir / 'homepage.html').write_text(homepage, encoding='utf-8')
+        (site_dir / 'article.html').write_text(article, encoding='utf-8')
+        print(f"✓ {site}: recorded {base_url} and {links[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline scraper benchmark')
+    parser.add_argument('--iterations', type=int, default=20, help='Parses per page and method')
+    parser.add_argument('--sites', nargs='+', choices=sorted(SCRAPERS), default=list(SCRAPERS))
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--no-check', action='store_true', help='Report only, do not enforce thresholds')
+    parser.add_argument('--record', action='store_true', help='Refresh fixtures from the live sites and exit')
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.sites)
+        return 0
+
+    results = {site: benchmark_site(site, args.iterations) for site in args.sites}
+    print_results(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    if args.no_check:
+        return 0
+
+    thresholds = json.loads(THRESHOLDS_FILE.read_text(encoding='utf-8'))
+    failures = check_thresholds(results, thresholds)
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        return 1
+
+    print("\n✓ All scrapers within thresholds")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Text Cleaner Benchmark
+
+Times utils/text_cleaner.py on the paragraphs of the recorded article
+snapshots in tests/fixtures/html: clean_text() per paragraph,
+clean_batch() per article and remove_html_tags() per paragraph, each
+next to the implementation it replaced. Exits non-zero when a new
+function is slower than the one it replaced, or its output differs.
+
+Usage:
+    python benchmarks/bench_text_cleaner.py                # Benchmark and check
+    python benchmarks/bench_text_cleaner.py --repeat 200   # Longer run for steadier numbers
+    python benchmarks/bench_text_cleaner.py --json out.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = ROOT / 'tests' / 'fixtures' / 'html'
+
+# Add backend directory to path
+sys.path.insert(0, str(ROOT / 'backend'))
+
+from utils.text_cleaner import clean_batch, clean_text, remove_html_tags
+
+PARAGRAPH = re.compile(r'<p[\s>].*?</p>', re.S)
+
+
+def legacy_clean_text(text: str) -> str:
+    """clean_text as it was: two regex substitutions, compiled through the re cache."""
+    if not text:
+        return ''
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+    return re.sub(r'[^\w\s\.,!?;:\-ሀ-፿]', '', text)
+
+
+def legacy_remove_html_tags(text: str) -> str:
+    """remove_html_tags as it was: a non-greedy <.*?> scan."""
+    clean = re.compile('<.*?>')
+    return re.sub(clean, '', text)
+
+
+def load_articles() -> Dict[str, List[str]]:
+    """<p> elements (raw HTML) of every article fixture."""
+    return {
+        site.name: PARAGRAPH.findall((site / 'article.html').read_text(encoding='utf-8'))
+        for site in sorted(FIXTURES_DIR.iterdir()) if (site / 'article.html').exists()
+    }
+
+
+def per_second(function: Callable[[], object], items: int, repeat: int) -> float:
+    """Items processed per second, best of three timed runs."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return items * repeat / best
+
+
+def benchmark(articles: Dict[str, List[str]], repeat: int) -> Dict:
+    fragments = [fragment for paragraphs in articles.values() for fragment in paragraphs]
+    # Scrapers hand the cleaner paragraph text, with markup already stripped
+    texts = [[remove_html_tags(fragment) for fragment in paragraphs] for paragraphs in articles.values()]
+    paragraphs = [text for article in texts for text in article]
+    # Repeat the fixtures so batches are the size of a long article
+    batches = [article * 5 for article in texts]
+
+    results = {
+        'clean_text': {
+            'legacy': per_second(lambda: [legacy_clean_text(text) for text in paragraphs], len(paragraphs), repeat),
+            'new': per_second(lambda: [clean_text(text) for text in paragraphs], len(paragraphs), repeat),
+        },
+        'clean_batch': {
+            'legacy': per_second(lambda: [[legacy_clean_text(text) for text in batch] for batch in batches],
+                                 sum(map(len, batches)), repeat),
+            'new': per_second(lambda: [clean_batch(batch) for batch in batches], sum(map(len, batches)), repeat),
+        },
+        'remove_html_tags': {
+            'legacy': per_second(lambda: [legacy_remove_html_tags(text) for text in fragments], len(fragments), repeat),
+            'new': per_second(lambda: [remove_html_tags(text) for text in fragments], len(fragments), repeat),
+        },
+    }
+    for result in results.values():
+        result['speedup'] = round(result['new'] / result['legacy'], 2)
+        result['legacy'] = round(result['legacy'])
+        result['new'] = round(result['new'])
+
+    results['paragraphs'] = len(paragraphs)
+    results['matches_legacy'] = (
+        [legacy_clean_text(text) for text in paragraphs] == [clean_text(text) for text in paragraphs]
+        and all([legacy_clean_text(text) for text in batch] == clean_batch(batch) for batch in batches)
+    )
+    return results
+
+
+def print_results(results: Dict):
+    print(f"{results['paragraphs']} paragraphs from the article fixtures\n")
+    print(f"{'function':<18} {'legacy/s':>12} {'new/s':>12} {'speedup':>8}")
+    print('-' * 53)
+    for name in ('clean_text', 'clean_batch', 'remove_html_tags'):
+        result = results[name]
+        print(f"{name:<18} {result['legacy']:>12,} {result['new']:>12,} {result['speedup']:>7}x")
+    print("\n(remove_html_tags now matches whole tags, decodes entities and drops script/style")
+    print(" contents, so it is slower than the old <.*?> scan, which got those wrong)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Text cleaner benchmark')
+    parser.add_argument('--repeat', type=int, default=50, help='Passes over the fixtures per timed run')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--no-check', action='store_true', help='Report only, do not check for regressions')
+    args = parser.parse_args()
+
+    results = benchmark(load_articles(), args.repeat)
+    print_results(results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    if args.no_check:
+        return 0
+
+    failures = [f"{name} is slower than before ({results[name]['speedup']}x)"
+                for name in ('clean_text', 'clean_batch') if results[name]['speedup'] < 1]
+    if not results['matches_legacy']:
+        failures.append("clean_text/clean_batch output differs from the legacy implementation")
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        return 1
+
+    print("\n✓ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""
+Local Stub Servers
+
+Three in-memory HTTP services for load-testing the crawler without any
+external dependency:
+
+- fake news site: serves the tests/fixtures/html homepage and article
+  snapshots under /<host>/<path>, with unique article links on every
+  homepage request and a unique marker in every article
+- fake translator: a LibreTranslate-compatible POST /translate
+- fake Appwrite: the /v1 database document and storage file endpoints
+  used by AppwriteManager, backed by a dict
+
+Each service has its own latency, jitter and error rate.
+
+Usage:
+    python benchmarks/stub_servers.py --site-port 8701 --translator-port 8702 --appwrite-port 8703
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / 'tests' / 'fixtures' / 'html'
+
+# Hosts served by the fake site, mapped to their fixture directory
+SITES = {
+    'techcrunch.com': 'techcrunch',
+    'www.theverge.com': 'theverge',
+    'arstechnica.com': 'arstechnica',
+    'www.wired.com': 'wired',
+}
+
+HREF = re.compile(r'href="([^"#?]+)"')
+PARAGRAPH = re.compile(r'<p>')
+HEADING = re.compile(r'(<h1[^>]*>)')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Base handler adding latency, jitter and injected errors."""
+
+    protocol_version = 'HTTP/1.1'
+    latency_ms = 0.0
+    jitter_ms = 0.0
+    error_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if random.random() < self.error_rate:
+            self.send_json(503, {'message': 'Injected failure', 'code': 503, 'type': 'general_server_error'})
+            return
+
+        self.handle_request(method, body)
+
+    def handle_request(self, method: str, body: bytes):
+        raise NotImplementedError
+
+    def send_body(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status: int, data):
+        self.send_body(status, json.dumps(data).encode('utf-8'), 'application/json')
+
+
+class FakeSiteHandler(StubHandler):
+    """
+    Serves /<host>/ as that site's homepage and any other /<host>/<path>
+    as an article page.
+    """
+
+    pages: Dict[str, Dict[str, str]] = {}
+    counter = itertools.count()
+
+    def handle_request(self, method: str, body: bytes):
+        host, _, path = urlsplit(self.path).path.lstrip('/').partition('/')
+        site = SITES.get(host)
+        if method != 'GET' or site is None:
+            self.send_body(404, b'Not found', 'text/plain')
+            return
+
+        if path in ('', '/'):
+            # Fresh links on every request so repeated crawls never hit the frontier
+            batch = next(self.counter)
+            html = HREF.sub(lambda m: f'href="{m.group(1)}?v={batch}"', self.pages[site]['homepage'])
+        else:
+            # Unique text per article so the translation cache does not hide translator cost
+            marker = f'{next(self.counter)}'
+            html = HEADING.sub(rf'\g<1>{marker} ', self.pages[site]['article'], count=1)
+            html = PARAGRAPH.sub(f'<p>{marker} ', html)
+
+        self.send_body(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+
+
+class FakeTranslatorHandler(StubHandler):
+    """LibreTranslate-compatible /translate endpoint returning Ethiopic-script text."""
+
+    def handle_request(self, method: str, body: bytes):
+        if method == 'GET' and urlsplit(self.path).path == '/languages':
+            self.send_json(200, [{'code': 'en', 'name': 'English'}, {'code': 'am', 'name': 'Amharic'}])
+            return
+        if method != 'POST' or urlsplit(self.path).path != '/translate':
+            self.send_json(404, {'error': 'Not found'})
+            return
+
+        text = json.loads(body or b'{}').get('q', '')
+        translated = ''.join(chr(0x1200 + ord(c) % 0x80) if c.isalpha() else c for c in text)
+        self.send_json(200, {'translatedText': translated})
+
+
+class FakeAppwriteHandler(StubHandler):
+    """In-memory subset of the Appwrite REST API (documents and storage files)."""
+
+    documents: Dict[str, Dict[str, Dict]] = {}
+    files: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    DOCUMENTS = re.compile(r'^/v1/databases/([^/]+)/collections/([^/]+)/documents(?:/([^/]+))?$')
+    FILES = re.compile(r'^/v1/storage/buckets/([^/]+)/files(?:/([^/]+))?$')
+
+    def handle_request(self, method: str, body: bytes):
+        parts = urlsplit(self.path)
+
+        match = self.DOCUMENTS.match(parts.path)
+        if match:
+            _, collection, document_id = match.groups()
+            self.handle_documents(method, collection, document_id, body, parse_qs(parts.query))
+            return
+
+        match = self.FILES.match(parts.path)
+        if match and method == 'POST':
+            self.handle_upload(match.group(1), body)
+            return
+
+        self.send_json(404, {'message': 'Route not found', 'code': 404, 'type': 'general_route_not_found'})
+
+    def handle_documents(self, method: str, collection: str, document_id: Optional[str], body: bytes, query: Dict):
+        with self.lock:
+            store = self.documents.setdefault(collection, {})
+
+            if method == 'POST' and document_id is None:
+                request = json.loads(body or b'{}')
+                document_id = request.get('documentId') or 'unique()'
+                if document_id == 'unique()':
+                    document_id = uuid.uuid4().hex[:20]
+                if document_id in store:
+                    self.send_json(409, {'message': 'Document with the requested ID already exists.',
+                                         'code': 409, 'type': 'document_already_exists'})
+                    return
+                now = datetime.now(timezone.utc).isoformat()
+                store[document_id] = {**request.get('data', {}), '$id': document_id, '$collectionId': collection,
+                                      '$createdAt': now, '$updatedAt': now}
+                self.send_json(201, store[document_id])
+
+            elif method == 'GET' and document_id is None:
+                documents = list(store.values())
+                limit, offset, selected = 25, 0, None
+                # The SDK sends queries[0]=..., queries[1]=...
+                queries = [value for key, values in sorted(query.items()) if key.startswith('queries[')
+                           for value in values]
+                for value in queries:
+                    match = re.match(r'(limit|offset)\((\d+)\)', value)
+                    if match and match.group(1) == 'limit':
+                        limit = int(match.group(2))
+                    elif match:
+                        offset = int(match.group(2))
+                    elif value.startswith('cursorAfter('):
+                        cursor = json.loads(value[len('cursorAfter('):-1])
+                        if cursor not in store:
+                            self.send_json(400, {'message': f'Document \'{cursor}\' for the \'cursor\' value not found.',
+                                                 'code': 400, 'type': 'general_cursor_not_found'})
+                            return
+                        offset = list(store).index(cursor) + 1
+                    elif value.startswith('select('):
+                        selected = json.loads(value[len('select('):-1])
+                page = documents[offset:offset + limit]
+                if selected is not None:
+                    page = [{key: value for key, value in document.items() if key in selected or key.startswith('$')}
+                            for document in page]
+                self.send_json(200, {'total': len(documents), 'documents': page})
+
+            elif document_id not in store:
+                self.send_json(404, {'message': 'Document with the requested ID could not be found.',
+                                     'code': 404, 'type': 'document_not_found'})
+
+            elif method == 'GET':
+                self.send_json(200, store[document_id])
+
+            elif method == 'PATCH':
+                store[document_id].update(json.loads(body or b'{}').get('data', {}))
+                store[document_id]['$updatedAt'] = datetime.now(timezone.utc).isoformat()
+                self.send_json(200, store[document_id])
+
+            elif method == 'DELETE':
+                del store[document_id]
+                self.send_body(204, b'', 'text/plain')
+
+            else:
+                self.send_json(405, {'message': 'Method not allowed', 'code': 405, 'type': 'general_not_allowed'})
+
+    def handle_upload(self, bucket: str, body: bytes):
+        file_id = self.headers.get('x-appwrite-id') or uuid.uuid4().hex[:20]
+        with self.lock:
+            self.files[file_id] = self.files.get(file_id, 0) + len(body)
+        self.send_json(201, {'$id': file_id, 'bucketId': bucket, 'sizeOriginal': self.files[file_id],
+                             'chunksTotal': 1, 'chunksUploaded': 1})
+
+
+def load_pages() -> Dict[str, Dict[str, str]]:
+    """Read the homepage and article fixtures for every fake site."""
+    return {
+        site: {page: (FIXTURES_DIR / site / f'{page}.html').read_text(encoding='utf-8')
+               for page in ('homepage', 'article')}
+        for site in SITES.values()
+    }
+
+
+def make_handler(base, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0, **attributes):
+    """Create a handler subclass with its own latency and error settings."""
+    return type(base.__name__, (base,), {
+        'latency_ms': latency_ms,
+        'jitter_ms': jitter_ms,
+        'error_rate': error_rate,
+        **attributes,
+    })
+
+
+def start_servers(site_port: int = 0, translator_port: int = 0, appwrite_port: int = 0,
+                  site: Optional[Dict] = None, translator: Optional[Dict] = None,
+                  appwrite: Optional[Dict] = None) -> Dict[str, ThreadingHTTPServer]:
+    """
+    Start the three stub servers on background threads.
+
+    Args:
+        site_port, translator_port, appwrite_port: Ports to bind (0 picks a free port)
+        site, translator, appwrite: Keyword settings per service
+            (latency_ms, jitter_ms, error_rate)
+
+    Returns:
+        Dict of service name to running server; server.server_port is the bound port
+    """
+    handlers = {
+        'site': (site_port, make_handler(FakeSiteHandler, pages=load_pages(), **(site or {}))),
+        'translator': (translator_port, make_handler(FakeTranslatorHandler, **(translator or {}))),
+        'appwrite': (appwrite_port, make_handler(FakeAppwriteHandler, documents={}, files={},
+                                                 lock=threading.Lock(), **(appwrite or {}))),
+    }
+
+    servers = {}
+    for name, (port, handler) in handlers.items():
+        server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f'stub-{name}', daemon=True).start()
+        servers[name] = server
+    return servers
+
+
+def serve(ready_queue=None, **kwargs):
+    """
+    Run the stub servers until the process is terminated.
+
+    Args:
+        ready_queue: Optional multiprocessing queue that receives {name: port} once listening
+        **kwargs: Passed to start_servers
+    """
+    servers = start_servers(**kwargs)
+    ports = {name: server.server_port for name, server in servers.items()}
+    if ready_queue is not None:
+        ready_queue.put(ports)
+    else:
+        for name, port in ports.items():
+            print(f"{name:<11} http://127.0.0.1:{port}")
+    threading.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stub servers for crawler load tests')
+    parser.add_argument('--site-port', type=int, default=8701)
+    parser.add_argument('--translator-port', type=int, default=8702)
+    parser.add_argument('--appwrite-port', type=int, default=8703)
+    for service in ('site', 'translator', 'appwrite'):
+        parser.add_argument(f'--{service}-latency-ms', type=float, default=0)
+        parser.add_argument(f'--{service}-jitter-ms', type=float, default=0)
+        parser.add_argument(f'--{service}-error-rate', type=float, default=0)
+    args = parser.parse_args()
+
+    settings = {
+        service: {
+            'latency_ms': getattr(args, f'{service}_latency_ms'),
+            'jitter_ms': getattr(args, f'{service}_jitter_ms'),
+            'error_rate': getattr(args, f'{service}_error_rate'),
+        }
+        for service in ('site', 'translator', 'appwrite')
+    }
+    try:
+        serve(site_port=args.site_port, translator_port=args.translator_port,
+              appwrite_port=args.appwrite_port, **settings)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
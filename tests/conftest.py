@@ -0,0 +1,9 @@
+"""
+Pytest configuration
+"""
+
+import sys
+from pathlib import Path
+
+# Backend modules import each other as top-level packages (scrapers, services, ...)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
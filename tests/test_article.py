@@ -0,0 +1,39 @@
+"""
+Tests for the Article Record
+"""
+
+from models.article import Article
+
+
+def test_from_dict_accepts_legacy_keys():
+    """Test that source_url/featured_image map onto url/image_url."""
+    article = Article.from_dict({
+        'title': 'Title',
+        'source_url': 'https://example.com/a',
+        'featured_image': 'https://example.com/a.jpg',
+        '$id': 'ignored',
+    })
+    assert article.url == 'https://example.com/a'
+    assert article.image_url == 'https://example.com/a.jpg'
+    assert article.get('source_url') == article.url
+    assert not hasattr(article, '__dict__')
+
+
+def test_to_appwrite_matches_schema():
+    """Test serialization to the articles collection schema."""
+    article = Article(title='T', content='x' * 600, url='u', source='Wired')
+    document = article.to_appwrite()
+    assert set(document) == {
+        'title', 'title_am', 'url', 'summary', 'summary_am',
+        'source', 'image_url', 'published_date', 'category',
+    }
+    assert len(document['summary']) == Article.SUMMARY_LENGTH
+    assert Article.from_dict(article.to_dict()) == article
+
+
+def test_source_and_category_are_interned():
+    """Test that repeated strings share one object."""
+    a = Article(source=''.join(['The ', 'Verge']))
+    b = Article(source=''.join(['The ', 'Verge']))
+    assert a.source is b.source
+    assert a.category is b.category
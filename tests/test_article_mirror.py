@@ -0,0 +1,199 @@
+"""
+Tests for the local articles mirror
+"""
+
+from datetime import datetime, timezone
+
+from models.article import Article
+from services.article_mirror import ArticleMirror, document_hash
+from services.article_processor import ArticleProcessor
+from services.checkpoint import SAVED, CheckpointStore
+from utils.text_cleaner import canonical_url
+
+
+def make_document(document_id, url, title='Title', summary='Summary', updated_at='2024-09-10T10:00:00.000+00:00'):
+    return {'$id': document_id, 'url': url, 'title': title, 'summary': summary, '$updatedAt': updated_at}
+
+
+class FakeManager:
+    """Stands in for AppwriteManager.iter_articles, filtering like Appwrite would."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.queries = []
+
+    def iter_articles(self, page_size=100, fields=None, queries=None, prefetch=True):
+        self.queries.append(queries)
+        since = next((q.split('"')[3] for q in queries or [] if q.startswith('greaterThanEqual')), None)
+        for document in sorted(self.documents, key=lambda d: d['$updatedAt']):
+            if since is None or document['$updatedAt'] >= since:
+                yield document
+
+
+def test_canonical_url():
+    """Test that URL variants of one article compare equal."""
+    assert canonical_url('http://www.Example.com/story/?utm_source=rss#comments') == 'https://example.com/story'
+    assert canonical_url('https://example.com/story?b=2&a=1') == 'https://example.com/story?a=1&b=2'
+    assert canonical_url('') == ''
+
+
+def test_lookups_by_url_hash_and_id(tmp_path):
+    """Test local lookups by ID, canonical URL and content hash."""
+    mirror = ArticleMirror(str(tmp_path / 'mirror.db'))
+    mirror.upsert(make_document('a1', 'https://techcrunch.com/story/', title='Chips  are back'))
+
+    assert mirror.get('a1')['title'] == 'Chips  are back'
+    assert mirror.contains_url('http://www.techcrunch.com/story?utm_medium=feed')
+    assert not mirror.contains_url('https://techcrunch.com/other')
+
+    # Same story republished under another URL
+    article = Article(title='chips are back', summary='Summary', url='https://example.com/mirror')
+    assert mirror.find(article)['$id'] == 'a1'
+    assert document_hash(article) == document_hash(mirror.get('a1'))
+
+    mirror.remove('a1')
+    assert mirror.get('a1') is None and mirror.count() == 0
+
+
+def test_incremental_sync(tmp_path):
+    """Test that sync only asks for documents updated since the last sync."""
+    mirror = ArticleMirror(str(tmp_path / 'mirror.db'))
+    manager = FakeManager([make_document('a1', 'https://example.com/1'),
+                           make_document('a2', 'https://example.com/2', updated_at='2024-09-11T10:00:00.000+00:00')])
+
+    assert mirror.sync(manager) == 2
+    assert mirror.last_synced_at() == '2024-09-11T10:00:00.000+00:00'
+
+    manager.documents.append(make_document('a3', 'https://example.com/3', updated_at='2024-09-12T10:00:00.000+00:00'))
+    assert mirror.sync(manager) == 2  # a2 (boundary) and a3
+    assert any('2024-09-11T10:00:00.000+00:00' in query for query in manager.queries[-1])
+    assert mirror.count() == 3
+
+    manager.documents = manager.documents[1:]
+    assert mirror.sync(manager, full=True) == 2
+    assert mirror.get('a1') is None
+
+
+def test_processor_skips_saved_articles(tmp_path):
+    """Test that mirrored articles are not refetched, saved again or rewritten unchanged."""
+    mirror = ArticleMirror(str(tmp_path / 'mirror.db'))
+    saved = Article(title='Old', summary='Summary', url='https://example.com/saved')
+    mirror.upsert({**saved.to_appwrite(), '$id': 'a1'})
+
+    class Manager:
+        def __init__(self):
+            self.mirror = mirror
+            self.saved = []
+            self.updates = []
+
+        def save_article(self, article):
+            self.saved.append(article)
+            return {'$id': 'new'}
+
+        def update_article(self, document_id, data):
+            self.updates.append((document_id, data))
+            return True
+
+    manager = Manager()
+    processor = ArticleProcessor(appwrite_manager=manager, sources=[])
+    assert 'https://www.example.com/saved/' in processor.known_urls
+    assert 'https://example.com/new' not in processor.known_urls
+
+    assert processor.save_article(Article(title='Old', summary='Summary', url='https://example.com/saved'))
+    assert processor.save_article(Article(title='Old', summary='Summary', url='https://example.com/copy'))
+    assert processor.save_article(Article(title='New', url='https://example.com/new', summary='Other'))
+    assert [article.title for article in manager.saved] == ['New']
+    assert manager.updates == []
+
+
+def test_changed_article_is_patched(tmp_path):
+    """Test that a new version of a saved article is written as a partial update."""
+    mirror = ArticleMirror(str(tmp_path / 'mirror.db'))
+    saved = Article(title='Chips', title_am='ቺፕስ', summary='Summary', summary_am='ማጠቃለያ',
+                    url='https://example.com/chips')
+    mirror.upsert({**saved.to_appwrite(), '$id': 'a1'})
+    mirror.put_translation('a1', {'title': 'Chips', 'title_am': 'ቺፕስ'})
+
+    class Manager:
+        def __init__(self):
+            self.mirror = mirror
+            self.updates = []
+
+        def update_article(self, document_id, data):
+            self.updates.append((document_id, data))
+            return True
+
+    manager = Manager()
+    processor = ArticleProcessor(appwrite_manager=manager, sources=[])
+    assert processor._stored_version(saved)['title_am'] == 'ቺፕስ'
+
+    # Summary edited; its translation failed, so the stored one is kept
+    update = Article(title='Chips', title_am='ቺፕስ', summary='Summary, updated', url='https://example.com/chips',
+                     content='Body', content_am='ሰውነት')
+    assert processor.save_article(update)
+    assert manager.updates == [('a1', {'summary': 'Summary, updated'})]
+    assert mirror.get_translation('a1')['content_am'] == 'ሰውነት'
+
+
+def test_republished_article_is_scraped_and_patched(tmp_path, monkeypatch):
+    """Test that a saved article whose feed entry was updated goes through the pipeline as an update."""
+    from scrapers.base_scraper import BaseScraper
+
+    mirror = ArticleMirror(str(tmp_path / 'mirror.db'))
+    for document_id, url in (('a1', 'https://example.com/chips'), ('a2', 'https://example.com/same')):
+        saved = Article(title='Chips', title_am='ቺፕስ', summary='Summary', summary_am='ማጠቃለያ', url=url,
+                        source='Example')
+        mirror.upsert({**saved.to_appwrite(), '$id': document_id, '$updatedAt': '2024-09-10T10:00:00.000+00:00'})
+        mirror.put_translation(document_id, {'title': 'Chips', 'title_am': 'ቺፕስ',
+                                             'summary': 'Summary', 'summary_am': 'ማጠቃለያ'})
+    feed = ('<rss version="2.0"><channel>'
+            '<item><link>https://example.com/chips</link><pubDate>Tue, 10 Sep 2024 12:00:00 +0000</pubDate></item>'
+            '<item><link>https://example.com/same</link><pubDate>Tue, 10 Sep 2024 09:00:00 +0000</pubDate></item>'
+            '</channel></rss>')
+
+    class FeedScraper(BaseScraper):
+        def extract_article_links(self, html):
+            return []
+
+        def extract_article_content(self, url, html):
+            return Article(title='Chips are back', summary='Summary', url=url)
+
+    class Manager:
+        def __init__(self):
+            self.mirror = mirror
+            self.saved = []
+            self.updates = []
+
+        def save_article(self, article):
+            self.saved.append(article)
+            return {'$id': 'new'}
+
+        def update_article(self, document_id, data):
+            self.updates.append((document_id, data))
+            return True
+
+    # Both were checkpointed by an earlier run, after they were saved but before /chips was updated
+    checkpoint = CheckpointStore(str(tmp_path / 'checkpoint.db'))
+    for url in ('https://example.com/chips', 'https://example.com/same'):
+        checkpoint.mark(url, SAVED)
+    checkpoint._conn.execute('UPDATE checkpoints SET updated_at = ?',
+                             (datetime(2024, 9, 10, 10, 30, tzinfo=timezone.utc).timestamp(),))
+
+    manager = Manager()
+    processor = ArticleProcessor(appwrite_manager=manager, sources=[], checkpoint=checkpoint)
+    scraper = FeedScraper({'name': 'Example', 'url': 'https://example.com', 'link_source': 'feed',
+                           'feed_url': 'https://example.com/feed'})
+    monkeypatch.setattr(scraper, 'fetch_feed', lambda url: (feed.encode(), False))
+    monkeypatch.setattr(scraper, 'fetch_page', lambda url: '<html></html>')
+    processor.scrapers['example'] = scraper
+    monkeypatch.setattr(processor.translator, 'translate_text', lambda text: text.upper())
+
+    articles = list(processor.iter_pipeline(max_articles_per_source=5))
+    # Only the entry updated after it was saved is scraped again
+    assert [article.url for article in articles] == ['https://example.com/chips']
+    assert manager.saved == []
+    assert manager.updates == [('a1', {'title': 'Chips are back', 'title_am': 'CHIPS ARE BACK'})]
+
+    # Scraped in this process after the update, so not again (even without the feed cutoff)
+    scraper.feed_cutoff = None
+    assert list(processor.iter_pipeline(max_articles_per_source=5)) == []
@@ -0,0 +1,55 @@
+"""
+Tests for Pipeline Checkpoints
+"""
+
+from models.article import Article
+from scrapers.base_scraper import BaseScraper
+from services.article_processor import ArticleProcessor
+from services.checkpoint import CheckpointStore, PARSED, TRANSLATED
+
+
+class StaticScraper(BaseScraper):
+    """Scraper serving fixed pages instead of fetching."""
+
+    def discover_article_links(self):
+        return ['https://example.com/a', 'https://example.com/b']
+
+    def fetch_page(self, url, use_zyte=None):
+        return f'<h1>{url}</h1>'
+
+    def extract_article_links(self, html):
+        return []
+
+    def extract_article_content(self, url, html):
+        return Article(title=url, content='Body', url=url)
+
+
+def test_scraper_records_stages(tmp_path):
+    """Test that fetched and parsed stages are recorded per article."""
+    checkpoint = CheckpointStore(str(tmp_path / 'checkpoints.db'))
+    scraper = StaticScraper({'name': 'Static', 'url': 'https://example.com'})
+
+    articles = scraper.run(max_articles=2, checkpoint=checkpoint)
+    assert len(articles) == 2
+    assert checkpoint.get_stage('https://example.com/a') == PARSED
+    assert [entry['data']['title'] for entry in checkpoint.pending(PARSED)] == [
+        'https://example.com/a', 'https://example.com/b'
+    ]
+
+
+def test_processor_resumes_in_flight_articles(tmp_path):
+    """Test that a new run resumes fetched/parsed work and skips finished URLs."""
+    checkpoint = CheckpointStore(str(tmp_path / 'checkpoints.db'))
+    checkpoint.mark_fetched('https://example.com/a', '<h1>a</h1>', source='Static')
+    checkpoint.mark_parsed('https://example.com/b', {'title': 'b', 'source_url': 'https://example.com/b'}, source='Static')
+    checkpoint.mark('https://example.com/c', TRANSLATED, {'title': 'c', 'source_url': 'https://example.com/c'})
+
+    processor = ArticleProcessor(sources=[], checkpoint=checkpoint)
+    processor.scrapers['static'] = StaticScraper({'name': 'Static', 'url': 'https://example.com'})
+
+    resumed = processor.resume_checkpointed(translate=True, save=False)
+    assert sorted(article.url for article in resumed) == [
+        'https://example.com/a', 'https://example.com/b'
+    ]
+    assert checkpoint.get_stage('https://example.com/a') == PARSED
+    assert 'https://example.com/c' in processor.frontier
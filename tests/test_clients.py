@@ -0,0 +1,111 @@
+"""
+Tests for the shared, health-checked clients
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from services import clients
+from services.clients import SharedClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+
+class FakeClient:
+    def __init__(self):
+        self.healthy = True
+        self.closed = False
+
+
+def test_shared_client_is_created_once():
+    """Test that get() creates the instance lazily and reuses it."""
+    created = []
+    client = SharedClient('fake', lambda: created.append(FakeClient()) or created[-1])
+    assert not client.initialized
+    assert client.get() is client.get()
+    assert len(created) == 1
+
+
+def test_failed_health_check_reinitializes():
+    """Test that an unhealthy instance is closed and rebuilt."""
+    client = SharedClient('fake', FakeClient, health_check=lambda c: c.healthy,
+                          close=lambda c: setattr(c, 'closed', True), check_interval=3600)
+    first = client.get()
+    first.healthy = False
+    # Not due for a check yet
+    assert client.get() is first
+
+    client.mark_unhealthy()
+    second = client.get()
+    assert second is not first
+    assert first.closed
+
+
+def test_health_check_exception_counts_as_failure():
+    """Test that a raising health check also triggers a rebuild."""
+    def check(c):
+        raise ConnectionError('down')
+
+    client = SharedClient('fake', FakeClient, health_check=check, check_interval=0)
+    first = client.get()
+    assert client.get() is not first
+
+
+def test_factory_error_is_retried():
+    """Test that a failed creation is not cached."""
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ValueError('not configured')
+        return FakeClient()
+
+    client = SharedClient('fake', factory)
+    with pytest.raises(ValueError):
+        client.get()
+    assert isinstance(client.get(), FakeClient)
+
+
+def test_translation_cache_survives_translator_rebuild(monkeypatch):
+    """Test that translators share one cache across reinitialization."""
+    clients.reset_clients()
+    try:
+        translator = clients.get_translator('azure')
+        translator._cache.put('key', 'value')
+        clients._translators['azure'].reset()
+
+        rebuilt = clients.get_translator('azure')
+        assert rebuilt is not translator
+        assert rebuilt._cache is clients.get_translation_cache()
+        assert rebuilt._cache.get('key') == 'value'
+    finally:
+        clients.reset_clients()
+
+
+def test_appwrite_manager_health_check(monkeypatch):
+    """Test the shared AppwriteManager against the fake Appwrite server."""
+    import appwrite.client
+    import stub_servers
+    from services.appwrite_manager import _PooledRequests
+
+    running = stub_servers.start_servers()
+    monkeypatch.setenv('APPWRITE_ENDPOINT', f"http://127.0.0.1:{running['appwrite'].server_port}/v1")
+    monkeypatch.setenv('APPWRITE_PROJECT_ID', 'test')
+    monkeypatch.setenv('APPWRITE_API_KEY', 'test')
+    clients.reset_clients()
+    try:
+        manager = clients.get_appwrite_manager()
+        assert manager.check_health()
+        # SDK calls go through the shared session
+        assert isinstance(appwrite.client.requests, _PooledRequests)
+        assert clients.get_appwrite_manager() is manager
+
+        manager.client.set_endpoint('http://127.0.0.1:1/v1')
+        assert not manager.check_health()
+    finally:
+        clients.reset_clients()
+        for server in running.values():
+            server.shutdown()
@@ -0,0 +1,75 @@
+"""
+Tests for text-density main content extraction
+"""
+
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from scrapers.content_extractor import extract_main_content, find_main_content
+from scrapers.techcrunch import TechCrunchScraper
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'html'
+
+BODY = ' '.join(['The chip ships this fall, with more memory, a faster GPU and better battery life.'] * 3)
+
+PAGE = f"""<html><body class="has-sidebar">
+<nav><p>Home, News, Reviews, Features, Podcasts, Deals and more sections</p></nav>
+<div class="layout">
+  <div class="story-body">
+    <p>{BODY}</p>
+    <div class="share-tools"><p>Share this story on Twitter, Facebook or by email today</p></div>
+    <p>{BODY}</p>
+    <p><a href="/a">Read more about chips and the companies building them</a></p>
+  </div>
+  <div class="story-body">
+    <p>{BODY}</p>
+  </div>
+  <div class="sidebar"><p>Most popular, most shared, and most commented articles this week</p></div>
+</div>
+<footer><p>Copyright 2024, Example Media, all rights reserved worldwide</p></footer>
+</body></html>"""
+
+
+def test_extracts_body_without_boilerplate():
+    """Test that scoring finds the body blocks and drops widgets, link lists and chrome."""
+    soup = BeautifulSoup(PAGE, 'html.parser')
+
+    containers = find_main_content(soup)
+    assert [container['class'] for container in containers] == [['story-body'], ['story-body']]
+    # Split bodies are joined in document order
+    assert extract_main_content(soup).split('\n\n') == [BODY, BODY, BODY]
+
+
+def test_page_without_paragraphs():
+    """Test that a page with no qualifying paragraphs yields no body."""
+    soup = BeautifulSoup('<html><body><nav><p>Home, News and Reviews for everyone</p></nav></body></html>',
+                         'html.parser')
+    assert find_main_content(soup) == []
+    assert extract_main_content(soup) == ''
+
+
+@pytest.mark.parametrize('mode', ['fallback', 'density'])
+def test_fallback_and_density_modes(mode):
+    """Test that both modes recover the fixture body when the site selector no longer matches."""
+    html = (FIXTURES_DIR / 'techcrunch' / 'article.html').read_text(encoding='utf-8')
+    html = html.replace('class="article-content"', 'class="entry-body"').replace('<article', '<section').replace(
+        '</article>', '</section>')
+    scraper = TechCrunchScraper({'name': 'TechCrunch', 'url': 'https://techcrunch.com/', 'content_extraction': mode})
+
+    article = scraper.extract_article_content('https://techcrunch.com/story', html)
+    paragraphs = article.content.split('\n\n')
+    assert len(paragraphs) == 22
+    assert not any('Share this article' in p or 'Related' in p for p in paragraphs)
+
+
+def test_selectors_mode_keeps_every_paragraph():
+    """Test that 'selectors' keeps the previous behaviour of taking every <p> in the container."""
+    html = (FIXTURES_DIR / 'techcrunch' / 'article.html').read_text(encoding='utf-8')
+    scraper = TechCrunchScraper({'name': 'TechCrunch', 'url': 'https://techcrunch.com/',
+                                 'content_extraction': 'selectors'})
+
+    article = scraper.extract_article_content('https://techcrunch.com/story', html)
+    assert 'Share this article' in article.content
+    assert len(article.content.split('\n\n')) == 25
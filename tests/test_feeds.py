@@ -0,0 +1,87 @@
+"""
+Tests for Feed Parsing
+"""
+
+from datetime import datetime, timezone
+from scrapers.feeds import entries_since, parse_feed, parse_timestamp
+
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+  <item><link>https://example.com/new</link><pubDate>Tue, 10 Sep 2024 12:00:00 +0000</pubDate></item>
+  <item><link>https://example.com/old</link><pubDate>Mon, 09 Sep 2024 12:00:00 +0000</pubDate></item>
+</channel></rss>"""
+
+ATOM = """<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry><link rel="alternate" href="https://example.com/a"/><updated>2024-09-10T12:00:00Z</updated></entry>
+</feed>"""
+
+SITEMAP = """<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+  <url><loc>https://example.com/s</loc>
+    <news:news><news:publication_date>2024-09-10T12:00:00+00:00</news:publication_date></news:news>
+  </url>
+</urlset>"""
+
+
+def test_parse_feed_formats():
+    """Test RSS, Atom and news sitemap parsing."""
+    kind, entries = parse_feed(RSS)
+    assert kind == 'rss'
+    assert [url for url, _ in entries] == ['https://example.com/new', 'https://example.com/old']
+
+    kind, entries = parse_feed(ATOM)
+    assert kind == 'atom'
+    assert entries[0] == ('https://example.com/a', datetime(2024, 9, 10, 12, tzinfo=timezone.utc))
+
+    kind, entries = parse_feed(SITEMAP)
+    assert kind == 'sitemap'
+    assert entries[0][1] == datetime(2024, 9, 10, 12, tzinfo=timezone.utc)
+
+    assert parse_feed('<html>not a feed') == ('', [])
+
+
+def test_entries_since_filters_older_entries():
+    """Test that only entries newer than the last crawl are kept."""
+    _, entries = parse_feed(RSS)
+    since = parse_timestamp('2024-09-10T00:00:00Z')
+    assert [url for url, _ in entries_since(entries, since)] == ['https://example.com/new']
+    assert len(entries_since(entries, None)) == 2
+
+
+def test_feed_cutoff_stops_at_entries_left_for_later(monkeypatch):
+    """Test that the cutoff only moves past entries that were crawled."""
+    from models.article import Article
+    from scrapers.base_scraper import BaseScraper
+
+    feed = '<rss version="2.0"><channel>' + ''.join(
+        f'<item><link>https://example.com/{day}</link><pubDate>{day:02d} Sep 2024 12:00:00 +0000</pubDate></item>'
+        for day in (10, 9, 8, 7)
+    ) + '</channel></rss>'
+
+    class FeedScraper(BaseScraper):
+        def extract_article_links(self, html):
+            return []
+
+        def extract_article_content(self, url, html):
+            return None if url.endswith('/9') else Article(title=url, url=url)
+
+    scraper = FeedScraper({'name': 'Feed', 'url': 'https://example.com', 'link_source': 'feed',
+                           'feed_url': 'https://example.com/feed', 'last_crawled': '2024-09-01T00:00:00Z'})
+    monkeypatch.setattr(scraper, 'fetch_feed', lambda url: (feed.encode(), False))
+    monkeypatch.setattr(scraper, 'fetch_page', lambda url: '<html></html>')
+
+    # /10 is crawled, /9 fails to parse, /8 and /7 are beyond max_articles
+    assert [article.url for article in scraper.run(max_articles=2)] == ['https://example.com/10']
+    assert scraper.feed_cutoff == parse_timestamp('2024-09-01T00:00:00Z')
+
+    # Already crawled URLs count as done; the failed /9 still holds the cutoff back
+    articles = scraper.run(max_articles=2, skip_urls={'https://example.com/10', 'https://example.com/8'})
+    assert [article.url for article in articles] == ['https://example.com/7']
+    assert scraper.feed_cutoff == parse_timestamp('2024-09-08T12:00:00Z')
+
+    # Once nothing is left over, the cutoff reaches the newest entry
+    scraper.extract_article_content = lambda url, html: Article(title=url, url=url)
+    articles = scraper.run(max_articles=5, skip_urls={'https://example.com/10', 'https://example.com/7'})
+    assert [article.url for article in articles] == ['https://example.com/9']
+    assert scraper.feed_cutoff == parse_timestamp('2024-09-10T12:00:00Z')
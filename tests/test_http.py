@@ -0,0 +1,54 @@
+"""
+Tests for the bounded, streamed response readers in utils/http.py
+"""
+
+import io
+
+import pytest
+import requests
+
+from utils.http import BodyTooLarge, read_body, read_text
+
+
+def make_response(body: bytes, content_type: str = 'text/html', content_length: bool = True) -> requests.Response:
+    """A streamed response over an in-memory body."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = 'https://example.com/page'
+    response.raw = io.BytesIO(body)
+    response.headers['Content-Type'] = content_type
+    if content_length:
+        response.headers['Content-Length'] = str(len(body))
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def test_read_body_enforces_limit():
+    """Test that bodies over the limit are refused by Content-Length or while streaming."""
+    assert read_body(make_response(b'x' * 100), max_bytes=100) == b'x' * 100
+
+    with pytest.raises(BodyTooLarge):
+        read_body(make_response(b'x' * 101), max_bytes=100)
+    # Without a Content-Length the download stops once the limit is passed
+    body = io.BytesIO(b'x' * 300_000)
+    response = make_response(b'', content_length=False)
+    response.raw = body
+    with pytest.raises(BodyTooLarge):
+        read_body(response, max_bytes=100_000)
+    assert body.tell() < 300_000
+
+
+def test_read_text_detects_encoding():
+    """Test charset detection from the header, <meta> and the UTF-8 default."""
+    text = '<p>ሰላም — café</p>'
+    assert read_text(make_response(text.encode('utf-8'))) == (text, len(text.encode('utf-8')))
+
+    latin = '<meta charset="iso-8859-1"><p>café</p>'
+    assert read_text(make_response(latin.encode('latin-1')))[0] == latin
+
+    declared = make_response('<p>café</p>'.encode('cp1252'), content_type='text/html; charset=windows-1252')
+    assert read_text(declared)[0] == '<p>café</p>'
+
+    # A multi-byte character split across chunks is decoded whole
+    long_text = 'a' * (64 * 1024 - 1) + 'ሰ'
+    assert read_text(make_response(long_text.encode('utf-8')))[0] == long_text
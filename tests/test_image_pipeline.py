@@ -0,0 +1,124 @@
+"""
+Tests for the featured image pipeline
+"""
+
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from models.article import Article
+from services import image_pipeline
+from services.image_pipeline import ImageIndex, ImagePipeline, download_image
+
+
+class FakeManager:
+    def __init__(self):
+        self.uploads = []
+
+    def upload_image(self, data, file_name, mime_type=None):
+        self.uploads.append(data)
+        return f'file{len(self.uploads)}'
+
+    def upload_images(self, files):
+        return [self.upload_image(*item) for item in files]
+
+    def file_view_url(self, file_id):
+        return f'https://appwrite.test/v1/storage/buckets/article-images/files/{file_id}/view'
+
+
+@pytest.fixture
+def image_server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = b'x' * 2048 if self.path == '/large.jpg' else self.path.encode()
+            content_type = 'text/html' if self.path.endswith('.html') else 'image/jpeg'
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def test_download_image(image_server):
+    """Test that downloads are capped in size and limited to images."""
+    assert download_image(f'{image_server}/a.jpg') == b'/a.jpg'
+    assert download_image(f'{image_server}/large.jpg', max_bytes=1024) is None
+    assert download_image(f'{image_server}/page.html') is None
+    assert download_image('http://127.0.0.1:1/unreachable.jpg') is None
+
+
+def test_image_index(tmp_path):
+    """Test lookups by URL, content hash and nearby dHash, across reopening."""
+    index = ImageIndex(str(tmp_path / 'images.db'))
+    index.add('https://example.com/a.jpg', 'hash-a', 'file-a', 0b1011)
+    index.close()
+
+    index = ImageIndex(str(tmp_path / 'images.db'))
+    assert index.file_for_url('https://example.com/a.jpg') == 'file-a'
+    assert index.file_for_hash('hash-a') == 'file-a'
+    assert index.file_for_dhash(0b1001, max_distance=1) == 'file-a'
+    assert index.file_for_dhash(0b0100, max_distance=1) is None
+    assert index.file_for_dhash(0b1011, max_distance=-1) is None
+
+    # A second URL for the same bytes keeps the stored dHash
+    index.add('https://cdn.example.com/a.jpg', 'hash-a', 'file-a')
+    assert ImageIndex(str(tmp_path / 'images.db')).file_for_dhash(0b1011) == 'file-a'
+
+
+def test_pipeline_dedupes_and_reuses_uploads(tmp_path, monkeypatch):
+    """Test that each distinct picture is uploaded once and reused afterwards."""
+    downloads = {
+        'https://a.test/1.jpg': b'one',
+        'https://b.test/1-copy.jpg': b'one',   # same bytes, other URL
+        'https://a.test/2.jpg': b'two',
+        'https://a.test/2-small.jpg': b'two-small',  # same picture, other encoding
+        'https://a.test/broken.jpg': None,
+    }
+    dhashes = {b'one': 0xF0F0, b'two': 0x0F0F, b'two-small': 0x0F0E}
+    fetched = []
+    monkeypatch.setattr(image_pipeline, 'download_image', lambda url: fetched.append(url) or downloads[url])
+    monkeypatch.setattr(image_pipeline, 'optimize_image', lambda data: (data.upper(), dhashes[data]))
+
+    manager = FakeManager()
+    pipeline = ImagePipeline(manager, ImageIndex(str(tmp_path / 'images.db')), process_workers=0)
+    articles = [Article(title=url, image_url=url) for url in downloads]
+    articles.append(Article(title='No image'))
+
+    assert pipeline.process(articles) == 4
+    assert manager.uploads == [b'ONE', b'TWO']
+    assert articles[0].image_url == articles[1].image_url == manager.file_view_url('file1')
+    assert articles[2].image_url == articles[3].image_url == manager.file_view_url('file2')
+    assert articles[4].image_url == 'https://a.test/broken.jpg'
+    assert articles[5].image_url is None
+
+    # Known URLs are not downloaded again, uploaded images are left alone
+    fetched.clear()
+    again = [Article(image_url='https://a.test/1.jpg'), Article(image_url=manager.file_view_url('file2'))]
+    assert pipeline.process(again) == 1
+    assert fetched == [] and len(manager.uploads) == 2
+    assert again[0].image_url == manager.file_view_url('file1')
+
+
+def test_optimize_image_resizes():
+    """Test that large images are downscaled and hash like their originals."""
+    Image = pytest.importorskip('PIL.Image')
+    original = Image.new('RGB', (2400, 1200))
+    for x in range(0, 2400, 200):
+        original.paste((x % 255, 80, 160), (x, 0, x + 100, 1200))
+    buffer = io.BytesIO()
+    original.save(buffer, 'JPEG', quality=95)
+
+    data, picture_hash = image_pipeline.optimize_image(buffer.getvalue(), max_dimension=600, image_format='jpeg')
+    with Image.open(io.BytesIO(data)) as result:
+        assert result.size == (600, 300)
+        assert image_pipeline.hamming(image_pipeline.dhash(result), picture_hash) <= 4
+    assert len(data) < len(buffer.getvalue())
@@ -0,0 +1,112 @@
+"""
+Tests for paragraph-level incremental translation
+"""
+
+from translators.translator import Translator, aligned_translations, paragraph_key, split_paragraphs
+
+
+def make_translator(monkeypatch, fail=()):
+    """Translator whose service upper-cases text and records each request."""
+    translator = Translator(service='azure', cache_size=0)
+    requests = []
+
+    def translate_text(text):
+        requests.append(text)
+        if any(marker in text for marker in fail):
+            return None
+        return text.upper()
+
+    monkeypatch.setattr(translator, 'translate_text', translate_text)
+    return translator, requests
+
+
+def test_split_and_align_paragraphs():
+    """Test paragraph splitting and pairing with a stored translation."""
+    assert split_paragraphs('One.\n\n  Two.\n \nThree.\n') == ['One.', 'Two.', 'Three.']
+    assert paragraph_key('Two  words ') == paragraph_key('Two words')
+
+    assert aligned_translations('A.\n\nB.', 'አ.\n\nበ.') == {paragraph_key('A.'): 'አ.', paragraph_key('B.'): 'በ.'}
+    # Counts that do not line up cannot be paired safely
+    assert aligned_translations('A.\n\nB.', 'አ. በ.') == {}
+
+
+def test_only_changed_paragraphs_are_translated(monkeypatch):
+    """Test that unchanged paragraphs reuse the stored translation."""
+    translator, requests = make_translator(monkeypatch)
+    previous = {
+        'title': 'Chips are back', 'title_am': 'TITLE-AM',
+        'content': 'First.\n\nSecond.\n\nThird.', 'content_am': 'F-AM\n\nS-AM\n\nT-AM',
+    }
+    article = {'title': 'Chips are back', 'content': 'First.\n\nSecond, edited.\n\nThird.\n\nFourth.'}
+
+    translated = translator.translate_article(article, previous=previous)
+    assert translated['title_am'] == 'TITLE-AM'
+    assert translated['content_am'] == 'F-AM\n\nSECOND, EDITED.\n\nT-AM\n\nFOURTH.'
+    # Both changed paragraphs went out in one request
+    assert requests == ['Second, edited.\n\nFourth.']
+
+
+def test_first_translation_is_paragraph_aligned(monkeypatch):
+    """Test that a fresh translation keeps one paragraph per source paragraph."""
+    translator, requests = make_translator(monkeypatch)
+    monkeypatch.setattr('translators.translator.PARAGRAPH_BATCH_CHARS', 20)
+
+    translated = translator.translate_article({'title': 'T', 'content': 'Alpha one.\n\nBeta two.\n\nGamma.'})
+    assert translated['content_am'] == 'ALPHA ONE.\n\nBETA TWO.\n\nGAMMA.'
+    assert requests == ['T', 'Alpha one.', 'Beta two.\n\nGamma.']
+
+
+def test_failed_paragraph_fails_the_field(monkeypatch):
+    """Test that a partly failed translation is reported as failed, not half-translated."""
+    translator, _ = make_translator(monkeypatch, fail=('Broken',))
+    translated = translator.translate_article({'title': 'Fine', 'content': 'Good.\n\nBroken.'})
+    assert translated['title_am'] == 'FINE'
+    assert translated['content_am'] is None
+
+
+def test_translate_function_diffs_against_the_mirrored_translation(monkeypatch):
+    """Test that the translate_article function reuses the mirrored content and writes only stored attributes."""
+    import json
+
+    from appwrite_functions.translate_article import main as function
+    from services import clients
+
+    translator, requests = make_translator(monkeypatch)
+
+    class Mirror:
+        def __init__(self):
+            self.translations = {'a1': {'title': 'Old', 'title_am': 'OLD', 'content': 'First.\n\nSecond.',
+                                        'content_am': 'F-AM\n\nS-AM', 'summary': 'Sum', 'summary_am': 'SUM-AM'}}
+
+        def get_translation(self, document_id):
+            return self.translations.get(document_id)
+
+        def put_translation(self, document_id, fields):
+            self.translations[document_id] = fields
+
+    class Manager:
+        mirror = Mirror()
+        updates = []
+
+        def get_article(self, document_id):
+            return {'$id': document_id, 'title': 'Old', 'title_am': 'OLD', 'summary': 'Sum', 'summary_am': 'SUM-AM'}
+
+        def update_article(self, document_id, data):
+            self.updates.append(data)
+            return True
+
+    class Request:
+        payload = json.dumps({'article_id': 'a1', 'title': 'New', 'content': 'First.\n\nSecond, edited.'})
+
+    class Response:
+        def json(self, data, status=200):
+            return status
+
+    manager = Manager()
+    monkeypatch.setattr(clients, 'get_appwrite_manager', lambda: manager)
+    monkeypatch.setattr(clients, 'get_translator', lambda service: translator)
+
+    assert function.main(Request(), Response()) == 200
+    assert requests == ['New', 'Second, edited.']
+    assert manager.updates == [{'title': 'New', 'title_am': 'NEW', 'status': 'translated'}]
+    assert manager.mirror.translations['a1']['content_am'] == 'F-AM\n\nSECOND, EDITED.'
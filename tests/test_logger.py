@@ -0,0 +1,70 @@
+"""
+Tests for the queue-based logger
+"""
+
+import json
+import logging
+
+import pytest
+
+from utils import logger as logger_module
+from utils.logger import setup_logger, shutdown_logging
+
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    shutdown_logging()
+    yield
+    shutdown_logging()
+
+
+def queue_handlers():
+    return [h for h in logging.getLogger().handlers if isinstance(h, logger_module._QueueHandler)]
+
+
+def test_setup_is_idempotent(tmp_path):
+    """Test that repeated setup does not add duplicate handlers."""
+    log_file = str(tmp_path / 'crawler.log')
+    first = setup_logger(name='crawler', log_file=log_file)
+    second = setup_logger(name='crawler', log_file=log_file)
+
+    assert first is second
+    assert len(queue_handlers()) == 1
+    assert not first.handlers
+
+    first.info('only once')
+    shutdown_logging()
+    assert open(log_file).read().count('only once') == 1
+
+
+def test_json_lines_output(tmp_path):
+    """Test structured output with extra fields and exceptions."""
+    log_file = tmp_path / 'crawler.jsonl'
+    log = setup_logger(name='crawler.test', log_file=str(log_file), json_format=True)
+
+    log.info('fetched %s', 'https://example.com/a', extra={'source': 'TechCrunch'})
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        log.error('failed', exc_info=True)
+    shutdown_logging()
+
+    first, second = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert first['message'] == 'fetched https://example.com/a'
+    assert first['level'] == 'INFO' and first['logger'] == 'crawler.test'
+    assert first['source'] == 'TechCrunch'
+    assert 'ValueError: boom' in second['exception']
+
+
+def test_log_file_rotation(tmp_path):
+    """Test that the log file rotates at max_bytes."""
+    log_file = tmp_path / 'crawler.log'
+    log = setup_logger(name='crawler', log_file=str(log_file), max_bytes=500, backup_count=2)
+
+    for i in range(100):
+        log.info('line %d', i)
+    shutdown_logging()
+
+    assert (tmp_path / 'crawler.log.1').exists()
+    assert (tmp_path / 'crawler.log.2').exists()
+    assert not (tmp_path / 'crawler.log.3').exists()
@@ -0,0 +1,52 @@
+"""
+Tests for Metrics
+"""
+
+import pytest
+import requests
+from utils.metrics import MetricsRegistry, start_metrics_server
+
+
+def test_counter_and_histogram_render():
+    """Test the Prometheus text format for labelled counters and histograms."""
+    registry = MetricsRegistry()
+    fetches = registry.counter('fetch_total', 'Fetches', ['host'])
+    latency = registry.histogram('fetch_seconds', 'Latency', ['host'], buckets=(0.1, 1.0))
+
+    fetches.inc(host='a.com')
+    fetches.inc(2, host='a.com')
+    latency.observe(0.05, host='a.com')
+    latency.observe(0.5, host='a.com')
+    latency.observe(5, host='a.com')
+
+    text = registry.render()
+    assert '# TYPE fetch_total counter' in text
+    assert 'fetch_total{host="a.com"} 3' in text
+    assert 'fetch_seconds_bucket{host="a.com",le="0.1"} 1' in text
+    assert 'fetch_seconds_bucket{host="a.com",le="1"} 2' in text
+    assert 'fetch_seconds_bucket{host="a.com",le="+Inf"} 3' in text
+    assert 'fetch_seconds_count{host="a.com"} 3' in text
+    assert latency.quantile(0.5, host='a.com') == 1.0
+
+
+def test_registry_reuses_metrics_and_checks_labels():
+    """Test get-or-create semantics and label validation."""
+    registry = MetricsRegistry()
+    assert registry.counter('c', 'C', ['x']) is registry.counter('c', 'C', ['x'])
+    with pytest.raises(ValueError):
+        registry.histogram('c', 'C')
+    with pytest.raises(ValueError):
+        registry.counter('c', 'C', ['x']).inc(y='1')
+
+
+def test_metrics_endpoint():
+    """Test that /metrics serves the registry."""
+    registry = MetricsRegistry()
+    registry.counter('up_total', 'Up').inc()
+    server = start_metrics_server(0, registry=registry)
+    try:
+        response = requests.get(f'http://127.0.0.1:{server.server_port}/metrics')
+        assert response.status_code == 200
+        assert 'up_total 1' in response.text
+    finally:
+        server.shutdown()
@@ -0,0 +1,135 @@
+"""
+Tests for the Appwrite write outbox
+"""
+
+import time
+
+from appwrite.exception import AppwriteException
+
+from services.outbox import DELETE, UPDATE, UPSERT, WriteOutbox
+
+
+class FakeWriter:
+    """Records writes; fails with the queued errors first."""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.writes = []
+
+    def write_document(self, operation, document_id, data):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.writes.append((operation, document_id, data))
+
+
+def test_writes_to_a_queued_document_are_coalesced(tmp_path):
+    """Test that updates merge into the queued write and deletes replace it."""
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'))
+    outbox.enqueue(UPSERT, 'a', {'title': 'Title', 'summary_am': ''})
+    outbox.enqueue(UPDATE, 'a', {'summary_am': 'ማጠቃለያ'})
+    outbox.enqueue(UPDATE, 'b', {'title_am': 'ርዕስ'})
+    outbox.enqueue(UPDATE, 'b', {'summary_am': 'ማጠቃለያ'})
+    outbox.enqueue(UPSERT, 'c', {'title': 'Gone'})
+    outbox.enqueue(DELETE, 'c')
+
+    assert outbox.get('a') == {'operation': UPSERT, 'data': {'title': 'Title', 'summary_am': 'ማጠቃለያ'}}
+    assert outbox.get('b') == {'operation': UPDATE, 'data': {'title_am': 'ርዕስ', 'summary_am': 'ማጠቃለያ'}}
+    assert outbox.get('c') == {'operation': DELETE, 'data': None}
+    assert outbox.pending() == 3
+
+    writer = FakeWriter()
+    assert outbox.flush(writer) == 3
+    assert [write[:2] for write in writer.writes] == [(UPSERT, 'a'), (UPDATE, 'b'), (DELETE, 'c')]
+    assert outbox.pending() == 0
+
+
+def test_queued_writes_survive_a_restart(tmp_path):
+    """Test that undelivered writes are still there after reopening."""
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'))
+    outbox.enqueue(UPSERT, 'a', {'title': 'Paid-for translation'})
+    outbox.close()
+
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'))
+    writer = FakeWriter()
+    assert outbox.flush(writer) == 1
+    assert writer.writes == [(UPSERT, 'a', {'title': 'Paid-for translation'})]
+
+
+def test_failures_back_off_or_are_set_aside(tmp_path):
+    """Test transient errors are retried later and rejected writes kept as failed."""
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'))
+    outbox.enqueue(UPSERT, 'a', {'title': 'A'})
+    outbox.enqueue(UPSERT, 'b', {'title': 'B'})
+
+    writer = FakeWriter([AppwriteException('Invalid document structure', 400), AppwriteException('timed out')])
+    assert outbox.flush(writer) == 0
+    assert [entry['document_id'] for entry in outbox.failed()] == ['a']
+    assert outbox.pending() == 1
+
+    # 'b' is backing off, so nothing is due yet
+    assert outbox.flush(writer) == 0
+    outbox._conn.execute('UPDATE outbox SET next_attempt = 0')
+    assert outbox.flush(writer) == 1
+    assert writer.writes == [(UPSERT, 'b', {'title': 'B'})]
+
+
+def test_write_enqueued_during_delivery_is_kept(tmp_path):
+    """Test that an update arriving while its document is being written is not dropped."""
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'))
+    outbox.enqueue(UPSERT, 'a', {'title': 'A'})
+
+    class Writer(FakeWriter):
+        def write_document(self, operation, document_id, data):
+            super().write_document(operation, document_id, data)
+            if len(self.writes) == 1:
+                outbox.enqueue(UPDATE, 'a', {'title_am': 'ሀ'})
+
+    writer = Writer()
+    assert outbox.flush(writer) == 2
+    assert writer.writes[-1] == (UPSERT, 'a', {'title': 'A', 'title_am': 'ሀ'})
+
+
+def test_background_flusher_drains_on_close(tmp_path):
+    """Test that the flusher delivers writes without being asked to."""
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'), flush_interval=0.05)
+    writer = FakeWriter()
+    outbox.start(writer)
+    for i in range(30):
+        outbox.enqueue(UPSERT, f'doc{i}', {'title': str(i)})
+
+    deadline = time.monotonic() + 5
+    while len(writer.writes) < 30 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    outbox.close(drain_seconds=5)
+    assert sorted(document_id for _, document_id, _ in writer.writes) == sorted(f'doc{i}' for i in range(30))
+
+
+def test_update_after_a_rejected_upsert_keeps_the_document(tmp_path):
+    """Test that an update folds into a failed upsert instead of replacing the whole document."""
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'))
+    outbox.enqueue(UPSERT, 'a', {'title': 'Title', 'content_am': 'ይዘት'})
+    assert outbox.flush(FakeWriter([AppwriteException('Invalid document structure', 400)])) == 0
+    assert outbox.pending() == 0
+
+    outbox.enqueue(UPDATE, 'a', {'title_am': 'ርዕስ'})
+    assert outbox.failed() == []
+    writer = FakeWriter()
+    assert outbox.flush(writer) == 1
+    assert writer.writes == [(UPSERT, 'a', {'title': 'Title', 'content_am': 'ይዘት', 'title_am': 'ርዕስ'})]
+
+
+def test_update_after_a_delete_is_dropped(tmp_path):
+    """Test that a queued delete is not turned into an update, whether or not it failed."""
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'))
+    outbox.enqueue(DELETE, 'a')
+    outbox.enqueue(UPDATE, 'a', {'title_am': 'ርዕስ'})
+    assert outbox.get('a') == {'operation': DELETE, 'data': None}
+    writer = FakeWriter()
+    assert outbox.flush(writer) == 1
+    assert writer.writes == [(DELETE, 'a', None)]
+
+    outbox.enqueue(DELETE, 'b')
+    assert outbox.flush(FakeWriter([AppwriteException('Not allowed', 403)])) == 0
+    outbox.enqueue(UPDATE, 'b', {'title_am': 'ርዕስ'})
+    assert [entry['operation'] for entry in outbox.failed()] == [DELETE]
+    assert outbox.pending() == 0
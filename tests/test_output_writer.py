@@ -0,0 +1,35 @@
+"""
+Tests for the Streaming Output Writer
+"""
+
+import gzip
+import json
+from datetime import datetime
+from utils.output_writer import JsonlWriter
+
+
+def test_writes_compact_lines(tmp_path):
+    """Test that each record is one compact JSON line, flushed immediately."""
+    writer = JsonlWriter(directory=str(tmp_path))
+    writer.write({'title': 'ሰላም', 'tags': []})
+
+    # Readable before close (tail-able during a run)
+    lines = (tmp_path / 'articles.jsonl').read_text(encoding='utf-8').splitlines()
+    assert lines == ['{"title":"ሰላም","tags":[]}']
+    writer.close()
+
+
+def test_gzip_reopen_appends(tmp_path):
+    """Test that reopening a gzip file appends a readable member."""
+    for i in range(2):
+        with JsonlWriter(directory=str(tmp_path), compression='gzip') as writer:
+            writer.write({'i': i})
+
+    with gzip.open(tmp_path / 'articles.jsonl.gz', 'rt', encoding='utf-8') as f:
+        assert [json.loads(line)['i'] for line in f] == [0, 1]
+
+
+def test_partitioned_path(tmp_path):
+    """Test time-partitioned file names."""
+    writer = JsonlWriter(directory=str(tmp_path), partition='hour')
+    assert writer.path_for(datetime(2024, 9, 10, 7)).name == 'articles-2024-09-10T07.jsonl'
@@ -0,0 +1,64 @@
+"""
+Tests for the per-stage profiler
+"""
+
+import pstats
+
+import pytest
+
+from utils import profiling
+from utils.profiling import Profiler, profile_from_env, stage
+
+
+def busy_work(n=200000):
+    return sum(i * i for i in range(n))
+
+
+@pytest.mark.parametrize('mode', ['cprofile', 'sample'])
+def test_profiler_writes_stage_profiles(tmp_path, mode):
+    """Test that work inside a stage ends up in that stage's profiles."""
+    with Profiler(mode=mode, output_dir=str(tmp_path), sample_interval_ms=1, label='test') as profiler:
+        with stage('parse'):
+            for _ in range(5):
+                busy_work()
+
+    path = profiler.path
+    assert path.parent == tmp_path and path.name.startswith('test-')
+    assert (path / 'summary.txt').exists()
+    assert (path / 'parse.collapsed').read_text().strip()
+    assert any(line.startswith('parse;') for line in (path / 'all.collapsed').read_text().splitlines())
+
+    if mode == 'cprofile':
+        stats = pstats.Stats(str(path / 'parse.pstats'))
+        assert any(func[2] == 'busy_work' for func in stats.stats)
+        assert (path / 'all.pstats').exists()
+    else:
+        assert not (path / 'parse.pstats').exists()
+
+
+def test_profiler_memory_snapshot(tmp_path):
+    """Test that memory=True writes a tracemalloc snapshot."""
+    with Profiler(mode='sample', output_dir=str(tmp_path), memory=True) as profiler:
+        data = [str(i) for i in range(10000)]
+
+    assert data
+    assert (profiler.path / 'memory.tracemalloc').exists()
+    assert 'tracemalloc' in (profiler.path / 'summary.txt').read_text()
+
+
+def test_stage_is_noop_without_profiler():
+    """Test that stage() works when no profiler is running."""
+    assert profiling._active is None
+    with stage('fetch'):
+        assert busy_work(10) == 285
+
+
+def test_profile_from_env(monkeypatch, tmp_path):
+    """Test that profiling is only enabled by CRAWLER_PROFILE."""
+    monkeypatch.delenv('CRAWLER_PROFILE', raising=False)
+    assert not isinstance(profile_from_env('fn'), Profiler)
+
+    monkeypatch.setenv('CRAWLER_PROFILE', 'sample')
+    monkeypatch.setenv('PROFILE_DIR', str(tmp_path))
+    profiler = profile_from_env('fn')
+    assert isinstance(profiler, Profiler) and profiler.mode == 'sample'
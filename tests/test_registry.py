@@ -0,0 +1,37 @@
+"""
+Tests for the lazy scraper registry
+"""
+
+from scrapers.registry import create_scraper, resolve_scraper_class, scraper_path
+from scrapers.wired import WiredScraper
+from services.article_processor import ArticleProcessor
+
+WIRED = {'name': 'Wired', 'url': 'https://www.wired.com/', 'scraper_class': 'scrapers.wired:WiredScraper'}
+
+
+def test_resolve_module_path_and_builtin_name():
+    """Test that both "module:Class" and bare built-in names resolve."""
+    assert resolve_scraper_class('scrapers.wired:WiredScraper') is WiredScraper
+    assert resolve_scraper_class('WiredScraper') is WiredScraper
+    assert scraper_path('TechCrunchScraper') == 'scrapers.techcrunch:TechCrunchScraper'
+
+
+def test_unknown_scraper_class():
+    """Test that unknown or unimportable classes resolve to None."""
+    assert resolve_scraper_class('NoSuchScraper') is None
+    assert resolve_scraper_class('scrapers.missing:Scraper') is None
+    assert resolve_scraper_class('scrapers.wired:Missing') is None
+    assert create_scraper({'name': 'X', 'url': 'https://x.example', 'scraper_class': None}) is None
+
+
+def test_processor_creates_scrapers_on_first_use():
+    """Test that ArticleProcessor builds scrapers and its translator lazily."""
+    processor = ArticleProcessor(sources=[WIRED, {**WIRED, 'name': 'Broken', 'scraper_class': 'Nope'}])
+    assert processor.scrapers == {}
+    assert processor._translator is None
+
+    scraper = processor.get_scraper('wired')
+    assert isinstance(scraper, WiredScraper)
+    assert processor.get_scraper('wired') is scraper
+    assert processor.get_scraper('broken') is None
+    assert 'broken' not in processor.sources
@@ -0,0 +1,97 @@
+"""
+Tests for the Crawl Scheduler
+"""
+
+from datetime import datetime, timedelta, timezone
+from services.scheduler import CrawlScheduler
+
+
+NOW = datetime(2024, 9, 10, 12, tzinfo=timezone.utc)
+
+
+def test_due_sources_ordered_by_priority(tmp_path):
+    """Test that never-crawled sources are due, highest priority first."""
+    scheduler = CrawlScheduler(state_file=str(tmp_path / 'state.json'))
+    due = scheduler.due_sources(NOW)
+    priorities = [source['priority'] for source in due]
+    assert priorities == sorted(priorities, reverse=True)
+    assert len(due) == 4
+
+
+def test_frequency_and_error_backoff(tmp_path):
+    """Test crawl frequency and exponential backoff on errors."""
+    scheduler = CrawlScheduler(state_file=str(tmp_path / 'state.json'))
+    source = {'name': 'Wired', 'crawl_frequency': 3600}
+
+    scheduler.record_success(source, crawled_at=NOW)
+    assert scheduler.next_crawl_at(source) == NOW + timedelta(hours=1)
+
+    scheduler.record_failure(source, crawled_at=NOW)
+    scheduler.record_failure(source, crawled_at=NOW)
+    assert source['error_count'] == 2
+    assert source['last_crawled'] == NOW.isoformat()
+    assert scheduler.next_crawl_at(source) == NOW + timedelta(hours=4)
+
+    # State persists for sources.json sources
+    due_names = [s['name'] for s in scheduler.due_sources(NOW + timedelta(hours=2))]
+    assert 'Wired' not in due_names
+    assert 'TechCrunch' in due_names
+
+
+def test_feed_cutoff_is_kept_with_the_crawl_state(tmp_path):
+    """Test that the feed cutoff persists separately from the crawl time."""
+    scheduler = CrawlScheduler(state_file=str(tmp_path / 'state.json'))
+    source = {'name': 'Wired', 'crawl_frequency': 3600}
+    cutoff = NOW - timedelta(days=1)
+
+    scheduler.record_success(source, crawled_at=NOW, feed_cutoff=cutoff)
+    scheduler.record_failure(source, crawled_at=NOW)
+    [wired] = [s for s in CrawlScheduler(state_file=str(tmp_path / 'state.json')).load_sources()
+               if s['name'] == 'Wired']
+    assert (wired['last_crawled'], wired['feed_cutoff']) == (NOW.isoformat(), cutoff.isoformat())
+
+
+def test_failures_keep_the_last_successful_crawl(tmp_path):
+    """Test that a failed attempt backs off from its own time without touching last_crawled."""
+    scheduler = CrawlScheduler(state_file=str(tmp_path / 'state.json'))
+    source = {'name': 'Wired', 'crawl_frequency': 3600}
+
+    # Never crawled: the failure alone starts the backoff
+    scheduler.record_failure(source, crawled_at=NOW)
+    assert 'last_crawled' not in source
+    assert scheduler.next_crawl_at(source) == NOW + timedelta(hours=2)
+
+    scheduler.record_success(source, crawled_at=NOW + timedelta(hours=2))
+    scheduler.record_failure(source, crawled_at=NOW + timedelta(hours=5))
+    assert source['last_crawled'] == (NOW + timedelta(hours=2)).isoformat()
+    assert scheduler.next_crawl_at(source) == NOW + timedelta(hours=7)
+
+
+def test_state_the_collection_cannot_store_is_kept_locally(tmp_path):
+    """Test that a collection without last_attempt still backs off a source that never crawled."""
+    class Manager:
+        def __init__(self):
+            self.documents = [{'$id': 's1', 'name': 'Broken', 'url': 'https://broken.example', 'enabled': True,
+                               'crawl_frequency': 3600, 'last_crawled': None, 'error_count': 0,
+                               'status': 'active'}]
+            self.updates = []
+
+        def list_sources(self):
+            return [dict(doc) for doc in self.documents]
+
+        def update_source(self, document_id, data):
+            self.updates.append(data)
+            self.documents[0].update(data)
+            return True
+
+    manager = Manager()
+    scheduler = CrawlScheduler(appwrite_manager=manager, state_file=str(tmp_path / 'state.json'))
+    [source] = [s for s in scheduler.load_sources() if s['name'] == 'Broken']
+    scheduler.record_failure(source, crawled_at=NOW)
+    assert manager.updates == [{'error_count': 1}]
+
+    # A fresh scheduler (e.g. after a restart) still backs the source off
+    scheduler = CrawlScheduler(appwrite_manager=manager, state_file=str(tmp_path / 'state.json'))
+    [source] = [s for s in scheduler.load_sources() if s['name'] == 'Broken']
+    assert scheduler.next_crawl_at(source) == NOW + timedelta(hours=2)
+    assert 'Broken' not in [s['name'] for s in scheduler.due_sources(NOW + timedelta(hours=1))]
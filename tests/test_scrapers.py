@@ -3,8 +3,8 @@ Tests for Scrapers
 """
 
 import pytest
-from backend.scrapers.base_scraper import BaseScraper
-from backend.scrapers.techcrunch import TechCrunchScraper
+from scrapers.base_scraper import BaseScraper
+from scrapers.techcrunch import TechCrunchScraper
 
 
 def test_base_scraper_initialization():
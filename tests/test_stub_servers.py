@@ -0,0 +1,175 @@
+"""
+Tests for the load-test stub servers and the clients that talk to them
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+
+import stub_servers
+
+
+@pytest.fixture(scope='module')
+def servers():
+    running = stub_servers.start_servers()
+    yield {name: f'http://127.0.0.1:{server.server_port}' for name, server in running.items()}
+    for server in running.values():
+        server.shutdown()
+
+
+def test_fake_site_serves_unique_links(servers):
+    """Test that each homepage request yields fresh article links."""
+    first = requests.get(f"{servers['site']}/techcrunch.com/").text
+    second = requests.get(f"{servers['site']}/techcrunch.com/").text
+    assert '?v=' in first
+    assert first != second
+    assert requests.get(f"{servers['site']}/unknown.example/").status_code == 404
+
+
+def test_libre_translator(servers, monkeypatch):
+    """Test the LibreTranslate service against the fake translator."""
+    from translators.translator import Translator
+
+    monkeypatch.setenv('LIBRETRANSLATE_URL', servers['translator'])
+    translator = Translator(service='libre')
+    translated = translator.translate_text('Hello world')
+
+    assert translated and translated != 'Hello world'
+    assert translated.count(' ') == 1
+
+
+def test_appwrite_manager_against_fake_appwrite(servers, monkeypatch):
+    """Test that AppwriteManager can save and read back a document."""
+    from services.appwrite_manager import AppwriteManager
+
+    monkeypatch.setenv('APPWRITE_ENDPOINT', f"{servers['appwrite']}/v1")
+    monkeypatch.setenv('APPWRITE_PROJECT_ID', 'test')
+    monkeypatch.setenv('APPWRITE_API_KEY', 'test')
+    manager = AppwriteManager()
+
+    document = manager.save_article({'title': 'Stub', 'url': 'https://example.com/a', 'content': 'Body'})
+    assert document['$id']
+    assert manager.get_article(document['$id'])['title'] == 'Stub'
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_iter_articles_pages_with_cursor(servers, monkeypatch, prefetch):
+    """Test that iter_articles walks the whole collection with cursors and select."""
+    from services.appwrite_manager import AppwriteManager
+
+    monkeypatch.setenv('APPWRITE_ENDPOINT', f"{servers['appwrite']}/v1")
+    monkeypatch.setenv('APPWRITE_PROJECT_ID', 'test')
+    monkeypatch.setenv('APPWRITE_API_KEY', 'test')
+    monkeypatch.setenv('APPWRITE_ARTICLES_COLLECTION_ID', f'scan-{prefetch}')
+    manager = AppwriteManager()
+    for i in range(25):
+        manager.save_article({'title': f'Article {i}', 'url': f'https://example.com/{i}', 'content': 'Body'})
+
+    documents = list(manager.iter_articles(page_size=10, fields=['title'], prefetch=prefetch))
+    assert [document['title'] for document in documents] == [f'Article {i}' for i in range(25)]
+    assert all('content' not in document and document['$id'] for document in documents)
+
+    # Stopping early is fine
+    assert len(list(zip(range(3), manager.iter_articles(page_size=2)))) == 3
+
+
+def test_upload_image_from_memory(servers, monkeypatch, tmp_path):
+    """Test that images upload from bytes as well as from a file path."""
+    from services.appwrite_manager import AppwriteManager
+
+    monkeypatch.setenv('APPWRITE_ENDPOINT', f"{servers['appwrite']}/v1")
+    monkeypatch.setenv('APPWRITE_PROJECT_ID', 'test')
+    monkeypatch.setenv('APPWRITE_API_KEY', 'test')
+    manager = AppwriteManager()
+
+    file_id = manager.upload_image(b'RIFF0000WEBPVP8 ', 'image.webp')
+    assert file_id
+    assert manager.file_view_url(file_id) == (
+        f"{servers['appwrite']}/v1/storage/buckets/article-images/files/{file_id}/view?project=test")
+
+    path = tmp_path / 'image.png'
+    path.write_bytes(b'\x89PNG\r\n\x1a\n')
+    assert manager.upload_image(str(path), 'image.png')
+
+
+def test_chunked_upload_from_memory_and_streams(servers, monkeypatch):
+    """Test that large bytes, memoryviews and streams upload in chunks, concurrently."""
+    import io
+    from services import appwrite_manager as module
+
+    monkeypatch.setenv('APPWRITE_ENDPOINT', f"{servers['appwrite']}/v1")
+    monkeypatch.setenv('APPWRITE_PROJECT_ID', 'test')
+    monkeypatch.setenv('APPWRITE_API_KEY', 'test')
+    monkeypatch.setattr(module, 'APPWRITE_CHUNK_SIZE', 1000)
+    manager = module.AppwriteManager()
+
+    calls = []
+    call = manager.client.call
+    monkeypatch.setattr(manager.client, 'call', lambda method, path, headers, params: calls.append(
+        (headers.get('content-range'), headers.get('x-appwrite-id'), bytes(params['file'].data))
+    ) or call(method, path, headers, params))
+
+    data = bytes(range(256)) * 10
+    file_id = manager.upload_image(memoryview(data), 'large.png')
+    assert file_id
+    assert [range_ for range_, _, _ in calls] == ['bytes 0-999/2560', 'bytes 1000-1999/2560', 'bytes 2000-2559/2560']
+    assert [upload_id for _, upload_id, _ in calls] == [None, file_id, file_id]
+    assert b''.join(chunk for _, _, chunk in calls) == data
+
+    calls.clear()
+    assert manager.upload_image(io.BytesIO(data), 'stream.png')
+    assert b''.join(chunk for _, _, chunk in calls) == data
+
+    file_ids = manager.upload_images([(b'small', f'{i}.png') for i in range(6)], max_workers=3)
+    assert len(set(file_ids)) == 6 and all(file_ids)
+
+
+def test_save_article_is_idempotent_and_goes_through_outbox(servers, monkeypatch, tmp_path):
+    """Test deterministic IDs (save twice, one document) and outbox delivery."""
+    from services.appwrite_manager import AppwriteManager, article_document_id
+    from services.outbox import WriteOutbox
+
+    monkeypatch.setenv('APPWRITE_ENDPOINT', f"{servers['appwrite']}/v1")
+    monkeypatch.setenv('APPWRITE_PROJECT_ID', 'test')
+    monkeypatch.setenv('APPWRITE_API_KEY', 'test')
+    monkeypatch.setenv('APPWRITE_ARTICLES_COLLECTION_ID', 'outbox')
+    manager = AppwriteManager()
+
+    first = manager.save_article({'title': 'First', 'url': 'https://example.com/same?utm_source=x'})
+    second = manager.save_article({'title': 'Second', 'url': 'https://example.com/same'})
+    assert first['$id'] == second['$id'] == article_document_id('https://example.com/same')
+    assert manager.get_article(first['$id'])['title'] == 'Second'
+
+    outbox = WriteOutbox(str(tmp_path / 'outbox.db'), flush_interval=0.05)
+    queued = AppwriteManager(outbox=outbox)
+    document = queued.save_article({'title': 'Queued', 'url': 'https://example.com/queued'})
+    assert queued.update_article(document['$id'], {'title_am': 'ተሰልፏል'})
+    assert queued.get_article(document['$id'])['title_am'] == 'ተሰልፏል'
+    outbox.close(drain_seconds=5)
+
+    stored = manager.get_article(document['$id'])
+    assert (stored['title'], stored['title_am']) == ('Queued', 'ተሰልፏል')
+
+
+def test_get_article_merges_a_queued_update(servers, monkeypatch):
+    """Test that a queued update is read over the stored document, not instead of it."""
+    from services.appwrite_manager import AppwriteManager
+    from services.outbox import UPDATE
+
+    monkeypatch.setenv('APPWRITE_ENDPOINT', f"{servers['appwrite']}/v1")
+    monkeypatch.setenv('APPWRITE_PROJECT_ID', 'test')
+    monkeypatch.setenv('APPWRITE_API_KEY', 'test')
+    manager = AppwriteManager()
+    document = manager.save_article({'title': 'Stored', 'url': 'https://example.com/patched', 'source': 'Example'})
+
+    class QueuedUpdate:
+        def get(self, document_id):
+            return {'operation': UPDATE, 'data': {'title_am': 'ርዕስ'}}
+
+    manager.outbox = QueuedUpdate()
+    article = manager.get_article(document['$id'])
+    assert (article['title'], article['source'], article['title_am']) == ('Stored', 'Example', 'ርዕስ')
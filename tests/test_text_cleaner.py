@@ -0,0 +1,41 @@
+"""
+Tests for the text cleaning utilities
+"""
+
+from utils.text_cleaner import clean_batch, clean_text, extract_summary, remove_html_tags
+
+
+def test_clean_text():
+    """Test whitespace collapsing and removal of special characters."""
+    assert clean_text('  Hello,\n\tworld!  ') == 'Hello, world!'
+    assert clean_text('Price: $5 @ store #1') == 'Price: 5  store 1'
+    assert clean_text('ሰላም ዓለም!') == 'ሰላም ዓለም!'
+    assert clean_text('') == ''
+    assert clean_text(None) == ''
+
+
+def test_clean_batch_matches_clean_text():
+    """Test that batch cleaning gives the same result as cleaning one by one."""
+    texts = ['  First\n\nparagraph ', '', None, ' $ ', 'Second @ one.', 'NUL\x00inside', '\t', 'ሰላም  ዓለም']
+    assert clean_batch(texts) == [clean_text(text) for text in texts]
+    assert clean_batch(texts[:2]) == [clean_text(text) for text in texts[:2]]
+    assert clean_batch(iter(['a  b'])) == ['a b']
+    assert clean_batch([]) == []
+
+
+def test_remove_html_tags():
+    """Test tag removal that decodes entities and keeps text that only looks like markup."""
+    html = ('<div class="x"><p>Tom &amp; Jerry&#8217;s</p><p>Line<br/>break</p>'
+            '<script>if (a < b) { run(); }</script><!-- note --><a title="a>b" href="/">link</a></div>')
+    assert remove_html_tags(html) == "Tom & Jerry’s\n\nLine\nbreak\nlink"
+    assert remove_html_tags('3 < 4 and 5 > 2') == '3 < 4 and 5 > 2'
+    assert remove_html_tags('<B>Bold</B> &lt;tag&gt;') == 'Bold <tag>'
+    assert remove_html_tags('plain') == 'plain'
+    assert remove_html_tags('') == ''
+
+
+def test_extract_summary():
+    """Test that summaries end at a sentence boundary when there is one."""
+    assert extract_summary('Short.') == 'Short.'
+    assert extract_summary('First sentence. Second sentence.', max_length=20) == 'First sentence.'
+    assert extract_summary('No boundary at all here', max_length=10) == 'No boundar...'
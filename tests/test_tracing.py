@@ -0,0 +1,105 @@
+"""
+Tests for Tracing
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.tracing import NOOP_SPAN, JsonFileExporter, OtlpHttpExporter, Tracer, summarize_traces
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+
+def test_disabled_tracer_is_noop():
+    """Test that spans cost nothing when no exporter is configured."""
+    tracer = Tracer()
+    with tracer.span('fetch') as span:
+        assert span is NOOP_SPAN
+    assert tracer.start_span('article') is NOOP_SPAN
+
+
+def test_article_trace_spans_nest():
+    """Test that spans started while an article span is active join its trace."""
+    exporter = ListExporter()
+    tracer = Tracer(exporter)
+
+    crawl = tracer.start_span('crawl_source', new_trace=True)
+    article = tracer.start_span('article', new_trace=True, links=[crawl], url='https://example.com/a')
+    with tracer.activate(article):
+        with tracer.span('fetch'):
+            with tracer.span('http.direct'):
+                pass
+        try:
+            with tracer.span('parse'):
+                raise ValueError('bad markup')
+        except ValueError:
+            pass
+    article.end()
+    crawl.end()
+
+    spans = {span.name: span for span in exporter.spans}
+    assert spans['article'].trace_id != spans['crawl_source'].trace_id
+    assert spans['article'].links == [(crawl.trace_id, crawl.span_id)]
+    assert spans['fetch'].trace_id == spans['article'].trace_id
+    assert spans['fetch'].parent_span_id == spans['article'].span_id
+    assert spans['http.direct'].parent_span_id == spans['fetch'].span_id
+    assert spans['parse'].error == 'bad markup'
+
+
+def test_file_export_and_summary(tmp_path):
+    """Test the JSON Lines exporter and the slowest-article report."""
+    path = tmp_path / 'traces.jsonl'
+    tracer = Tracer(JsonFileExporter(str(path)))
+    article = tracer.start_span('article', new_trace=True, url='https://example.com/a', source='Example')
+    with tracer.activate(article), tracer.span('translate'):
+        pass
+    article.end()
+    tracer.shutdown()
+
+    assert [json.loads(line)['name'] for line in path.read_text().splitlines()] == ['translate', 'article']
+    report = summarize_traces(str(path))
+    assert len(report) == 1
+    assert '[Example] https://example.com/a: ' in report[0] and 'translate' in report[0]
+
+
+def test_otlp_export():
+    """Test that spans are posted to /v1/traces in the OTLP JSON encoding."""
+    received = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append((self.path, json.loads(self.rfile.read(int(self.headers['Content-Length'])))))
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Collector)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        tracer = Tracer(OtlpHttpExporter(f'http://127.0.0.1:{server.server_port}', 'crawler-test'))
+        with tracer.span('article', url='https://example.com/a', characters=12):
+            pass
+        tracer.shutdown()
+    finally:
+        server.shutdown()
+
+    path, payload = received[0]
+    assert path == '/v1/traces'
+    resource_spans = payload['resourceSpans'][0]
+    assert resource_spans['resource']['attributes'][0]['value']['stringValue'] == 'crawler-test'
+    span = resource_spans['scopeSpans'][0]['spans'][0]
+    assert span['name'] == 'article' and len(span['traceId']) == 32
+    assert {'key': 'characters', 'value': {'intValue': '12'}} in span['attributes']
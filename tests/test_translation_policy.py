@@ -0,0 +1,150 @@
+"""
+Tests for the translation policy: modes, character budgets and deferred translations
+"""
+
+import pytest
+
+from models.article import Article
+from services.article_processor import ArticleProcessor
+from services.translation_policy import DeferredTranslations, TranslationPolicy
+from translators.translator import Translator
+
+CONTENT = 'First paragraph of the story.\n\nSecond paragraph of the story.\n\nThird paragraph of the story.'
+
+
+def make_translator(monkeypatch):
+    """Translator whose service upper-cases text, counting characters like the real one."""
+    translator = Translator(service='azure', cache_size=0)
+    requests = []
+
+    def translate_text(text):
+        requests.append(text)
+        translator.characters_sent += len(text)
+        return text.upper()
+
+    monkeypatch.setattr(translator, 'translate_text', translate_text)
+    return translator, requests
+
+
+def make_processor(monkeypatch, policy):
+    processor = ArticleProcessor(sources=[{'name': 'Example'}],
+                                 translation_policy=policy)
+    processor.translator, requests = make_translator(monkeypatch)
+    return processor, requests
+
+
+def test_plan_by_mode_and_budget():
+    """Test which fields are translated now or deferred per mode and remaining budget."""
+    sizes = {'title': 10, 'summary': 90, 'content': 400}
+    cost = lambda fields: sum(sizes[field] for field in fields)
+
+    assert TranslationPolicy(mode='full').plan('A', cost) == (('title', 'content', 'summary'), ())
+    assert TranslationPolicy(mode='summary').plan('A', cost) == (('title', 'summary'), ())
+    assert TranslationPolicy(mode='summary_first').plan('A', cost) == (('title', 'summary'), ('content',))
+    # A source can pick its own mode
+    assert TranslationPolicy(mode='full').plan('A', cost, {'translation_mode': 'summary'}) == (('title', 'summary'), ())
+
+    policy = TranslationPolicy(mode='full', run_budget=1000, source_budget=300)
+    # The headline fits the source budget, the content does not
+    assert policy.plan('A', cost) == (('title', 'summary'), ('content',))
+    policy.charge('A', 250)
+    assert policy.remaining('A') == 50
+    assert policy.plan('A', cost) == ((), ('title', 'content', 'summary'))
+    # Other sources have their own budget, within the run budget
+    assert policy.remaining('B') == 300
+    assert policy.remaining('B', {'translation_char_budget': 5000}) == 750
+
+    policy.start_cycle()
+    assert policy.remaining('A') == 300
+
+    with pytest.raises(ValueError):
+        TranslationPolicy(mode='everything')
+
+
+def test_summary_reuses_content_paragraphs(monkeypatch):
+    """Test that summary_am is filled without sending the paragraphs it shares with the content."""
+    translator, requests = make_translator(monkeypatch)
+    monkeypatch.setattr(Article, 'SUMMARY_LENGTH', 66)
+    article = Article(title='Chips', content=CONTENT)
+
+    assert translator.untranslated_characters(article) == len('Chips') + len(CONTENT) - len('\n\n') * 2 + len('Thi')
+    translator.translate_article(article)
+    assert article.summary_am == 'FIRST PARAGRAPH OF THE STORY.\n\nSECOND PARAGRAPH OF THE STORY.\n\nTHI'
+    # Only the cut-off end of the summary was sent on its own
+    assert requests[-1] == 'Thi'
+
+
+def test_summary_first_defers_content(monkeypatch, tmp_path):
+    """Test that summary_first publishes the headline first and translates the content from the queue."""
+    queue = DeferredTranslations(str(tmp_path / 'queue.db'))
+    processor, requests = make_processor(monkeypatch, TranslationPolicy(mode='summary_first', queue=queue))
+    article = Article(title='Chips', content=CONTENT, summary='Short summary.', url='https://example.com/chips',
+                      source='Example')
+
+    article = processor.translate_article(article)
+    assert (article.title_am, article.summary_am, article.content_am) == ('CHIPS', 'SHORT SUMMARY.', None)
+    assert requests == ['Chips', 'Short summary.']
+    assert queue.count() == 1
+
+    deferred = list(processor.translate_deferred())
+    assert len(deferred) == 1
+    assert deferred[0].title_am == 'CHIPS'
+    assert deferred[0].content_am == CONTENT.upper()
+    assert queue.count() == 0
+
+
+def test_budget_defers_until_next_cycle(monkeypatch, tmp_path):
+    """Test that text over the run budget waits in the queue for a cycle with budget left."""
+    queue = DeferredTranslations(str(tmp_path / 'queue.db'))
+    policy = TranslationPolicy(mode='summary', run_budget=30, queue=queue)
+    processor, requests = make_processor(monkeypatch, policy)
+
+    first = processor.translate_article(Article(title='One', summary='A summary of one.',
+                                                url='https://example.com/1', source='Example'))
+    second = processor.translate_article(Article(title='Two', summary='A summary of two.',
+                                                 url='https://example.com/2', source='Example'))
+    assert first.summary_am == 'A SUMMARY OF ONE.'
+    assert second.title_am is None
+    assert policy.spent == 20
+    # Still no room this cycle
+    assert list(processor.translate_deferred()) == []
+    assert queue.count() == 1
+
+    policy.start_cycle()
+    [done] = processor.translate_deferred()
+    assert (done.title_am, done.summary_am) == ('TWO', 'A SUMMARY OF TWO.')
+    assert queue.count() == 0
+
+
+def test_deferred_translation_over_the_whole_budget_is_dropped(monkeypatch, tmp_path):
+    """Test that queued text larger than a cycle's budget is dropped instead of waiting forever."""
+    queue = DeferredTranslations(str(tmp_path / 'queue.db'))
+    policy = TranslationPolicy(mode='full', source_budget=40, queue=queue)
+    processor, requests = make_processor(monkeypatch, policy)
+
+    article = processor.translate_article(Article(title='Chips', content=CONTENT, summary='Short summary.',
+                                                  url='https://example.com/chips', source='Example'))
+    assert article.title_am == 'CHIPS'
+    assert queue.count() == 1
+
+    policy.start_cycle()
+    assert list(processor.translate_deferred()) == []
+    assert queue.count() == 0
+    assert requests == ['Chips', 'Short summary.']
+
+
+def test_content_is_not_deferred_without_anywhere_to_keep_it(monkeypatch, tmp_path):
+    """Test that summary_first skips the content when neither a mirror nor a sink would keep it."""
+    queue = DeferredTranslations(str(tmp_path / 'queue.db'))
+    policy = TranslationPolicy(mode='summary_first', queue=queue)
+    processor, _ = make_processor(monkeypatch, policy)
+    processor.sources = {}
+
+    class Sink:
+        def write(self, article):
+            pass
+
+    processor.process_pipeline(save=False)
+    assert policy.plan('Example', len) == (('title', 'summary'), ())
+    processor.process_pipeline(save=False, sink=Sink())
+    assert policy.plan('Example', len) == (('title', 'summary'), ('content',))